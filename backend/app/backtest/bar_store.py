@@ -0,0 +1,322 @@
+"""Local columnar bar store: memory-mapped, append-only column files per (source, symbol, interval).
+
+Each series lives in ``<root>/<source>/<symbol>/<interval>/`` and holds one generation directory
+named by ``CURRENT``. A generation stores the six BarFrame columns as raw little-endian int64/float64
+files sorted by time, so a range read is two binary searches and a zero-copy slice of the mapping.
+Bars newer than the last stored one are appended in place; anything older (a backfill) goes to a
+small pending journal that reads merge on the fly until ``compact`` folds it into a new generation.
+``coverage.json`` records the time ranges a provider has served completely, which is what lets
+readers skip the provider.
+"""
+
+import json
+import os
+import re
+import shutil
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime, timezone
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+from .frame import BAR_FIELDS, BarFrame
+
+
+_PENDING_PREFIX = 'pending-'
+_SAFE_NAME = re.compile(r'[^A-Za-z0-9._-]+')
+_lock = threading.Lock()
+
+
+def _column_dtype(name):
+    # Fixed little-endian layout so stores can be copied between hosts.
+    return np.dtype('<i8') if name == 'time' else np.dtype('<f8')
+
+
+def to_millis(value):
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp() * 1000)
+    if isinstance(value, date):
+        return to_millis(datetime(value.year, value.month, value.day, tzinfo=timezone.utc))
+    if isinstance(value, str):
+        value = value.strip()
+        if not value:
+            return None
+        try:
+            return to_millis(float(value))
+        except ValueError:
+            return to_millis(datetime.fromisoformat(value.replace('Z', '+00:00')))
+    if isinstance(value, (int, float)):
+        return int(value) if value > 1_000_000_000_000 else int(value * 1000)
+    raise TypeError(f"Unsupported timestamp type: {type(value)}")
+
+
+_DAILY_ALIASES = {'1day', 'day', 'daily'}
+_INTERVAL_UNITS_MS = {'s': 1000, 'm': 60_000, 'h': 3_600_000, 'd': 86_400_000, 'w': 604_800_000}
+_INTERVAL_PATTERN = re.compile(r'^(\d+)([smhdw])$')
+
+
+def interval_to_millis(interval):
+    """Width of a fixed interval in ms (``1d``/``daily`` style); None for calendar or unknown ones."""
+    normalized = str(interval or '').strip()
+    if normalized.lower() in _DAILY_ALIASES:
+        normalized = '1d'
+    match = _INTERVAL_PATTERN.match(normalized)
+    if not match:
+        return None
+    return int(match.group(1)) * _INTERVAL_UNITS_MS[match.group(2)]
+
+
+def _map_column(path, dtype):
+    try:
+        size = os.path.getsize(path)
+    except FileNotFoundError:
+        return np.empty(0, dtype=dtype)
+    if size < np.dtype(dtype).itemsize:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', shape=(size // np.dtype(dtype).itemsize,))
+
+
+def _merge_coverage(ranges):
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def _dedupe_last(frame):
+    """Sort by time and keep the last occurrence of each timestamp."""
+    if len(frame) < 2:
+        return frame
+    order = np.argsort(frame.time, kind='stable')
+    times = frame.time[order]
+    keep = np.append(times[1:] != times[:-1], True)
+    return frame.take(order[keep])
+
+
+class BarStore:
+    def __init__(self, root):
+        self.root = os.fspath(root)
+
+    def _series_dir(self, source, symbol, interval):
+        parts = [_SAFE_NAME.sub('_', str(part or '_')) for part in (source, symbol, interval)]
+        return os.path.join(self.root, *parts)
+
+    @staticmethod
+    def _current_generation(series_dir):
+        try:
+            with open(os.path.join(series_dir, 'CURRENT'), encoding='utf-8') as handle:
+                return os.path.join(series_dir, handle.read().strip())
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _open_columns(generation, prefix=''):
+        columns = {
+            name: _map_column(os.path.join(generation, f'{prefix}{name}.bin'), _column_dtype(name))
+            for name in BAR_FIELDS
+        }
+        if not os.path.isdir(generation):
+            raise FileNotFoundError(generation)
+        # ``time`` is written last on append, so the shortest column marks the committed length.
+        length = min(len(column) for column in columns.values())
+        return {name: column[:length] for name, column in columns.items()}
+
+    def read(self, source, symbol, interval, start_ms=None, end_ms=None):
+        """Bars in ``[start_ms, end_ms]`` as a BarFrame backed by the mapping, or None if no series."""
+        generation = self._current_generation(self._series_dir(source, symbol, interval))
+        if generation is None:
+            return None
+        try:
+            main = self._open_columns(generation)
+            pending = self._open_columns(generation, _PENDING_PREFIX)
+        except FileNotFoundError:
+            # Compaction swapped generations under us; the new one is complete.
+            return self.read(source, symbol, interval, start_ms, end_ms)
+
+        times = main['time']
+        lo = 0 if start_ms is None else int(np.searchsorted(times, int(start_ms), side='left'))
+        hi = len(times) if end_ms is None else int(np.searchsorted(times, int(end_ms), side='right'))
+        frame = BarFrame(**{name: column[lo:hi] for name, column in main.items()})
+        if not len(pending['time']):
+            return frame
+
+        mask = np.ones(len(pending['time']), dtype=bool)
+        if start_ms is not None:
+            mask &= pending['time'] >= int(start_ms)
+        if end_ms is not None:
+            mask &= pending['time'] <= int(end_ms)
+        if not mask.any():
+            return frame
+        # Journal rows come after the main rows so they win on duplicate timestamps.
+        combined = BarFrame(**{
+            name: np.concatenate([getattr(frame, name), pending[name][mask]]) for name in BAR_FIELDS
+        })
+        return _dedupe_last(combined)
+
+    def coverage(self, source, symbol, interval):
+        path = os.path.join(self._series_dir(source, symbol, interval), 'coverage.json')
+        try:
+            with open(path, encoding='utf-8') as handle:
+                return [tuple(item) for item in json.load(handle)]
+        except (FileNotFoundError, ValueError):
+            return []
+
+    def read_covered(self, source, symbol, interval, start_ms, end_ms):
+        """Like ``read``, but only when the whole range has been recorded as covered."""
+        start_ms, end_ms = int(start_ms), int(end_ms)
+        if not any(start <= start_ms and end_ms <= end for start, end in self.coverage(source, symbol, interval)):
+            return None
+        return self.read(source, symbol, interval, start_ms, end_ms)
+
+    def append(self, source, symbol, interval, bars, covered=None):
+        """Store fetched bars; ``covered`` is a ``(start_ms, end_ms)`` range they fully describe."""
+        frame = _dedupe_last(BarFrame.coerce(bars))
+        series_dir = self._series_dir(source, symbol, interval)
+        with self._locked(series_dir):
+            generation = self._current_generation(series_dir)
+            if generation is None:
+                generation = self._new_generation(series_dir, 0)
+                self._publish(series_dir, generation)
+
+            main = self._open_columns(generation)
+            last_time = int(main['time'][-1]) if len(main['time']) else None
+            if last_time is None:
+                newer = np.ones(len(frame), dtype=bool)
+            else:
+                newer = frame.time > last_time
+            self._append_columns(generation, frame.take(newer))
+
+            older = frame.take(~newer)
+            if len(older):
+                older = older.take(~self._already_stored(main, older))
+                self._append_columns(generation, older, _PENDING_PREFIX)
+
+            if covered is not None and covered[0] <= covered[1]:
+                ranges = self.coverage(source, symbol, interval) + [tuple(int(value) for value in covered)]
+                self._write_json(os.path.join(series_dir, 'coverage.json'), _merge_coverage(ranges))
+            return int(np.count_nonzero(newer)) + len(older)
+
+    def compact(self, source, symbol, interval):
+        """Fold the pending journal into a fresh generation. Returns the number of stored bars."""
+        series_dir = self._series_dir(source, symbol, interval)
+        with self._locked(series_dir):
+            generation = self._current_generation(series_dir)
+            if generation is None:
+                return 0
+            pending = self._open_columns(generation, _PENDING_PREFIX)
+            if not len(pending['time']):
+                return len(self._open_columns(generation)['time'])
+
+            merged = self.read(source, symbol, interval)
+            sequence = int(os.path.basename(generation).split('-')[-1]) + 1
+            replacement = self._new_generation(series_dir, sequence)
+            self._append_columns(replacement, merged)
+            self._publish(series_dir, replacement)
+            shutil.rmtree(generation, ignore_errors=True)
+            return len(merged)
+
+    def intervals(self, source, symbol):
+        """Intervals stored for ``(source, symbol)``."""
+        symbol_dir = os.path.dirname(self._series_dir(source, symbol, '_'))
+        try:
+            names = os.listdir(symbol_dir)
+        except FileNotFoundError:
+            return []
+        return sorted(name for name in names if os.path.isfile(os.path.join(symbol_dir, name, 'CURRENT')))
+
+    def series(self):
+        """Every stored ``(source, symbol, interval)``."""
+        found = []
+        for dirpath, _, filenames in os.walk(self.root):
+            if 'CURRENT' in filenames:
+                found.append(tuple(os.path.relpath(dirpath, self.root).split(os.sep)))
+        return sorted(found)
+
+    def compact_all(self):
+        return {key: self.compact(*key) for key in self.series()}
+
+    @staticmethod
+    def _already_stored(main, frame):
+        times = main['time']
+        positions = np.clip(np.searchsorted(times, frame.time), 0, max(len(times) - 1, 0))
+        if not len(times):
+            return np.zeros(len(frame), dtype=bool)
+        stored = times[positions] == frame.time
+        for name in BAR_FIELDS[1:]:
+            stored &= main[name][positions] == getattr(frame, name)
+        return stored
+
+    @staticmethod
+    def _new_generation(series_dir, sequence):
+        generation = os.path.join(series_dir, f'gen-{sequence}')
+        shutil.rmtree(generation, ignore_errors=True)
+        os.makedirs(generation)
+        return generation
+
+    @staticmethod
+    def _publish(series_dir, generation):
+        tmp_path = os.path.join(series_dir, 'CURRENT.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as handle:
+            handle.write(os.path.basename(generation))
+        os.replace(tmp_path, os.path.join(series_dir, 'CURRENT'))
+
+    @staticmethod
+    def _append_columns(generation, frame, prefix=''):
+        if not len(frame):
+            return
+        for name in BAR_FIELDS[1:] + ('time',):
+            column = np.ascontiguousarray(getattr(frame, name), dtype=_column_dtype(name))
+            with open(os.path.join(generation, f'{prefix}{name}.bin'), 'ab') as handle:
+                handle.write(column.tobytes())
+
+    @staticmethod
+    def _write_json(path, payload):
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as handle:
+            json.dump(payload, handle)
+        os.replace(tmp_path, path)
+
+    @contextmanager
+    def _locked(self, series_dir):
+        os.makedirs(series_dir, exist_ok=True)
+        with _lock, open(os.path.join(series_dir, '.lock'), 'a+') as handle:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+def _store_root():
+    configured = os.getenv('BACKTEST_BAR_STORE_DIR')
+    if configured:
+        return configured
+    storage = os.getenv('BACKTEST_STORAGE_DIR')
+    if storage:
+        return os.path.join(storage, 'bars')
+    return os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'storage', 'bars')
+
+
+def bar_store_enabled():
+    return os.getenv('BACKTEST_BAR_STORE_ENABLED', 'true').strip().lower() not in {'0', 'false', 'no', 'off'}
+
+
+def get_bar_store():
+    """The store for the configured root, or None when disabled."""
+    if not bar_store_enabled():
+        return None
+    return BarStore(_store_root())
@@ -1,10 +1,28 @@
 import math
+import time
 
+import numpy as np
+
+from .bar_store import get_bar_store, interval_to_millis, to_millis
+from .frame import BarFrame, bars_to_records
 from .providers import get_backtest_provider, resolve_data_source
-from ..strategy_runtime import execute_backtest_strategy, preflight_strategy
+from .resample import can_resample, market_sessions, resample
+from ..strategy_runtime import (
+    execute_backtest_strategy,
+    execute_backtest_strategy_batch,
+    preflight_strategy,
+    preflight_strategy_batch,
+)
+
+
+_DAY_MS = 86_400_000
+_DAILY_ONLY_SOURCES = {'joinquant', 'akshare', 'sinagold', 'freegold'}
+# Daily-only sources without native coarser periods; those are built from their daily bars.
+_RESAMPLE_FROM_DAILY_SOURCES = {'joinquant', 'sinagold', 'freegold'}
 
 
 def _calculate_summary(bars):
+    bars = BarFrame.coerce(bars)
     if len(bars) < 2:
         return {
             "totalReturn": 0,
@@ -17,38 +35,30 @@ def _calculate_summary(bars):
             "avgHoldingDays": 0,
         }
 
-    closes = [bar["close"] for bar in bars]
-    total_return = (closes[-1] / closes[0] - 1) * 100
+    closes = bars.close
+    times = bars.time
+    total_return = (float(closes[-1]) / float(closes[0]) - 1) * 100
 
-    start_ms = bars[0]["time"]
-    end_ms = bars[-1]["time"]
+    start_ms = int(times[0])
+    end_ms = int(times[-1])
     duration_days = max((end_ms - start_ms) / 86_400_000, 1)
     annualized_return = (pow(1 + total_return / 100, 365 / duration_days) - 1) * 100
 
-    returns = [(closes[i] / closes[i - 1] - 1) for i in range(1, len(closes))]
-    avg_return = sum(returns) / len(returns)
-    variance = sum((r - avg_return) ** 2 for r in returns) / len(returns)
-    std_dev = math.sqrt(variance)
+    returns = closes[1:] / closes[:-1] - 1
+    avg_return = float(np.mean(returns))
+    std_dev = float(np.std(returns))
 
-    if len(bars) > 1:
-        period_seconds = max((bars[1]["time"] - bars[0]["time"]) / 1000, 1)
-    else:
-        period_seconds = 60
+    period_seconds = max((int(times[1]) - int(times[0])) / 1000, 1)
     periods_per_year = 31_536_000 / period_seconds
     sharpe_ratio = (avg_return / std_dev * math.sqrt(periods_per_year)) if std_dev > 0 else 0
 
-    max_drawdown = 0
-    peak = closes[0]
-    for close in closes:
-        peak = max(peak, close)
-        drawdown = (close / peak - 1) * 100
-        if drawdown < max_drawdown:
-            max_drawdown = drawdown
-
-    wins = sum(1 for r in returns if r > 0)
-    win_rate = wins / len(returns) * 100 if returns else 0
-    profit = sum(r for r in returns if r > 0)
-    loss = sum(r for r in returns if r < 0)
+    peaks = np.maximum.accumulate(closes)
+    max_drawdown = float(np.min((closes / peaks - 1) * 100))
+
+    wins = int(np.count_nonzero(returns > 0))
+    win_rate = wins / len(returns) * 100 if len(returns) else 0
+    profit = float(np.sum(returns[returns > 0]))
+    loss = float(np.sum(returns[returns < 0]))
     profit_factor = profit / abs(loss) if loss < 0 else 0
 
     avg_holding_days = period_seconds / 86_400
@@ -77,15 +87,15 @@ def run_backtest(
     strategy_params=None,
     data_source=None,
     user_id=None,
+    bars=None,
+    data_range_notice=None,
 ):
-    provider = get_backtest_provider(data_source)
-    kline = provider.get_bars(
-        symbol,
-        limit=limit,
-        interval=interval,
-        start_time=start_time,
-        end_time=end_time,
-    )
+    if bars is None:
+        provider = get_backtest_provider(data_source)
+        kline = _fetch_bars(provider, symbol, limit, interval, start_time, end_time, data_source=data_source)
+    else:
+        provider = None
+        kline = BarFrame.coerce(bars)
 
     runtime = None
     if strategy_id:
@@ -101,7 +111,177 @@ def run_backtest(
     else:
         trades = []
 
+    result = _build_result(provider, symbol, data_source, kline, trades, runtime, _calculate_summary(kline))
+    if data_range_notice:
+        result["data_range_notice"] = data_range_notice
+    return result
+
+
+def run_backtest_batch(
+    symbol,
+    strategy_id,
+    param_sets,
+    strategy_version=None,
+    interval=None,
+    limit=500,
+    start_time=None,
+    end_time=None,
+    data_source=None,
+    user_id=None,
+    bars=None,
+):
+    """Backtest one strategy against one bar set for many parameter sets.
+
+    Bars are fetched (unless passed in via ``bars``) and the package is loaded once. The
+    returned list is aligned with ``param_sets``; a set that failed validation or raised inside
+    the strategy is returned as the StrategyRuntimeError describing it instead of a result dict.
+    """
+    param_sets = list(param_sets)
+    if not param_sets:
+        return []
+
+    if bars is None:
+        provider = get_backtest_provider(data_source)
+        kline = _fetch_bars(provider, symbol, limit, interval, start_time, end_time, data_source=data_source)
+    else:
+        provider = None
+        kline = BarFrame.coerce(bars)
+    loaded_strategy, validated = preflight_strategy_batch(
+        strategy_id,
+        strategy_version,
+        param_sets,
+        user_id=user_id,
+    )
+    runnable = [params for params in validated if not isinstance(params, Exception)]
+    outcomes = iter(execute_backtest_strategy_batch(symbol, kline, loaded_strategy, runnable))
     summary = _calculate_summary(kline)
+
+    results = []
+    for params in validated:
+        outcome = params if isinstance(params, Exception) else next(outcomes)
+        if isinstance(outcome, Exception):
+            results.append(outcome)
+            continue
+        results.append(_build_result(
+            provider,
+            symbol,
+            data_source,
+            kline,
+            outcome.get('trades') or [],
+            outcome.get('runtime'),
+            dict(summary),
+        ))
+    return results
+
+
+def load_backtest_bars(symbol, interval=None, limit=500, start_time=None, end_time=None, data_source=None):
+    provider = get_backtest_provider(data_source)
+    return _fetch_bars(provider, symbol, limit, interval, start_time, end_time, data_source=data_source)
+
+
+def fetch_backtest_bars(symbol, interval=None, limit=500, start_time=None, end_time=None, data_source=None):
+    """Like ``load_backtest_bars``, also returning the provider's data-range notice (or None)."""
+    provider = get_backtest_provider(data_source)
+    bars = _fetch_bars(provider, symbol, limit, interval, start_time, end_time, data_source=data_source)
+    return bars, getattr(provider, 'last_data_range_notice', None)
+
+
+def _fetch_bars(provider, symbol, limit, interval, start_time, end_time, data_source=None):
+    store = get_bar_store() if start_time is not None and end_time is not None else None
+    source = resolve_data_source(data_source, symbol)
+    interval_key = interval or _default_interval(provider, symbol)
+    step = interval_to_millis(interval_key)
+    if source in _RESAMPLE_FROM_DAILY_SOURCES and can_resample(_DAY_MS, step):
+        return _resample_daily(provider, symbol, limit, step, start_time, end_time, data_source)
+    if source in _DAILY_ONLY_SOURCES and step != _DAY_MS:
+        # e.g. AkShare reads "1m" as monthly; those bars keep changing until the period ends.
+        step = None
+    if store is None or source == 'mock' or step is None:
+        return BarFrame.coerce(provider.get_bars(
+            symbol,
+            limit=limit,
+            interval=interval,
+            start_time=start_time,
+            end_time=end_time,
+        ))
+
+    # Ranged requests read the local columnar store first and only fall back to the provider
+    # when the range has not been fully served before.
+    start_ms, end_ms = to_millis(start_time), to_millis(end_time)
+    stored = store.read_covered(source, symbol, interval_key, start_ms, end_ms)
+    if stored is None:
+        stored = _resample_from_store(store, source, symbol, interval_key, step, start_ms, end_ms)
+    if stored is not None:
+        # Trimmed like the providers trim a ranged fetch, so a hit matches the original response.
+        return _tail(stored, limit)
+
+    bars = BarFrame.coerce(provider.get_bars(
+        symbol,
+        limit=limit,
+        interval=interval,
+        start_time=start_time,
+        end_time=end_time,
+    ))
+    if len(bars) and not getattr(provider, 'last_data_range_notice', None):
+        # Only closed candles are final; the open tail stays uncovered so it is fetched again.
+        covered_end = min(end_ms, int(time.time() * 1000) - step)
+        # A response cut to ``limit`` only describes the range from its first bar on.
+        covered_start = int(bars.time[0]) if _limit(limit) and len(bars) >= _limit(limit) else start_ms
+        store.append(source, symbol, interval_key, bars, covered=(covered_start, covered_end))
+    return bars
+
+
+def _limit(limit):
+    try:
+        return int(limit) if limit else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _tail(bars, limit):
+    limit = _limit(limit)
+    return bars.tail(limit) if limit and len(bars) > limit else bars
+
+
+def _resample_daily(provider, symbol, limit, step, start_time, end_time, data_source):
+    days_per_bar = step // _DAY_MS
+    daily_limit = int(limit) * days_per_bar if limit else limit
+    daily = _fetch_bars(provider, symbol, daily_limit, '1d', start_time, end_time, data_source=data_source)
+    bars = resample(daily, step)
+    if start_time is not None and end_time is not None:
+        return bars.between(to_millis(start_time), to_millis(end_time))
+    return bars.tail(int(limit)) if limit else bars
+
+
+def _resample_from_store(store, source, symbol, interval_key, step, start_ms, end_ms):
+    """Build the range from the coarsest finer stored interval that divides ``step`` and covers it."""
+    bases = []
+    for base_interval in store.intervals(source, symbol):
+        base_step = interval_to_millis(base_interval)
+        if base_interval != interval_key and can_resample(base_step, step):
+            bases.append((base_step, base_interval))
+
+    now_ms = int(time.time() * 1000)
+    sessions, utc_offset_ms = market_sessions(source)
+    for base_step, base_interval in sorted(bases, reverse=True):
+        # The last bucket starting at ``end_ms`` needs base bars up to its own end, as far as
+        # those have closed.
+        needed_end = max(min(end_ms + step - base_step, now_ms - base_step), end_ms)
+        base = store.read_covered(source, symbol, base_interval, start_ms, needed_end)
+        if base is None:
+            continue
+        return resample(base, step, sessions, utc_offset_ms).between(start_ms, end_ms)
+    return None
+
+
+def _default_interval(provider, symbol):
+    select = getattr(provider, '_select', None)
+    if select is not None:
+        provider = select(symbol)
+    return getattr(provider, 'default_interval', None)
+
+
+def _build_result(provider, symbol, data_source, kline, trades, runtime, summary):
     result = {
         "kline": kline,
         "trades": trades,
@@ -114,3 +294,10 @@ def run_backtest(
     if runtime:
         result["runtime"] = runtime
     return result
+
+
+def serialize_backtest_result(result):
+    serialized = dict(result or {})
+    if "kline" in serialized:
+        serialized["kline"] = bars_to_records(serialized["kline"])
+    return serialized
@@ -0,0 +1,163 @@
+from datetime import datetime
+
+import numpy as np
+
+
+BAR_FIELDS = ("time", "open", "high", "low", "close", "volume")
+PRICE_FIELDS = ("open", "high", "low", "close", "volume")
+
+
+class BarFrame:
+    """Column-oriented OHLCV bars: int64 millisecond times plus float64 price/volume columns."""
+
+    __slots__ = BAR_FIELDS
+
+    def __init__(self, time, open, high, low, close, volume):
+        self.time = np.ascontiguousarray(time, dtype=np.int64)
+        self.open = np.ascontiguousarray(open, dtype=np.float64)
+        self.high = np.ascontiguousarray(high, dtype=np.float64)
+        self.low = np.ascontiguousarray(low, dtype=np.float64)
+        self.close = np.ascontiguousarray(close, dtype=np.float64)
+        self.volume = np.ascontiguousarray(volume, dtype=np.float64)
+
+        size = self.time.shape[0]
+        for name in BAR_FIELDS:
+            column = getattr(self, name)
+            if column.ndim != 1 or column.shape[0] != size:
+                raise ValueError(f"BarFrame column {name} has mismatched length")
+
+    @classmethod
+    def empty(cls):
+        return cls([], [], [], [], [], [])
+
+    @classmethod
+    def from_columns(cls, columns):
+        columns = columns or {}
+        time = columns.get("time")
+        if time is None:
+            time = []
+        size = len(time)
+        values = {}
+        for name in PRICE_FIELDS:
+            column = columns.get(name)
+            values[name] = column if column is not None else np.zeros(size)
+        return cls(time, **values)
+
+    @classmethod
+    def from_records(cls, records):
+        records = list(records or [])
+        if not records:
+            return cls.empty()
+        return cls(
+            [_coerce_time_ms(record.get("time", record.get("datetime"))) for record in records],
+            [record.get("open") or 0.0 for record in records],
+            [record.get("high") or 0.0 for record in records],
+            [record.get("low") or 0.0 for record in records],
+            [record.get("close") or 0.0 for record in records],
+            [record.get("volume") or 0.0 for record in records],
+        )
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Build from positional rows ``[time, open, high, low, close, volume, ...]``."""
+        rows = list(rows or [])
+        if not rows:
+            return cls.empty()
+        matrix = np.asarray([row[:6] for row in rows], dtype=np.float64)
+        return cls(
+            np.asarray([row[0] for row in rows], dtype=np.int64),
+            matrix[:, 1],
+            matrix[:, 2],
+            matrix[:, 3],
+            matrix[:, 4],
+            matrix[:, 5],
+        )
+
+    @classmethod
+    def coerce(cls, bars):
+        if isinstance(bars, cls):
+            return bars
+        if bars is None:
+            return cls.empty()
+        if isinstance(bars, dict):
+            return cls.from_columns(bars)
+        return cls.from_records(bars)
+
+    def __len__(self):
+        return int(self.time.shape[0])
+
+    def __iter__(self):
+        return iter(self.to_records())
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return self.take(key)
+        index = int(key)
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError("BarFrame index out of range")
+        return self.record(index)
+
+    def __eq__(self, other):
+        if isinstance(other, BarFrame):
+            return all(np.array_equal(getattr(self, name), getattr(other, name)) for name in BAR_FIELDS)
+        if isinstance(other, (list, tuple)):
+            return self.to_records() == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        if not len(self):
+            return "BarFrame(size=0)"
+        return f"BarFrame(size={len(self)}, start={int(self.time[0])}, end={int(self.time[-1])})"
+
+    def take(self, indexer):
+        return BarFrame(*(getattr(self, name)[indexer] for name in BAR_FIELDS))
+
+    def tail(self, count):
+        if count is None or count <= 0:
+            return self
+        return self.take(slice(-int(count), None))
+
+    def between(self, start_ms=None, end_ms=None):
+        lo = 0 if start_ms is None else int(np.searchsorted(self.time, int(start_ms), side="left"))
+        hi = len(self) if end_ms is None else int(np.searchsorted(self.time, int(end_ms), side="right"))
+        return self.take(slice(lo, hi))
+
+    def sorted(self):
+        if len(self) < 2 or bool(np.all(self.time[1:] >= self.time[:-1])):
+            return self
+        return self.take(np.argsort(self.time, kind="stable"))
+
+    def record(self, index):
+        return {
+            "time": int(self.time[index]),
+            "open": float(self.open[index]),
+            "high": float(self.high[index]),
+            "low": float(self.low[index]),
+            "close": float(self.close[index]),
+            "volume": float(self.volume[index]),
+        }
+
+    def to_columns(self):
+        return {name: getattr(self, name).tolist() for name in BAR_FIELDS}
+
+    def to_records(self):
+        columns = [getattr(self, name).tolist() for name in BAR_FIELDS]
+        return [dict(zip(BAR_FIELDS, values)) for values in zip(*columns)]
+
+
+def _coerce_time_ms(value):
+    if value is None:
+        return 0
+    if isinstance(value, datetime):
+        return int(value.timestamp() * 1000)
+    return int(value)
+
+
+def bars_to_records(bars):
+    if isinstance(bars, BarFrame):
+        return bars.to_records()
+    return list(bars or [])
@@ -1,24 +1,25 @@
 import os
 from datetime import date, datetime, time, timedelta, timezone
 
+import numpy as np
+
 from ..marketdata import BinanceClient, FreeGoldClient, SinaGoldClient
 from ..providers import AkShareClient
 from ..services import MarketDataService
+from .frame import BarFrame
 
 
 class MockProvider:
     def get_bars(self, symbol, limit=100, **_kwargs):
-        bars = []
-        for i in range(limit):
-            bars.append({
-                "time": 1700000000000 + i * 60000,
-                "open": 100 + i * 0.1,
-                "high": 100 + i * 0.2,
-                "low": 100 + i * 0.05,
-                "close": 100 + i * 0.15,
-                "volume": 1000 + i,
-            })
-        return bars
+        steps = np.arange(max(int(limit or 0), 0), dtype=np.float64)
+        return BarFrame(
+            1700000000000 + steps.astype(np.int64) * 60000,
+            100 + steps * 0.1,
+            100 + steps * 0.2,
+            100 + steps * 0.05,
+            100 + steps * 0.15,
+            1000 + steps,
+        )
 
 
 class BinanceProvider:
@@ -28,14 +29,23 @@ class BinanceProvider:
 
     def get_bars(self, symbol, limit=200, interval=None, start_time=None, end_time=None):
         interval = interval or self.default_interval
-        return self.client.get_klines(
+        if start_time is not None and end_time is not None:
+            # A time range defines the window; it may span many 1000-bar pages.
+            return BarFrame.coerce(self.client.get_klines_range(
+                symbol,
+                interval=interval,
+                start_time=start_time,
+                end_time=end_time,
+                use_cache=True,
+            ))
+        return BarFrame.coerce(self.client.get_klines(
             symbol,
             interval=interval,
             limit=limit,
             start_time=start_time,
             end_time=end_time,
             use_cache=True,
-        )
+        ))
 
     def get_latest_price(self, symbol):
         return self.client.get_latest_price(symbol, use_cache=True)
@@ -55,14 +65,14 @@ class FreeGoldProvider:
 
     def get_bars(self, symbol, limit=200, interval=None, start_time=None, end_time=None):
         interval = interval or self.default_interval
-        return self.client.get_klines(
+        return BarFrame.coerce(self.client.get_klines(
             symbol,
             interval=interval,
             limit=limit,
             start_time=start_time,
             end_time=end_time,
             use_cache=True,
-        )
+        ))
 
     def get_latest_price(self, symbol):
         if symbol and not _is_gold_symbol(symbol):
@@ -77,14 +87,14 @@ class SinaGoldProvider:
 
     def get_bars(self, symbol, limit=200, interval=None, start_time=None, end_time=None):
         interval = interval or self.default_interval
-        return self.client.get_klines(
+        return BarFrame.coerce(self.client.get_klines(
             symbol,
             interval=interval,
             limit=limit,
             start_time=start_time,
             end_time=end_time,
             use_cache=True,
-        )
+        ))
 
     def get_latest_price(self, symbol):
         return self.client.get_latest_price(symbol, use_cache=True)
@@ -107,16 +117,16 @@ def _coerce_date(value):
     raise TypeError(f"Unsupported date type: {type(value)}")
 
 
-def _to_bar(row):
-    ts = datetime.combine(row["trade_date"], time.min, tzinfo=timezone.utc)
-    return {
-        "time": int(ts.timestamp() * 1000),
-        "open": row["open"],
-        "high": row["high"],
-        "low": row["low"],
-        "close": row["close"],
-        "volume": row["volume"],
-    }
+def _to_frame(rows):
+    rows = list(rows or [])
+    return BarFrame(
+        [int(datetime.combine(row["trade_date"], time.min, tzinfo=timezone.utc).timestamp() * 1000) for row in rows],
+        [row["open"] for row in rows],
+        [row["high"] for row in rows],
+        [row["low"] for row in rows],
+        [row["close"] for row in rows],
+        [row["volume"] for row in rows],
+    )
 
 
 def _daily_range(limit, start_time, end_time):
@@ -143,13 +153,13 @@ class JoinQuantBacktestProvider:
         result = self.market_data_service.get_market_data(symbol, start_date, end_date)
         self.last_data_range_notice = result.get("data_range_notice")
 
-        bars = [_to_bar(row) for row in result["bars"]]
+        bars = _to_frame(result["bars"])
         try:
             limit = int(limit) if limit is not None else None
         except (TypeError, ValueError):
             limit = None
         if limit and len(bars) > limit:
-            bars = bars[-limit:]
+            bars = bars.tail(limit)
         return bars
 
     def get_latest_price(self, symbol):
@@ -191,13 +201,13 @@ class AkShareBacktestProvider:
             period=period,
             adjust=self.default_adjust,
         )
-        bars = [_to_bar(row) for row in rows]
+        bars = _to_frame(rows)
         try:
             limit = int(limit) if limit is not None else None
         except (TypeError, ValueError):
             limit = None
         if limit and len(bars) > limit:
-            return bars[-limit:]
+            return bars.tail(limit)
         return bars
 
     def get_latest_price(self, symbol):
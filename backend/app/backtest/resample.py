@@ -0,0 +1,69 @@
+"""Vectorized OHLCV resampling of BarFrames onto coarser fixed intervals.
+
+Bars are labelled by the start of their bucket, like the provider bars they are built from. Plain
+buckets are multiples of the step since the epoch (weeks start on Monday). For markets with trading
+sessions, intraday buckets restart at every session open so a bucket never spans a break: A-share
+60m bars are 09:30, 10:30, 13:00 and 14:00 Beijing time rather than clock hours.
+"""
+
+import numpy as np
+
+from .frame import BarFrame
+
+
+DAY_MS = 86_400_000
+WEEK_MS = 7 * DAY_MS
+# 1970-01-05 was the first Monday after the epoch.
+WEEK_ORIGIN_MS = 4 * DAY_MS
+
+# Continuous sessions as (open, close) minutes of the local day, with the local UTC offset.
+A_SHARE_SESSIONS = ((9 * 60 + 30, 11 * 60 + 30), (13 * 60, 15 * 60))
+A_SHARE_UTC_OFFSET_MS = 8 * 3_600_000
+_SESSION_SOURCES = {'joinquant', 'akshare'}
+
+
+def market_sessions(source):
+    """``(sessions, utc_offset_ms)`` for a data source, or ``(None, 0)`` for round-the-clock markets."""
+    if source in _SESSION_SOURCES:
+        return A_SHARE_SESSIONS, A_SHARE_UTC_OFFSET_MS
+    return None, 0
+
+
+def can_resample(base_step, target_step):
+    return bool(base_step and target_step and target_step > base_step and target_step % base_step == 0)
+
+
+def bucket_starts(times, step_ms, sessions=None, utc_offset_ms=0):
+    times = np.asarray(times, dtype=np.int64)
+    step_ms = int(step_ms)
+    if not sessions or step_ms >= DAY_MS:
+        origin = WEEK_ORIGIN_MS if step_ms % WEEK_MS == 0 else 0
+        return (times - origin) // step_ms * step_ms + origin
+
+    local = times + utc_offset_ms
+    day = local - local % DAY_MS
+    offset_in_day = local - day
+    opens = np.asarray([start * 60_000 for start, _ in sessions], dtype=np.int64)
+    # Bars before the first open (auction prints) fold into the first session.
+    session = np.clip(np.searchsorted(opens, offset_in_day, side='right') - 1, 0, len(opens) - 1)
+    session_open = opens[session]
+    elapsed = np.maximum(offset_in_day - session_open, 0)
+    return day + session_open + elapsed // step_ms * step_ms - utc_offset_ms
+
+
+def resample(bars, step_ms, sessions=None, utc_offset_ms=0):
+    """Aggregate ``bars`` into ``step_ms`` buckets: first open, max high, min low, last close, summed volume."""
+    frame = BarFrame.coerce(bars).sorted()
+    if not len(frame):
+        return frame
+    buckets = bucket_starts(frame.time, step_ms, sessions, utc_offset_ms)
+    firsts = np.flatnonzero(np.concatenate(([True], buckets[1:] != buckets[:-1])))
+    lasts = np.concatenate((firsts[1:], [len(frame)])) - 1
+    return BarFrame(
+        buckets[firsts],
+        frame.open[firsts],
+        np.maximum.reduceat(frame.high, firsts),
+        np.minimum.reduceat(frame.low, firsts),
+        frame.close[lasts],
+        np.add.reduceat(frame.volume, firsts),
+    )
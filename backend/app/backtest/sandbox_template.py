@@ -1,24 +1,52 @@
+import inspect
 import json
 
+from ..strategy_runtime import history, vector
+
 
 RESULT_PREFIX = "__QYQUANT_RESULT__="
 
 
-def build_sandbox_script(code, market_data, params, metadata=None):
+def _module_body(module):
+    # The script imports numpy itself (optionally), so the module's own imports are dropped.
+    lines = inspect.getsource(module).splitlines()
+    return "\n".join(line for line in lines if not line.startswith(("from ", "import ")))
+
+
+# Shared with the local runtime by construction: the remote script embeds the real sources.
+_HISTORY_SOURCE = _module_body(history)
+_VECTOR_SOURCE = "\n\n\n".join([
+    "\n".join(f"{name} = {getattr(vector, name)!r}" for name in ("OUTPUT_TARGET", "OUTPUT_SIGNAL", "OUTPUTS")),
+    inspect.getsource(vector.orders_from_output),
+    inspect.getsource(vector.simulate_fills),
+])
+
+
+def build_sandbox_script(code, market_data, params, metadata=None, param_sets=None):
     payload = {
         "code": code,
         "market_data": market_data,
         "params": params,
         "metadata": metadata or {},
     }
+    if param_sets is not None:
+        payload["param_sets"] = list(param_sets)
     payload_json = json.dumps(payload, ensure_ascii=False)
     return f"""
+from __future__ import annotations
+
 import ast
 import builtins
 import json
+import signal
 import traceback
 from datetime import datetime, timezone
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 RESULT_PREFIX = {RESULT_PREFIX!r}
 PAYLOAD = json.loads({payload_json!r})
 
@@ -112,8 +140,10 @@ def _guard_strategy_source(source):
                 raise PermissionError(f'forbidden_builtin:{{node.func.id}}')
 
 
+{_HISTORY_SOURCE}
+
 class StrategyContext:
-    def __init__(self, symbol, params, initial_cash=100000.0):
+    def __init__(self, symbol, params, initial_cash=100000.0, lookback=None):
         self.symbol = symbol
         self.params = dict(params or {{}})
         self.parameters = ParameterAccessor(self.params)
@@ -122,15 +152,23 @@ class StrategyContext:
         self.account = Account(float(initial_cash))
         self.current_dt = None
         self._latest_bar = None
+        self._history = BarHistory(lookback or DEFAULT_LOOKBACK) if np is not None else None
 
     def sync_bar(self, bar):
         self._latest_bar = bar
+        if self._history is not None:
+            self._history.push(bar)
         self.symbol = bar.symbol or self.symbol
         self.current_dt = bar.datetime
         position = self.account.positions.get(self.symbol)
         if position is not None:
             position.current_price = float(bar.close)
 
+    def history(self, field, n=None):
+        if self._history is None:
+            raise ValueError('ctx.history requires numpy')
+        return self._history.view(field, n)
+
     def emit_order(self, order):
         normalized = normalize_order(order, self.symbol)
         if normalized is None:
@@ -359,22 +397,8 @@ def _create_strategy(target, ctx):
     raise ValueError('entrypoint_not_callable')
 
 
-def _run():
-    source = PAYLOAD['code']
-    metadata = PAYLOAD.get('metadata') or {{}}
-    bars = (PAYLOAD.get('market_data') or {{}}).get('bars') or []
-    params = PAYLOAD.get('params') or {{}}
-    symbol = (PAYLOAD.get('market_data') or {{}}).get('symbol') or metadata.get('symbol')
-    callable_name = metadata.get('callable_name')
-
-    _guard_strategy_source(source)
-    namespace = {{'__builtins__': _build_safe_builtins(), '__name__': '__strategy__'}}
-    exec(source, namespace, namespace)
-    target = namespace.get(callable_name)
-    if target is None:
-        raise ValueError('entrypoint_not_found')
-
-    ctx = StrategyContext(symbol, params)
+def _run_params(target, symbol, bars, params, lookback=None):
+    ctx = StrategyContext(symbol, params, lookback=lookback)
     strategy = _create_strategy(target, ctx)
     trades = []
 
@@ -404,6 +428,99 @@ def _run():
     return {{'trades': trades, 'logs': ctx.logs}}
 
 
+class BarColumns:
+    def __init__(self, symbol, bars):
+        if np is None:
+            raise ValueError('vector_v1 requires numpy')
+        bars = [make_bar(symbol, bar) for bar in bars]
+        for name in HISTORY_FIELDS:
+            values = [
+                getattr(bar, name) if getattr(bar, name) is not None else int(bar.datetime.timestamp() * 1000)
+                for bar in bars
+            ]
+            column = np.asarray(values, dtype=np.int64 if name == 'time' else np.float64)
+            column.flags.writeable = False
+            setattr(self, name, column)
+
+    def __len__(self):
+        return len(self.time)
+
+
+{_VECTOR_SOURCE}
+
+def _run_vector_params(target, symbol, frame, params, output=None):
+    ctx = StrategyContext(symbol, params)
+    if isinstance(target, type):
+        strategy = _create_strategy(target, ctx)
+        handler = getattr(strategy, 'on_bars', None)
+    else:
+        strategy = None
+        handler = target
+    if not callable(handler):
+        raise ValueError('entrypoint_not_callable')
+
+    _invoke_optional(strategy, 'on_init', ctx)
+    orders = orders_from_output(handler(ctx, frame), len(frame), output or OUTPUT_TARGET)
+    trades = simulate_fills(ctx.symbol, frame, orders)
+    for trade in trades:
+        ctx.apply_trade(trade)
+    _invoke_optional(strategy, 'on_finish', ctx, {{'tradeCount': len(trades)}})
+    return {{'trades': trades, 'logs': ctx.logs}}
+
+
+class _SetTimeout(BaseException):
+    pass
+
+
+def _expire(signum, frame):
+    raise _SetTimeout()
+
+
+def _run_batch_item(run, params, seconds=None):
+    if seconds:
+        signal.signal(signal.SIGALRM, _expire)
+        signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        return {{'ok': True, **run(params)}}
+    except _SetTimeout:
+        return {{'ok': False, 'error_code': 'strategy_timeout', 'error': f'parameter set exceeded {{seconds}} seconds'}}
+    except Exception as exc:
+        return {{'ok': False, 'error': str(exc)}}
+    finally:
+        if seconds:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def _run():
+    source = PAYLOAD['code']
+    metadata = PAYLOAD.get('metadata') or {{}}
+    bars = (PAYLOAD.get('market_data') or {{}}).get('bars') or []
+    params = PAYLOAD.get('params') or {{}}
+    symbol = (PAYLOAD.get('market_data') or {{}}).get('symbol') or metadata.get('symbol')
+    callable_name = metadata.get('callable_name')
+    lookback = metadata.get('lookback')
+
+    _guard_strategy_source(source)
+    namespace = {{'__builtins__': _build_safe_builtins(), '__name__': '__strategy__'}}
+    exec(source, namespace, namespace)
+    target = namespace.get(callable_name)
+    if target is None:
+        raise ValueError('entrypoint_not_found')
+
+    if metadata.get('interface') == 'vector_v1':
+        frame = BarColumns(symbol, bars)
+        output = metadata.get('output')
+        run = lambda item: _run_vector_params(target, symbol, frame, item, output)
+    else:
+        run = lambda item: _run_params(target, symbol, bars, item, lookback)
+
+    param_sets = PAYLOAD.get('param_sets')
+    if param_sets is not None:
+        seconds = metadata.get('per_set_timeout_seconds')
+        return {{'results': [_run_batch_item(run, item or {{}}, seconds) for item in param_sets]}}
+    return run(params)
+
+
 try:
     result = _run()
     print(RESULT_PREFIX + json.dumps({{'ok': True, 'result': result}}, ensure_ascii=False))
@@ -5,7 +5,7 @@ from flask import after_this_request, request, send_file
 from flask_jwt_extended import get_jwt_identity, jwt_required
 from flask_smorest import Blueprint
 
-from ..backtest.engine import run_backtest
+from ..backtest.engine import run_backtest, serialize_backtest_result
 from ..celery_app import celery_app
 from ..extensions import db
 from ..models import BacktestJob, BacktestJobStatus, BacktestReport, Strategy
@@ -102,6 +102,7 @@ def _build_v1_job_params(payload):
         "strategy_params": parameters,
         "parameters": parameters,
         "enable_ai": payload.get("enable_ai", True),
+        "bypass_cache": bool(payload.get("bypass_cache", payload.get("bypassCache", False))),
         "locale": payload.get("locale", "en"),
     }
 
@@ -186,6 +187,7 @@ def run():
             "strategy_params": strategy_params,
             "data_source": data_source,
             "enable_ai": payload.get("enableAi", payload.get("enable_ai", True)),
+            "bypass_cache": bool(payload.get("bypassCache", payload.get("bypass_cache", False))),
             "locale": payload.get("locale", "en"),
         },
     )
@@ -253,7 +255,7 @@ def latest():
         if exc.message == "strategy_not_found":
             return error_response("STRATEGY_NOT_FOUND", "策略不存在或无权访问", 404)
         return as_response(exc), 400
-    return ok(result)
+    return ok(serialize_backtest_result(result))
 
 
 @bp.get("/v1/backtest/quota")
@@ -15,6 +15,7 @@ from ..schemas import StrategySchema
 from ..services.marketplace_trial_backtest import launch_marketplace_trial_backtest
 from ..services.notifications import create_notification
 from ..strategy_runtime import StrategyRuntimeError, as_response
+from ..strategy_runtime.loader import invalidate_strategy_package_cache
 from ..utils.audit import log_audit
 from ..utils.response import error_response, ok
 from ..utils.storage import read_json
@@ -724,6 +725,7 @@ def _ensure_onboarding_strategy():
         )
 
     db.session.commit()
+    invalidate_strategy_package_cache(strategy_id)
     _onboarding_seeded = True
 
 
@@ -38,7 +38,7 @@ from ..services.strategy_import_confirm import (
 )
 from ..services.strategy_import import StrategyImportError, import_strategy_package
 from ..strategy_runtime import StrategyRuntimeError
-from ..strategy_runtime.loader import load_strategy_package
+from ..strategy_runtime.loader import invalidate_strategy_package_cache, load_strategy_package
 from ..utils.response import error_response, ok
 from ..utils.time import now_ms
 
@@ -595,7 +595,7 @@ def optimize_strategy_parameters(strategy_id):
 
     payload = request.get_json() or {}
     level = payload.get("level", "standard")
-    if level not in ("quick", "standard", "deep"):
+    if level not in ("quick", "standard", "deep", "halving"):
         level = "standard"
 
     try:
@@ -621,6 +621,8 @@ def optimize_strategy_parameters(strategy_id):
         "overfittingRisk": result.overfitting_risk,
         "searchSpaceSize": result.search_space_size,
         "evaluations": result.evaluations,
+        "barEvaluations": result.bar_evaluations,
+        "barEvaluationsSaved": result.bar_evaluations_saved,
     })
 
 
@@ -869,6 +871,7 @@ def _delete_strategy_assets(strategy):
 
     for version in versions:
         db.session.delete(version)
+    invalidate_strategy_package_cache(strategy.id)
 
     # Flush to clear version + strategy FK references before deleting files
     db.session.flush()
@@ -94,6 +94,11 @@ celery_app.conf.beat_schedule = {
         'schedule': crontab(day_of_month='1', hour=0, minute=0),
         'options': {'queue': 'default'},
     },
+    'compact-bar-store': {
+        'task': 'app.tasks.backtests.compact_bar_store_task',
+        'schedule': crontab(hour=3, minute=30),
+        'options': {'queue': 'backtest'},
+    },
     'check-jqdata-health': {
         'task': 'app.tasks.data_source_tasks.check_jqdata_health',
         'schedule': crontab(minute='*/5'),
@@ -1,21 +1,97 @@
 import json
 import logging
 import os
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from urllib.error import HTTPError, URLError
 from urllib.parse import urlencode
 from urllib.request import Request, urlopen
 
-from ..utils.cache import cache_get_json, cache_set_json
+from ..utils.cache import cache_get_or_load_json
+from .segment_cache import KlineSegmentCache
 
 
 logger = logging.getLogger(__name__)
 
 
+MAX_KLINES_PER_REQUEST = 1000
+_INTERVAL_UNITS_MS = {'s': 1000, 'm': 60_000, 'h': 3_600_000, 'd': 86_400_000, 'w': 604_800_000}
+_INTERVAL_PATTERN = re.compile(r'^(\d+)([smhdw])$')
+
+
 class BinanceAPIError(RuntimeError):
     pass
 
 
+class BinanceRateLimitError(BinanceAPIError):
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def interval_to_millis(interval):
+    """Fixed width of a kline interval in ms, or None for calendar intervals such as ``1M``."""
+    match = _INTERVAL_PATTERN.match(str(interval or ''))
+    if not match:
+        return None
+    return int(match.group(1)) * _INTERVAL_UNITS_MS[match.group(2)]
+
+
+def kline_request_weight(limit):
+    # https://binance-docs.github.io/apidocs/spot/en/#kline-candlestick-data
+    if limit < 100:
+        return 1
+    if limit < 500:
+        return 2
+    if limit <= 1000:
+        return 5
+    return 10
+
+
+class WeightLimiter:
+    """Sliding one-minute window over request weight, shared by every client in the process."""
+
+    def __init__(self, limit_per_minute, window_seconds=60.0, clock=time.monotonic, sleep=time.sleep):
+        self.limit_per_minute = max(int(limit_per_minute), 1)
+        self.window_seconds = window_seconds
+        self._clock = clock
+        self._sleep = sleep
+        self._spent = deque()
+        self._used = 0
+        self._lock = threading.Lock()
+
+    def acquire(self, weight):
+        weight = min(max(int(weight), 1), self.limit_per_minute)
+        while True:
+            with self._lock:
+                now = self._clock()
+                while self._spent and self._spent[0][0] <= now - self.window_seconds:
+                    self._used -= self._spent.popleft()[1]
+                if self._used + weight <= self.limit_per_minute:
+                    self._spent.append((now, weight))
+                    self._used += weight
+                    return
+                wait = self._spent[0][0] + self.window_seconds - now
+            self._sleep(max(wait, 0.01))
+
+
+_weight_limiter = None
+_weight_limiter_lock = threading.Lock()
+
+
+def get_weight_limiter():
+    global _weight_limiter
+    if _weight_limiter is None:
+        with _weight_limiter_lock:
+            if _weight_limiter is None:
+                _weight_limiter = WeightLimiter(int(os.getenv('BINANCE_WEIGHT_LIMIT_PER_MINUTE', '1200')))
+    return _weight_limiter
+
+
 def _to_millis(value):
     if value is None:
         return None
@@ -47,11 +123,16 @@ class BinanceClient:
         timeout=None,
         kline_cache_ttl=None,
         price_cache_ttl=None,
+        range_concurrency=None,
+        weight_limiter=None,
     ):
         self.base_url = base_url or os.getenv('BINANCE_BASE_URL', 'https://api.binance.com')
         self.timeout = float(timeout or os.getenv('BINANCE_API_TIMEOUT', '10'))
         self.kline_cache_ttl = int(kline_cache_ttl or os.getenv('BINANCE_KLINE_CACHE_TTL', '300'))
         self.price_cache_ttl = int(price_cache_ttl or os.getenv('BINANCE_PRICE_CACHE_TTL', '2'))
+        self.range_concurrency = max(int(range_concurrency or os.getenv('BINANCE_RANGE_CONCURRENCY', '4')), 1)
+        self.weight_limiter = weight_limiter or get_weight_limiter()
+        self.segment_cache = KlineSegmentCache('binance', tail_ttl=self.kline_cache_ttl)
 
     def _request(self, path, params=None):
         url = f"{self.base_url}{path}"
@@ -70,6 +151,12 @@ class BinanceClient:
                 body = exc.read().decode('utf-8')
             except Exception:
                 body = exc.reason
+            if exc.code in (418, 429):
+                retry_after = (exc.headers or {}).get('Retry-After')
+                raise BinanceRateLimitError(
+                    f"Binance API error {exc.code}: {body}",
+                    retry_after=float(retry_after) if retry_after else None,
+                )
             raise BinanceAPIError(f"Binance API error {exc.code}: {body}")
         except URLError as exc:
             raise BinanceAPIError(f"Binance API request failed: {exc.reason}")
@@ -85,15 +172,15 @@ class BinanceClient:
 
     def get_klines(self, symbol, interval='1m', limit=200, start_time=None, end_time=None, use_cache=True):
         symbol = symbol.upper()
-        limit = max(1, min(int(limit), 1000))
+        limit = max(1, min(int(limit), MAX_KLINES_PER_REQUEST))
         start_ms = _to_millis(start_time)
         end_ms = _to_millis(end_time)
-        cache_key = f"binance:klines:{symbol}:{interval}:{start_ms or 'none'}:{end_ms or 'none'}:{limit}"
-
-        if use_cache:
-            cached = cache_get_json(cache_key)
-            if cached is not None:
-                return cached
+        step = interval_to_millis(interval)
+        if use_cache and step is not None and start_ms is None and end_ms is None:
+            # "Latest N bars" shares closed segments with range requests instead of expiring as a whole.
+            now_ms = int(time.time() * 1000)
+            first_ms = now_ms - now_ms % step - (limit - 1) * step
+            return self.get_klines_range(symbol, interval, first_ms, now_ms, use_cache=True)[-limit:]
 
         params = {'symbol': symbol, 'interval': interval, 'limit': limit}
         if start_ms is not None:
@@ -101,33 +188,126 @@ class BinanceClient:
         if end_ms is not None:
             params['endTime'] = end_ms
 
-        data = self._request('/api/v3/klines', params=params)
-        bars = [
-            {
-                "time": item[0],
-                "open": float(item[1]),
-                "high": float(item[2]),
-                "low": float(item[3]),
-                "close": float(item[4]),
-                "volume": float(item[5]),
-            }
-            for item in data
+        def _load():
+            return [
+                {
+                    "time": item[0],
+                    "open": float(item[1]),
+                    "high": float(item[2]),
+                    "low": float(item[3]),
+                    "close": float(item[4]),
+                    "volume": float(item[5]),
+                }
+                for item in self._request_klines(params)
+            ]
+
+        if not use_cache:
+            return _load()
+        cache_key = f"binance:klines:{symbol}:{interval}:{start_ms or 'none'}:{end_ms or 'none'}:{limit}"
+        return cache_get_or_load_json(cache_key, _load, ttl=self.kline_cache_ttl)
+
+    def get_klines_range(self, symbol, interval='1m', start_time=None, end_time=None, use_cache=True):
+        """Every kline in ``[start_time, end_time]`` (end defaults to now), however many pages it spans.
+
+        Fixed-width intervals go through the segment cache; the segments it is missing are split into
+        1000-bar pages and fetched concurrently. Calendar intervals (``1M``) are walked page by page.
+        Pages are stitched into one ordered, de-duplicated series.
+        """
+        symbol = symbol.upper()
+        start_ms = _to_millis(start_time)
+        end_ms = _to_millis(end_time)
+        if end_ms is None:
+            end_ms = int(time.time() * 1000)
+        if start_ms is None or start_ms > end_ms:
+            return []
+
+        step = interval_to_millis(interval)
+        if step is None:
+            return _stitch(self._walk_pages(symbol, interval, start_ms, end_ms, use_cache), start_ms, end_ms)
+        if not use_cache:
+            return self._fetch_range(symbol, interval, step, start_ms, end_ms)
+        return self.segment_cache.get_range(
+            symbol,
+            interval,
+            step,
+            start_ms,
+            end_ms,
+            lambda first_ms, last_ms: self._fetch_range(symbol, interval, step, first_ms, last_ms),
+        )
+
+    def _fetch_range(self, symbol, interval, step, start_ms, end_ms):
+        span = step * MAX_KLINES_PER_REQUEST
+        bounds = [
+            (page_start, page_start + span - 1)
+            for page_start in range(start_ms - start_ms % span, end_ms + 1, span)
         ]
+        return _stitch(self._fetch_pages(symbol, interval, bounds), start_ms, end_ms)
+
+    def _fetch_pages(self, symbol, interval, bounds):
+        def _fetch(page):
+            return self.get_klines(
+                symbol,
+                interval=interval,
+                limit=MAX_KLINES_PER_REQUEST,
+                start_time=page[0],
+                end_time=page[1],
+                use_cache=False,
+            )
+
+        if len(bounds) == 1:
+            return [_fetch(bounds[0])]
+        workers = min(self.range_concurrency, len(bounds))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='binance-klines') as executor:
+            return list(executor.map(_fetch, bounds))
 
-        if use_cache:
-            cache_set_json(cache_key, bars, ttl=self.kline_cache_ttl)
-        return bars
+    def _walk_pages(self, symbol, interval, start_ms, end_ms, use_cache):
+        pages = []
+        cursor = start_ms
+        while cursor <= end_ms:
+            page = self.get_klines(
+                symbol,
+                interval=interval,
+                limit=MAX_KLINES_PER_REQUEST,
+                start_time=cursor,
+                end_time=end_ms,
+                use_cache=use_cache,
+            )
+            pages.append(page)
+            if len(page) < MAX_KLINES_PER_REQUEST:
+                break
+            cursor = page[-1]["time"] + 1
+        return pages
+
+    def _request_klines(self, params, max_retries=3):
+        weight = kline_request_weight(params['limit'])
+        for attempt in range(max_retries + 1):
+            self.weight_limiter.acquire(weight)
+            try:
+                return self._request('/api/v3/klines', params=params)
+            except BinanceRateLimitError as exc:
+                if attempt >= max_retries:
+                    raise
+                delay = exc.retry_after if exc.retry_after is not None else 2 ** attempt
+                logger.warning("Binance rate limit hit, retrying klines in %.1fs", delay)
+                time.sleep(delay)
 
     def get_latest_price(self, symbol, use_cache=True):
         symbol = symbol.upper()
-        cache_key = f"binance:price:{symbol}"
-        if use_cache:
-            cached = cache_get_json(cache_key)
-            if cached is not None:
-                return float(cached["price"])
-
-        data = self._request('/api/v3/ticker/price', params={'symbol': symbol})
-        price = float(data['price'])
-        if use_cache:
-            cache_set_json(cache_key, {"price": price}, ttl=self.price_cache_ttl)
-        return price
+
+        def _load():
+            data = self._request('/api/v3/ticker/price', params={'symbol': symbol})
+            return {"price": float(data['price'])}
+
+        if not use_cache:
+            return _load()["price"]
+        cached = cache_get_or_load_json(f"binance:price:{symbol}", _load, ttl=self.price_cache_ttl)
+        return float(cached["price"])
+
+
+def _stitch(pages, start_ms, end_ms):
+    stitched = {}
+    for page in pages:
+        for bar in page:
+            if start_ms <= bar["time"] <= end_ms:
+                stitched[bar["time"]] = bar
+    return [stitched[key] for key in sorted(stitched)]
@@ -0,0 +1,86 @@
+import threading
+import time
+from bisect import bisect_left, bisect_right
+
+from ..utils.cache import cache_get_json, cache_set_json
+
+
+_FIELDS = ("open", "high", "low", "close", "volume")
+
+
+class ParsedDailyDataset:
+    """Daily bars parsed once into parallel, time-sorted columns.
+
+    ``slice`` finds the range with two bisects and only materializes the rows it returns, so a
+    repeat request costs O(log n + k) instead of re-parsing the whole upstream payload.
+    """
+
+    def __init__(self, bars):
+        bars = sorted(bars, key=lambda bar: bar["time"])
+        self.times = [bar["time"] for bar in bars]
+        self.columns = {name: [bar[name] for bar in bars] for name in _FIELDS}
+
+    def __len__(self):
+        return len(self.times)
+
+    def slice(self, start_ms=None, end_ms=None, limit=None):
+        lo = 0 if start_ms is None else bisect_left(self.times, start_ms)
+        hi = len(self.times) if end_ms is None else bisect_right(self.times, end_ms)
+        if limit and limit > 0:
+            lo = max(lo, hi - limit)
+        return [self.row(index) for index in range(lo, hi)]
+
+    def row(self, index):
+        bar = {"time": self.times[index]}
+        for name in _FIELDS:
+            bar[name] = self.columns[name][index]
+        return bar
+
+    def latest(self):
+        return self.row(len(self.times) - 1) if self.times else None
+
+
+class ParsedDatasetCache:
+    """Per-process parsed datasets, tied to the version token of the shared raw payload.
+
+    The client that refreshes a raw dataset from upstream writes a new token next to it; until
+    the token changes every process keeps reusing its parsed copy without deserializing the payload.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def version_key(raw_key):
+        return f"{raw_key}:version"
+
+    @classmethod
+    def mark_refreshed(cls, raw_key, ttl=None):
+        token = str(time.time_ns())
+        cache_set_json(cls.version_key(raw_key), token, ttl=ttl)
+        return token
+
+    def get(self, raw_key, load_raw, parse, ttl=None):
+        version = cache_get_json(self.version_key(raw_key))
+        with self._lock:
+            entry = self._entries.get(raw_key)
+        if entry is not None and version is not None and entry[0] == version:
+            return entry[1]
+
+        raw = load_raw()
+        version = cache_get_json(self.version_key(raw_key))
+        if version is None:
+            # Raw payload cached before tokens existed, or the token expired first.
+            version = self.mark_refreshed(raw_key, ttl=ttl)
+        dataset = ParsedDailyDataset(parse(raw))
+        with self._lock:
+            self._entries[raw_key] = (version, dataset)
+        return dataset
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+parsed_datasets = ParsedDatasetCache()
@@ -7,13 +7,17 @@ from datetime import datetime, timezone
 from urllib.error import HTTPError, URLError
 from urllib.request import Request, urlopen
 
-from ..utils.cache import cache_get_json, cache_set_json
+from ..utils.cache import cache_get_json, cache_set_json, single_flight
+from .daily_dataset import ParsedDailyDataset, ParsedDatasetCache, parsed_datasets
+from .segment_cache import DAY_MS, KlineSegmentCache
 
 
 logger = logging.getLogger(__name__)
 
 _MAX_RETRIES = 3
 _RETRY_BACKOFF = 2  # seconds, doubles each retry
+_SETTLE_MS = 3 * DAY_MS  # daily closes can be published a few days late
+_DATASET_CACHE_KEY = "freegold:data:latest"
 
 
 class FreeGoldAPIError(RuntimeError):
@@ -67,6 +71,7 @@ class FreeGoldClient:
         self.base_url = base_url or os.getenv('FREEGOLD_BASE_URL', 'https://freegoldapi.com')
         self.timeout = float(timeout or os.getenv('FREEGOLD_API_TIMEOUT', '30'))
         self.data_cache_ttl = int(data_cache_ttl or os.getenv('FREEGOLD_DATA_CACHE_TTL', '21600'))
+        self.segment_cache = KlineSegmentCache('freegold', tail_ttl=self.data_cache_ttl, settle_ms=_SETTLE_MS)
 
     def _request(self, path):
         url = f"{self.base_url}{path}"
@@ -109,67 +114,87 @@ class FreeGoldClient:
         return payload
 
     def _load_latest_dataset(self, use_cache=True):
-        cache_key = "freegold:data:latest"
-        if use_cache:
-            cached = cache_get_json(cache_key)
-            if cached is not None:
-                return cached
-
-        payload = self._request('/data/latest.json')
-        if not isinstance(payload, list):
-            raise FreeGoldAPIError("FreeGold API returned unexpected payload")
-
-        if use_cache:
-            cache_set_json(cache_key, payload, ttl=self.data_cache_ttl)
-        return payload
+        cache_key = _DATASET_CACHE_KEY
+
+        def _load():
+            payload = self._request('/data/latest.json')
+            if not isinstance(payload, list):
+                raise FreeGoldAPIError("FreeGold API returned unexpected payload")
+            if use_cache:
+                cache_set_json(cache_key, payload, ttl=self.data_cache_ttl)
+                ParsedDatasetCache.mark_refreshed(cache_key, ttl=self.data_cache_ttl)
+            return payload
+
+        if not use_cache:
+            return _load()
+        cached = cache_get_json(cache_key)
+        if cached is not None:
+            return cached
+        return single_flight(cache_key, _load, probe=lambda: cache_get_json(cache_key))
+
+    def _dataset(self, use_cache=True):
+        if not use_cache:
+            return ParsedDailyDataset(_parse_bars(self._load_latest_dataset(use_cache=False)))
+        return parsed_datasets.get(
+            _DATASET_CACHE_KEY,
+            lambda: self._load_latest_dataset(use_cache=True),
+            _parse_bars,
+            ttl=self.data_cache_ttl,
+        )
 
     def get_klines(self, symbol=None, interval='1d', limit=200, start_time=None, end_time=None, use_cache=True):
         interval = (interval or '1d').strip().lower()
         if interval not in {'1d', '1day', 'day', 'daily'}:
             logger.warning("FreeGold API only supports daily data; got interval=%s", interval)
 
-        data = self._load_latest_dataset(use_cache=use_cache)
-        bars = []
-        for item in data:
-            date_value = item.get('date')
-            price_value = item.get('price')
-            if date_value is None or price_value is None:
-                continue
-            try:
-                price = float(price_value)
-                ts = _date_to_millis(date_value)
-            except (ValueError, TypeError):
-                continue
-            bars.append({
-                "time": ts,
-                "open": price,
-                "high": price,
-                "low": price,
-                "close": price,
-                "volume": 0.0,
-            })
-
-        bars.sort(key=lambda bar: bar["time"])
-
-        start_ms = _to_millis(start_time)
-        end_ms = _to_millis(end_time)
-        if start_ms is not None:
-            bars = [bar for bar in bars if bar["time"] >= start_ms]
-        if end_ms is not None:
-            bars = [bar for bar in bars if bar["time"] <= end_ms]
-
         try:
             limit = int(limit) if limit is not None else None
         except (TypeError, ValueError):
             limit = None
+
+        start_ms = _to_millis(start_time)
+        end_ms = _to_millis(end_time)
+        if not use_cache or start_ms is None:
+            return self._dataset(use_cache=use_cache).slice(start_ms, end_ms, limit)
+
+        last_ms = end_ms if end_ms is not None else int(time.time() * 1000)
+        bars = self.segment_cache.get_range(
+            'XAUUSD',
+            '1d',
+            DAY_MS,
+            start_ms,
+            last_ms,
+            lambda first_ms, run_end_ms: self._dataset().slice(first_ms, run_end_ms),
+        )
         if limit and limit > 0 and len(bars) > limit:
             bars = bars[-limit:]
-
         return bars
 
     def get_latest_price(self, symbol=None, use_cache=True):
-        data = self._load_latest_dataset(use_cache=use_cache)
-        if not data:
+        latest = self._dataset(use_cache=use_cache).latest()
+        if latest is None:
             raise FreeGoldAPIError("FreeGold API returned empty dataset")
-        latest = data[-1]
-        return float(latest['price'])
+        return float(latest['close'])
+
+
+def _parse_bars(data):
+    bars = []
+    for item in data:
+        date_value = item.get('date')
+        price_value = item.get('price')
+        if date_value is None or price_value is None:
+            continue
+        try:
+            price = float(price_value)
+            ts = _date_to_millis(date_value)
+        except (ValueError, TypeError):
+            continue
+        bars.append({
+            "time": ts,
+            "open": price,
+            "high": price,
+            "low": price,
+            "close": price,
+            "volume": 0.0,
+        })
+    return bars
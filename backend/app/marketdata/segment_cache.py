@@ -0,0 +1,129 @@
+import time
+
+from ..utils.cache import cache_get_json, cache_set_json, single_flight
+
+
+DAY_MS = 86_400_000
+BARS_PER_CHUNK = 1000
+
+
+def chunk_span_ms(step_ms):
+    """Width of one cached segment: a UTC day, or 1000 bars for daily and coarser intervals."""
+    return max(DAY_MS, int(step_ms) * BARS_PER_CHUNK)
+
+
+class KlineSegmentCache:
+    """Range-aware kline cache keyed by (symbol, interval, chunk) instead of by exact request.
+
+    Segments are aligned to multiples of ``chunk_span_ms`` since the epoch, so overlapping requests
+    share them. A request reads the segments it covers, fetches each run of contiguous missing
+    segments with a single ``fetch(start_ms, end_ms)`` call, and stores what came back. Segments
+    whose candles have all closed (ending more than ``settle_ms`` ago) are stored without expiry;
+    the open tail segment is kept for ``tail_ttl`` seconds only. Concurrent requests for the same
+    missing run share one upstream fetch (see ``single_flight``).
+    """
+
+    def __init__(self, namespace, tail_ttl, settle_ms=0, clock=time.time):
+        self.namespace = namespace
+        self.tail_ttl = max(int(tail_ttl), 1)
+        self.settle_ms = int(settle_ms)
+        self._clock = clock
+
+    def _key(self, symbol, interval, chunk_start):
+        return f"{self.namespace}:segment:{symbol}:{interval}:{chunk_start}"
+
+    def get_range(self, symbol, interval, step_ms, start_ms, end_ms, fetch):
+        if start_ms > end_ms:
+            return []
+        span = chunk_span_ms(step_ms)
+        chunk_starts = list(range(start_ms - start_ms % span, end_ms + 1, span))
+
+        segments = {}
+        missing = []
+        for chunk_start in chunk_starts:
+            cached = cache_get_json(self._key(symbol, interval, chunk_start))
+            if cached is None:
+                missing.append(chunk_start)
+            else:
+                segments[chunk_start] = cached
+
+        for run_start, run_end in _contiguous_runs(missing, span):
+            segments.update(
+                single_flight(
+                    f"{self._key(symbol, interval, run_start)}:{run_end}",
+                    lambda: self._load_run(symbol, interval, span, run_start, run_end, fetch),
+                    probe=lambda: self._probe_run(symbol, interval, span, run_start, run_end),
+                )
+            )
+
+        bars = []
+        for chunk_start in chunk_starts:
+            bars.extend(
+                _from_row(row) for row in segments.get(chunk_start, [])
+                if start_ms <= row[0] <= end_ms
+            )
+        return bars
+
+    def _load_run(self, symbol, interval, span, run_start, run_end, fetch):
+        fetched = fetch(run_start, run_end) or []
+        rows = {chunk_start: {} for chunk_start in range(run_start, run_end + 1, span)}
+        for bar in fetched:
+            bar_time = int(bar["time"])
+            chunk = rows.get(bar_time - bar_time % span)
+            if chunk is not None:
+                chunk[bar_time] = _to_row(bar)
+
+        now_ms = int(self._clock() * 1000)
+        segments = {}
+        for chunk_start, chunk in rows.items():
+            segment = [chunk[key] for key in sorted(chunk)]
+            closed = chunk_start + span + self.settle_ms <= now_ms
+            cache_set_json(
+                self._key(symbol, interval, chunk_start),
+                segment,
+                ttl=None if closed else self.tail_ttl,
+            )
+            segments[chunk_start] = segment
+        return segments
+
+    def _probe_run(self, symbol, interval, span, run_start, run_end):
+        """The run's segments once another worker has stored all of them, else None."""
+        segments = {}
+        for chunk_start in range(run_start, run_end + 1, span):
+            cached = cache_get_json(self._key(symbol, interval, chunk_start))
+            if cached is None:
+                return None
+            segments[chunk_start] = cached
+        return segments
+
+
+def _contiguous_runs(chunk_starts, span):
+    runs = []
+    for chunk_start in chunk_starts:
+        if runs and runs[-1][1] + 1 == chunk_start:
+            runs[-1][1] = chunk_start + span - 1
+        else:
+            runs.append([chunk_start, chunk_start + span - 1])
+    return [tuple(run) for run in runs]
+
+
+def _to_row(bar):
+    return [
+        int(bar["time"]),
+        float(bar["open"]),
+        float(bar["high"]),
+        float(bar["low"]),
+        float(bar["close"]),
+        float(bar["volume"]),
+    ]
+
+
+def _from_row(row):
+    return {
+        "time": row[0],
+        "open": row[1],
+        "high": row[2],
+        "low": row[3],
+        "close": row[4],
+        "volume": row[5],
+    }
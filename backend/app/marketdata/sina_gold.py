@@ -7,7 +7,9 @@ from datetime import datetime, timezone
 from urllib.error import HTTPError, URLError
 from urllib.request import Request, urlopen
 
-from ..utils.cache import cache_get_json, cache_set_json
+from ..utils.cache import cache_get_json, cache_set_json, single_flight
+from .daily_dataset import ParsedDailyDataset, ParsedDatasetCache, parsed_datasets
+from .segment_cache import DAY_MS, KlineSegmentCache
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +39,9 @@ _SYMBOL_MAP = {
 }
 
 
+_SETTLE_MS = 3 * DAY_MS  # daily closes can be published a few days late
+
+
 class SinaGoldAPIError(RuntimeError):
     pass
 
@@ -94,6 +99,9 @@ class SinaGoldClient:
             data_cache_ttl or os.getenv("SINA_GOLD_CACHE_TTL", "21600")
         )
         self.timeout = float(timeout or os.getenv("SINA_GOLD_API_TIMEOUT", "15"))
+        self.segment_cache = KlineSegmentCache(
+            "sinagold", tail_ttl=self.data_cache_ttl, settle_ms=_SETTLE_MS
+        )
 
     def _fetch_daily_kline(self, sina_symbol):
         var_name = sina_symbol
@@ -122,22 +130,39 @@ class SinaGoldClient:
         except json.JSONDecodeError as exc:
             raise SinaGoldAPIError("Sina API returned non-JSON payload") from exc
 
+    @staticmethod
+    def _cache_key(symbol):
+        return f"sinagold:daily:{_resolve_symbol(symbol)}"
+
     def _load_dataset(self, symbol, use_cache=True):
         sina_symbol = _resolve_symbol(symbol)
-        cache_key = f"sinagold:daily:{sina_symbol}"
-
-        if use_cache:
-            cached = cache_get_json(cache_key)
-            if cached is not None:
-                return cached
-
-        raw = self._fetch_daily_kline(sina_symbol)
-        if not isinstance(raw, list):
-            raise SinaGoldAPIError("Sina API returned unexpected payload")
-
-        if use_cache:
-            cache_set_json(cache_key, raw, ttl=self.data_cache_ttl)
-        return raw
+        cache_key = self._cache_key(symbol)
+
+        def _load():
+            raw = self._fetch_daily_kline(sina_symbol)
+            if not isinstance(raw, list):
+                raise SinaGoldAPIError("Sina API returned unexpected payload")
+            if use_cache:
+                cache_set_json(cache_key, raw, ttl=self.data_cache_ttl)
+                ParsedDatasetCache.mark_refreshed(cache_key, ttl=self.data_cache_ttl)
+            return raw
+
+        if not use_cache:
+            return _load()
+        cached = cache_get_json(cache_key)
+        if cached is not None:
+            return cached
+        return single_flight(cache_key, _load, probe=lambda: cache_get_json(cache_key))
+
+    def _dataset(self, symbol, use_cache=True):
+        if not use_cache:
+            return ParsedDailyDataset(_parse_bars(self._load_dataset(symbol, use_cache=False)))
+        return parsed_datasets.get(
+            self._cache_key(symbol),
+            lambda: self._load_dataset(symbol, use_cache=True),
+            _parse_bars,
+            ttl=self.data_cache_ttl,
+        )
 
     def get_klines(
         self,
@@ -155,47 +180,51 @@ class SinaGoldClient:
                 raw_interval,
             )
 
-        data = self._load_dataset(symbol, use_cache=use_cache)
-
-        bars = []
-        for item in data:
-            date_str = item.get("d")
-            if not date_str:
-                continue
-            try:
-                ts = _date_to_millis(date_str)
-                bar = {
-                    "time": ts,
-                    "open": float(item["o"]),
-                    "high": float(item["h"]),
-                    "low": float(item["l"]),
-                    "close": float(item["c"]),
-                    "volume": float(item["v"]),
-                }
-            except (ValueError, TypeError, KeyError):
-                continue
-            bars.append(bar)
-
-        bars.sort(key=lambda bar: bar["time"])
-
-        start_ms = _to_millis(start_time)
-        end_ms = _to_millis(end_time)
-        if start_ms is not None:
-            bars = [bar for bar in bars if bar["time"] >= start_ms]
-        if end_ms is not None:
-            bars = [bar for bar in bars if bar["time"] <= end_ms]
-
         try:
             limit = int(limit) if limit is not None else None
         except (TypeError, ValueError):
             limit = None
+
+        start_ms = _to_millis(start_time)
+        end_ms = _to_millis(end_time)
+        if not use_cache or start_ms is None:
+            return self._dataset(symbol, use_cache=use_cache).slice(start_ms, end_ms, limit)
+
+        last_ms = end_ms if end_ms is not None else int(time.time() * 1000)
+        bars = self.segment_cache.get_range(
+            _resolve_symbol(symbol),
+            "1d",
+            DAY_MS,
+            start_ms,
+            last_ms,
+            lambda first_ms, run_end_ms: self._dataset(symbol).slice(first_ms, run_end_ms),
+        )
         if limit and limit > 0 and len(bars) > limit:
             bars = bars[-limit:]
-
         return bars
 
     def get_latest_price(self, symbol=None, use_cache=True):
-        bars = self.get_klines(symbol, interval="1d", limit=1, use_cache=use_cache)
-        if not bars:
+        latest = self._dataset(symbol, use_cache=use_cache).latest()
+        if latest is None:
             raise SinaGoldAPIError("No gold price data available from Sina Finance")
-        return bars[-1]["close"]
+        return latest["close"]
+
+
+def _parse_bars(data):
+    bars = []
+    for item in data:
+        date_str = item.get("d")
+        if not date_str:
+            continue
+        try:
+            bars.append({
+                "time": _date_to_millis(date_str),
+                "open": float(item["o"]),
+                "high": float(item["h"]),
+                "low": float(item["l"]),
+                "close": float(item["c"]),
+                "volume": float(item["v"]),
+            })
+        except (ValueError, TypeError, KeyError):
+            continue
+    return bars
@@ -417,6 +417,29 @@ class MarketDataCache(db.Model):
     cached_at = db.Column(db.DateTime(timezone=True), nullable=False, default=now_utc, server_default=db.func.now())
 
 
+class TradingCalendarDay(db.Model):
+    __tablename__ = 'trading_calendar_days'
+
+    market = db.Column(db.String(20), primary_key=True)
+    trade_date = db.Column(db.Date, primary_key=True)
+    source = db.Column(db.String(20), nullable=False)
+    cached_at = db.Column(db.DateTime(timezone=True), nullable=False, default=now_utc, server_default=db.func.now())
+
+
+class MarketDataCoverage(db.Model):
+    __tablename__ = 'market_data_coverage'
+    __table_args__ = (
+        db.Index('ix_market_data_coverage_symbol_source_start', 'symbol', 'source', 'start_date'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    symbol = db.Column(db.String(20), nullable=False)
+    source = db.Column(db.String(20), nullable=False)
+    start_date = db.Column(db.Date, nullable=False)
+    end_date = db.Column(db.Date, nullable=False)
+    fetched_at = db.Column(db.DateTime(timezone=True), nullable=False, default=now_utc, server_default=db.func.now())
+
+
 class DataSourceHealthStatus(db.Model):
     __tablename__ = 'data_source_health_status'
 
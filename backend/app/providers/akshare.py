@@ -102,6 +102,14 @@ class AkShareClient:
             raise AkShareAPIError("akshare is not installed") from exc
         return self._sdk
 
+    def fetch_trade_days(self):
+        """Exchange trading days from Sina's calendar (1990 through the end of this year)."""
+        sdk = self._load_sdk()
+        frame = sdk.tool_trade_date_hist_sina()
+        if frame is None or frame.empty:
+            return []
+        return sorted(_coerce_date(value) for value in frame["trade_date"])
+
     def fetch_stock_history(self, symbol, start_date, end_date, period="daily", adjust="qfq"):
         sdk = self._load_sdk()
         normalized_symbol = _normalize_symbol(symbol)
@@ -1,10 +1,15 @@
 import importlib
 import os
+import threading
 import time
 from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from datetime import date, datetime
 
 
+_PRICE_FIELDS = ["open", "high", "low", "close", "volume"]
+MAX_SECURITIES_PER_REQUEST = 100
+
+
 class JoinQuantAPIError(RuntimeError):
     pass
 
@@ -25,6 +30,98 @@ def _coerce_date(value):
     raise TypeError(f"Unsupported date type: {type(value)}")
 
 
+def _rows_from_frame(symbol, frame, trade_dates):
+    columns = [frame[name].to_numpy(dtype="float64").tolist() for name in _PRICE_FIELDS]
+    return [
+        {
+            "symbol": symbol,
+            "trade_date": _coerce_date(trade_date),
+            "open": open_,
+            "high": high,
+            "low": low,
+            "close": close,
+            "volume": int(volume),
+            "source": "joinquant",
+        }
+        for trade_date, open_, high, low, close, volume in zip(trade_dates, *columns)
+    ]
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    """Process-wide pool for SDK calls, so a request doesn't pay for spawning a thread."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=max(int(os.getenv("JQDATA_MAX_WORKERS", "4")), 1),
+                    thread_name_prefix="jqdata",
+                )
+    return _executor
+
+
+def _retire_executor(executor):
+    """Stop feeding a pool that has a hung call; the next request gets a fresh one.
+
+    The stuck thread cannot be interrupted, so it is left to finish on its own. Work still queued
+    behind it is cancelled and retried by its caller on the new pool.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+class JoinQuantQuota:
+    """Remaining JQData rows for the account, shared by every client in the process.
+
+    ``get_query_count`` is asked at most once per ``refresh_seconds``; in between, each fetch
+    subtracts the rows it returned, so an exhausted quota is reported without another round-trip.
+    """
+
+    def __init__(self, refresh_seconds=300, clock=time.monotonic):
+        self.refresh_seconds = refresh_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.total = None
+        self.spare = None
+        self._checked_at = None
+
+    def is_stale(self):
+        with self._lock:
+            return self._checked_at is None or self._clock() - self._checked_at >= self.refresh_seconds
+
+    def update(self, payload):
+        if not isinstance(payload, dict):
+            return
+        with self._lock:
+            self.total = payload.get("total")
+            self.spare = payload.get("spare")
+            self._checked_at = self._clock()
+
+    def consume(self, rows):
+        with self._lock:
+            if self.spare is not None:
+                self.spare = max(self.spare - int(rows), 0)
+
+    def ensure_available(self):
+        with self._lock:
+            if self.spare is not None and self.spare <= 0:
+                raise JoinQuantAPIError("JQData query quota exhausted")
+
+    def snapshot(self):
+        with self._lock:
+            return {"total": self.total, "spare": self.spare}
+
+
+quota = JoinQuantQuota()
+
+
 class JoinQuantClient:
     def __init__(
         self,
@@ -33,6 +130,7 @@ class JoinQuantClient:
         timeout=None,
         max_retries=None,
         sdk=None,
+        quota_counter=None,
     ):
         self.username = username or os.getenv("JQDATA_USERNAME")
         self.password = password or os.getenv("JQDATA_PASSWORD")
@@ -40,6 +138,7 @@ class JoinQuantClient:
         self.max_retries = int(max_retries or os.getenv("JQDATA_MAX_RETRIES", "2"))
         self._sdk = sdk
         self._authenticated = False
+        self.quota = quota_counter or quota
 
     def _load_sdk(self):
         if self._sdk is not None:
@@ -67,15 +166,14 @@ class JoinQuantClient:
         return sdk
 
     def _run_with_timeout(self, func, timeout_seconds):
-        executor = ThreadPoolExecutor(max_workers=1)
+        executor = _get_executor()
         future = executor.submit(func)
         try:
             return future.result(timeout=timeout_seconds)
         except FutureTimeoutError as exc:
             future.cancel()
+            _retire_executor(executor)
             raise JoinQuantAPIError(f"JoinQuant request timed out after {timeout_seconds:.2f} seconds") from exc
-        finally:
-            executor.shutdown(wait=False, cancel_futures=True)
 
     def _execute(self, func):
         deadline = time.monotonic() + self.timeout
@@ -96,39 +194,66 @@ class JoinQuantClient:
             raise JoinQuantAPIError(f"JoinQuant request timed out after {self.timeout} seconds")
         raise JoinQuantAPIError(f"JoinQuant request failed: {last_error}") from last_error
 
-    def fetch_daily_data(self, symbol, start_date, end_date):
+    def fetch_trade_days(self):
+        """Every exchange trading day JoinQuant knows about (2005 through the end of this year)."""
         sdk = self._ensure_authenticated()
-        start_date = _coerce_date(start_date)
-        end_date = _coerce_date(end_date)
+        payload = self._execute(sdk.get_all_trade_days)
+        if payload is None:
+            return []
+        return sorted(_coerce_date(item) for item in payload)
+
+    def _check_quota(self, sdk):
+        if self.quota.is_stale() and hasattr(sdk, "get_query_count"):
+            try:
+                self.quota.update(self._execute(sdk.get_query_count))
+            except JoinQuantAPIError:
+                pass
+        self.quota.ensure_available()
 
+    def _get_price(self, sdk, securities, start_date, end_date, **kwargs):
         def _request():
             return sdk.get_price(
-                symbol,
+                securities,
                 start_date=start_date.isoformat(),
                 end_date=end_date.isoformat(),
                 frequency="daily",
-                fields=["open", "high", "low", "close", "volume"],
+                fields=list(_PRICE_FIELDS),
                 skip_paused=True,
                 fq="pre",
+                **kwargs,
             )
 
+        self._check_quota(sdk)
         payload = self._execute(_request)
-        if payload is None or not hasattr(payload, "iterrows"):
+        if payload is None or not hasattr(payload, "columns"):
+            return None
+        self.quota.consume(len(payload))
+        return payload
+
+    def fetch_daily_data(self, symbol, start_date, end_date):
+        sdk = self._ensure_authenticated()
+        payload = self._get_price(sdk, symbol, _coerce_date(start_date), _coerce_date(end_date))
+        if payload is None:
             return []
+        return _rows_from_frame(symbol, payload, payload.index)
 
-        rows = []
-        for index, item in payload.iterrows():
-            trade_date = _coerce_date(index)
-            rows.append(
-                {
-                    "symbol": symbol,
-                    "trade_date": trade_date,
-                    "open": float(item["open"]),
-                    "high": float(item["high"]),
-                    "low": float(item["low"]),
-                    "close": float(item["close"]),
-                    "volume": int(item["volume"]),
-                    "source": "joinquant",
-                }
-            )
+    def fetch_daily_data_many(self, symbols, start_date, end_date):
+        """Daily rows for several securities, ``MAX_SECURITIES_PER_REQUEST`` per ``get_price`` call.
+
+        Returns ``{symbol: rows}`` with an entry (possibly empty) for every requested symbol.
+        """
+        sdk = self._ensure_authenticated()
+        start_date = _coerce_date(start_date)
+        end_date = _coerce_date(end_date)
+        symbols = list(dict.fromkeys(symbols))
+        rows = {symbol: [] for symbol in symbols}
+        for offset in range(0, len(symbols), MAX_SECURITIES_PER_REQUEST):
+            batch = symbols[offset:offset + MAX_SECURITIES_PER_REQUEST]
+            # panel=False returns one long frame with ``time`` and ``code`` columns.
+            payload = self._get_price(sdk, batch, start_date, end_date, panel=False)
+            if payload is None or payload.empty:
+                continue
+            for code, group in payload.groupby("code", sort=False):
+                if code in rows:
+                    rows[code] = _rows_from_frame(code, group, group["time"])
         return rows
@@ -30,6 +30,14 @@ BOT_SLOT_LIMITS = {
     "ultra": 10,
 }
 
+OPTIMIZER_CONCURRENCY_LIMITS = {
+    "free": 2,
+    "go": 4,
+    "plus": 8,
+    "pro": 16,
+    "ultra": 16,
+}
+
 
 def normalize_plan_level(plan_level):
     return PLAN_LEVEL_ALIASES.get(plan_level or "free", plan_level or "free")
@@ -45,6 +53,11 @@ def get_bot_slot_limit(plan_level):
     return BOT_SLOT_LIMITS.get(normalized_plan_level, BOT_SLOT_LIMITS["free"])
 
 
+def get_optimizer_concurrency_limit(plan_level):
+    normalized_plan_level = normalize_plan_level(plan_level)
+    return OPTIMIZER_CONCURRENCY_LIMITS.get(normalized_plan_level, OPTIMIZER_CONCURRENCY_LIMITS["free"])
+
+
 def serialize_plan_limit(plan_level):
     limit = get_plan_limit(plan_level)
     if math.isinf(limit):
@@ -1,5 +1,8 @@
 import math
-from datetime import datetime, timezone
+
+import numpy as np
+
+from ..backtest.frame import BarFrame
 
 
 INITIAL_CAPITAL = 100_000.0
@@ -11,12 +14,13 @@ MAX_EXPONENT = 700
 def compute_all_metrics(bars, trades, initial_capital=INITIAL_CAPITAL):
     normalized_bars = normalize_bars(bars)
     normalized_trades = normalize_trades(trades)
-    equity_curve = build_equity_curve(normalized_bars, normalized_trades, initial_capital)
+    series = build_equity_series(normalized_bars, normalized_trades, initial_capital)
+    equity_curve = equity_curve_points(series)
     return {
-        "metrics": build_summary_metrics(equity_curve, normalized_trades),
+        "metrics": summary_metrics_from_series(series, normalized_trades),
         "equity_curve": equity_curve,
         "drawdown_series": build_drawdown_series(equity_curve),
-        "monthly_returns": build_monthly_returns(equity_curve),
+        "monthly_returns": monthly_returns_from_series(series["timestamp"], series["equity"]),
         "trade_details": normalized_trades,
     }
 
@@ -47,19 +51,7 @@ def build_legacy_backtest_report(bars, trades, initial_capital=INITIAL_CAPITAL):
 
 
 def normalize_bars(bars):
-    normalized = []
-    for bar in bars or []:
-        normalized.append(
-            {
-                "time": int(bar.get("time")),
-                "open": float(bar.get("open", 0.0)),
-                "high": float(bar.get("high", 0.0)),
-                "low": float(bar.get("low", 0.0)),
-                "close": float(bar.get("close", 0.0)),
-                "volume": float(bar.get("volume", 0.0)),
-            }
-        )
-    return sorted(normalized, key=lambda item: item["time"])
+    return BarFrame.coerce(bars).sorted()
 
 
 def normalize_trades(trades):
@@ -86,44 +78,77 @@ def normalize_trades(trades):
     return normalized
 
 
-def build_equity_curve(bars, trades, initial_capital):
-    if not bars:
-        return []
+def build_equity_series(bars, trades, initial_capital):
+    bars = BarFrame.coerce(bars)
+    times = bars.time
+    closes = bars.close
+    size = len(bars)
+
+    trade_times = np.fromiter((trade["timestamp"] for trade in trades), dtype=np.int64, count=len(trades))
+    prices = np.fromiter((trade["price"] for trade in trades), dtype=np.float64, count=len(trades))
+    quantities = np.fromiter((trade["quantity"] for trade in trades), dtype=np.float64, count=len(trades))
+    is_buy = np.fromiter((trade["side"] == "buy" for trade in trades), dtype=bool, count=len(trades))
+
+    # Trades are applied on the first bar whose time is at or after the trade timestamp;
+    # the running totals are sequential cumsums so they match a per-trade loop exactly.
+    notionals = prices * quantities
+    cash_steps = np.concatenate(([float(initial_capital)], np.where(is_buy, -notionals, notionals)))
+    position_steps = np.concatenate(([0.0], np.where(is_buy, quantities, -quantities)))
+    trade_bars = np.searchsorted(times, trade_times, side="left")
+    applied = np.searchsorted(trade_bars, np.arange(size), side="right")
+    cash = np.cumsum(cash_steps)[applied]
+    position = np.cumsum(position_steps)[applied]
+
+    benchmark_base = (closes[0] if size else 0.0) or 1.0
+    equity = np.round(cash + position * closes, 4)
+    benchmark = np.round(float(initial_capital) * (closes / benchmark_base), 4)
+    return {
+        "timestamp": times,
+        "equity": equity,
+        "benchmark_equity": benchmark,
+        "drawdown": drawdown_percent(equity),
+    }
 
-    cash = float(initial_capital)
-    position = 0.0
-    benchmark_base = bars[0]["close"] or 1.0
-    trade_index = 0
-    equity_curve = []
-
-    for bar in bars:
-        while trade_index < len(trades) and trades[trade_index]["timestamp"] <= bar["time"]:
-            trade = trades[trade_index]
-            notional = trade["price"] * trade["quantity"]
-            if trade["side"] == "buy":
-                cash -= notional
-                position += trade["quantity"]
-            else:
-                cash += notional
-                position -= trade["quantity"]
-            trade_index += 1
-
-        benchmark_equity = float(initial_capital) * (bar["close"] / benchmark_base if benchmark_base else 1.0)
-        equity = cash + position * bar["close"]
-        equity_curve.append(
-            {
-                "timestamp": bar["time"],
-                "equity": round(equity, 4),
-                "benchmark_equity": round(benchmark_equity, 4),
-            }
+
+def drawdown_percent(equities):
+    equities = np.asarray(equities, dtype=np.float64)
+    if not equities.size:
+        return equities
+    peaks = np.maximum.accumulate(equities)
+    ratios = np.divide(equities, peaks, out=np.ones_like(equities), where=peaks > 0)
+    return np.round((ratios - 1.0) * 100.0, 4)
+
+
+def equity_curve_points(series):
+    return [
+        {
+            "timestamp": timestamp,
+            "equity": equity,
+            "benchmark_equity": benchmark_equity,
+            "drawdown": drawdown,
+        }
+        for timestamp, equity, benchmark_equity, drawdown in zip(
+            series["timestamp"].tolist(),
+            series["equity"].tolist(),
+            series["benchmark_equity"].tolist(),
+            series["drawdown"].tolist(),
         )
+    ]
+
 
-    peak = equity_curve[0]["equity"]
-    for point in equity_curve:
-        peak = max(peak, point["equity"])
-        drawdown = (point["equity"] / peak - 1.0) * 100.0 if peak > 0 else 0.0
-        point["drawdown"] = round(drawdown, 4)
-    return equity_curve
+def _series_from_curve(equity_curve):
+    return {
+        "timestamp": np.fromiter((point["timestamp"] for point in equity_curve), dtype=np.int64, count=len(equity_curve)),
+        "equity": np.fromiter((point["equity"] for point in equity_curve), dtype=np.float64, count=len(equity_curve)),
+        "benchmark_equity": np.fromiter(
+            (point["benchmark_equity"] for point in equity_curve), dtype=np.float64, count=len(equity_curve)
+        ),
+        "drawdown": np.fromiter((point["drawdown"] for point in equity_curve), dtype=np.float64, count=len(equity_curve)),
+    }
+
+
+def build_equity_curve(bars, trades, initial_capital):
+    return equity_curve_points(build_equity_series(bars, trades, initial_capital))
 
 
 def build_drawdown_series(equity_curve):
@@ -139,53 +164,61 @@ def build_drawdown_series(equity_curve):
 def build_monthly_returns(equity_curve):
     if not equity_curve:
         return []
+    series = _series_from_curve(equity_curve)
+    return monthly_returns_from_series(series["timestamp"], series["equity"])
 
-    buckets = {}
-    for point in equity_curve:
-        dt = datetime.fromtimestamp(point["timestamp"] / 1000.0, tz=timezone.utc)
-        month_key = dt.strftime("%Y-%m")
-        bucket = buckets.setdefault(
-            month_key,
-            {
-                "start_equity": point["equity"],
-                "end_equity": point["equity"],
-            },
-        )
-        bucket["end_equity"] = point["equity"]
 
-    monthly_returns = []
-    for month_key in sorted(buckets.keys()):
-        start_equity = buckets[month_key]["start_equity"] or 1.0
-        end_equity = buckets[month_key]["end_equity"]
-        monthly_returns.append(
-            {
-                "month": month_key,
-                "return": round((end_equity / start_equity - 1.0) * 100.0 if start_equity else 0.0, 4),
-            }
-        )
-    return monthly_returns
+def monthly_returns_from_series(timestamps, equities):
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    equities = np.asarray(equities, dtype=np.float64)
+    if not timestamps.size:
+        return []
+
+    months = timestamps.astype("datetime64[ms]").astype("datetime64[M]").astype(np.int64)
+    month_keys, first_index = np.unique(months, return_index=True)
+    _, last_from_end = np.unique(months[::-1], return_index=True)
+    last_index = months.size - 1 - last_from_end
+
+    start_equities = equities[first_index]
+    start_equities = np.where(start_equities != 0, start_equities, 1.0)
+    returns = np.round((equities[last_index] / start_equities - 1.0) * 100.0, 4)
+
+    return [
+        {
+            "month": f"{1970 + month // 12:04d}-{month % 12 + 1:02d}",
+            "return": value,
+        }
+        for month, value in zip(month_keys.tolist(), returns.tolist())
+    ]
 
 
 def build_summary_metrics(equity_curve, trades):
     if len(equity_curve) < 2:
         return empty_summary()
+    return summary_metrics_from_series(_series_from_curve(equity_curve), trades)
+
+
+def summary_metrics_from_series(series, trades):
+    timestamps = series["timestamp"]
+    equities = series["equity"]
+    benchmarks = series["benchmark_equity"]
+    if equities.size < 2:
+        return empty_summary()
 
-    equities = [point["equity"] for point in equity_curve]
-    benchmarks = [point["benchmark_equity"] for point in equity_curve]
-    initial_equity = equities[0] or 1.0
-    final_equity = equities[-1]
+    initial_equity = float(equities[0]) or 1.0
+    final_equity = float(equities[-1])
     total_return_ratio = final_equity / initial_equity if initial_equity else 1.0
     total_return = (total_return_ratio - 1.0) * 100.0
-    duration_days = max((equity_curve[-1]["timestamp"] - equity_curve[0]["timestamp"]) / MS_PER_DAY, 1 / 365)
+    duration_days = max((int(timestamps[-1]) - int(timestamps[0])) / MS_PER_DAY, 1 / 365)
     annualized_return = annualize_ratio(total_return_ratio, duration_days)
 
     strategy_returns = series_returns(equities)
     benchmark_returns = series_returns(benchmarks)
-    periods_per_year = periods_per_year_from_curve(equity_curve)
+    periods_per_year = periods_per_year_from_timestamps(timestamps)
     avg_return = average(strategy_returns)
     std_dev = stddev(strategy_returns)
-    downside_std = stddev([item for item in strategy_returns if item < 0.0])
-    max_drawdown = min(point["drawdown"] for point in equity_curve)
+    downside_std = stddev(strategy_returns[strategy_returns < 0.0])
+    max_drawdown = float(np.min(series["drawdown"]))
     volatility = std_dev * math.sqrt(periods_per_year) * 100.0 if std_dev > 0 else 0.0
     sharpe_ratio = avg_return / std_dev * math.sqrt(periods_per_year) if std_dev > 0 else 0.0
     sortino_ratio = avg_return / downside_std * math.sqrt(periods_per_year) if downside_std > 0 else 0.0
@@ -202,7 +235,7 @@ def build_summary_metrics(equity_curve, trades):
     avg_holding_days = average([trade["holding_days"] for trade in closed_trades])
     beta = beta_value(strategy_returns, benchmark_returns)
     benchmark_average = average(benchmark_returns)
-    alpha = (avg_return - beta * benchmark_average) * periods_per_year * 100.0 if strategy_returns else 0.0
+    alpha = (avg_return - beta * benchmark_average) * periods_per_year * 100.0 if strategy_returns.size else 0.0
 
     return {
         "totalReturn": round(total_return, 4),
@@ -249,33 +282,39 @@ def annualize_ratio(total_return_ratio, duration_days):
 
 
 def series_returns(values):
-    returns = []
-    for index in range(1, len(values)):
-        previous = values[index - 1]
-        current = values[index]
-        returns.append(current / previous - 1.0 if previous else 0.0)
-    return returns
+    values = np.asarray(values, dtype=np.float64)
+    if values.size < 2:
+        return np.zeros(0)
+    previous = values[:-1]
+    current = values[1:]
+    returns = np.zeros(previous.size)
+    np.divide(current, previous, out=returns, where=previous != 0)
+    return np.where(previous != 0, returns - 1.0, 0.0)
+
+
+def periods_per_year_from_timestamps(timestamps):
+    if len(timestamps) < 2:
+        return 365.0
+    delta_ms = max(int(timestamps[1]) - int(timestamps[0]), 1)
+    return max(SECONDS_PER_YEAR / max(delta_ms / 1000.0, 1.0), 1.0)
 
 
 def periods_per_year_from_curve(equity_curve):
-    if len(equity_curve) < 2:
-        return 365.0
-    delta_ms = max(equity_curve[1]["timestamp"] - equity_curve[0]["timestamp"], 1)
-    return max(SECONDS_PER_YEAR / max(delta_ms / 1000.0, 1.0), 1.0)
+    return periods_per_year_from_timestamps([point["timestamp"] for point in equity_curve[:2]])
 
 
 def average(values):
-    if not values:
+    values = np.asarray(values, dtype=np.float64)
+    if not values.size:
         return 0.0
-    return sum(values) / len(values)
+    return float(np.mean(values))
 
 
 def stddev(values):
-    if not values:
+    values = np.asarray(values, dtype=np.float64)
+    if not values.size:
         return 0.0
-    mean = average(values)
-    variance = sum((value - mean) ** 2 for value in values) / len(values)
-    return math.sqrt(variance)
+    return float(np.std(values))
 
 
 def match_closed_trades(trades):
@@ -326,18 +365,16 @@ def max_consecutive_losses_count(closed_trades):
 
 
 def beta_value(strategy_returns, benchmark_returns):
-    paired = list(zip(strategy_returns, benchmark_returns))
-    if len(paired) < 2:
+    strategy_values = np.asarray(strategy_returns, dtype=np.float64)
+    benchmark_values = np.asarray(benchmark_returns, dtype=np.float64)
+    size = min(strategy_values.size, benchmark_values.size)
+    if size < 2:
         return 0.0
-    strategy_values = [pair[0] for pair in paired]
-    benchmark_values = [pair[1] for pair in paired]
-    strategy_mean = average(strategy_values)
-    benchmark_mean = average(benchmark_values)
-    variance = sum((value - benchmark_mean) ** 2 for value in benchmark_values) / len(benchmark_values)
+    strategy_values = strategy_values[:size]
+    benchmark_values = benchmark_values[:size]
+    benchmark_deviation = benchmark_values - np.mean(benchmark_values)
+    variance = float(np.mean(benchmark_deviation * benchmark_deviation))
     if variance == 0:
         return 0.0
-    covariance = sum(
-        (strategy_value - strategy_mean) * (benchmark_value - benchmark_mean)
-        for strategy_value, benchmark_value in paired
-    ) / len(paired)
+    covariance = float(np.mean((strategy_values - np.mean(strategy_values)) * benchmark_deviation))
     return covariance / variance
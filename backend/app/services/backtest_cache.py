@@ -0,0 +1,122 @@
+"""Content-addressed cache of completed backtest results.
+
+A backtest is a pure function of the strategy package, its parameters and the bars it runs on, so
+the key hashes exactly those: the package's code hash and version, the parameters merged with the
+manifest defaults as the run will see them, the market (data source, symbol, interval) and a
+fingerprint of the bar columns. An entry points at the stored artifacts of the job that produced
+it; a hit copies them under the new job's storage key.
+Entries expire after ``BACKTEST_RESULT_CACHE_TTL_SECONDS``, and one whose artifacts have since been
+deleted counts as a miss.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+
+from ..backtest.frame import BAR_FIELDS, BarFrame
+from ..strategy_runtime import StrategyRuntimeError
+from ..strategy_runtime.loader import describe_strategy_package, load_strategy_package
+from ..strategy_runtime.params import validate_and_merge_params
+from ..utils.cache import cache_get_json, cache_set_json
+from ..utils.storage import read_json, write_json
+
+
+RESULT_CACHE_PREFIX = "backtest:result:v1:"
+RESULT_ARTIFACTS = ("equity_curve", "trades", "kline")
+DEFAULT_RESULT_CACHE_TTL_SECONDS = 86400
+
+
+def result_cache_enabled(params=None) -> bool:
+    """Caching is on unless disabled globally or bypassed by the job (``bypass_cache``)."""
+    if (params or {}).get("bypass_cache"):
+        return False
+    flag = os.getenv("BACKTEST_RESULT_CACHE_ENABLED", "true").strip().lower()
+    return flag not in ("0", "false", "no", "off")
+
+
+def result_cache_ttl() -> int:
+    try:
+        return int(os.getenv("BACKTEST_RESULT_CACHE_TTL_SECONDS", DEFAULT_RESULT_CACHE_TTL_SECONDS))
+    except (TypeError, ValueError):
+        return DEFAULT_RESULT_CACHE_TTL_SECONDS
+
+
+def fingerprint_bars(bars) -> str:
+    frame = BarFrame.coerce(bars)
+    digest = hashlib.sha256(str(len(frame)).encode("ascii"))
+    for name in BAR_FIELDS:
+        digest.update(getattr(frame, name).tobytes())
+    return digest.hexdigest()
+
+
+def resolve_strategy_identity(params: dict, user_id=None) -> dict | None:
+    """Code identity of the package the job would run, or None when the job can't be cached."""
+    strategy_id = params.get("strategy_id")
+    if not strategy_id:
+        return None
+    try:
+        package = describe_strategy_package(strategy_id, params.get("strategy_version"), user_id=user_id)
+        # Served from the package cache; the run that follows a miss loads the same entry.
+        manifest = load_strategy_package(strategy_id, params.get("strategy_version"), user_id=user_id)["manifest"]
+    except StrategyRuntimeError:
+        return None
+    return {
+        "code_hash": package["code_hash"],
+        "version_id": package["version_id"],
+        "file_id": package["file_id"],
+        "parameters": (manifest or {}).get("parameters"),
+    }
+
+
+def build_result_cache_key(identity: dict, params: dict, bars) -> str:
+    """Key for a run; raises StrategyRuntimeError for parameters the run itself would reject."""
+    identity = dict(identity)
+    strategy_params = validate_and_merge_params(identity.pop("parameters", None), params.get("strategy_params"))
+    material = {
+        **identity,
+        "strategy_params": strategy_params,
+        "data_source": params.get("data_source"),
+        "symbol": params.get("symbol"),
+        "interval": params.get("interval"),
+        "bars": fingerprint_bars(bars),
+    }
+    encoded = json.dumps(material, sort_keys=True, separators=(",", ":"), default=str)
+    return RESULT_CACHE_PREFIX + hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def store_cached_result(cache_key: str, storage_key: str, result: dict, report: dict) -> None:
+    entry = {
+        "storage_key": storage_key,
+        "result_summary": report.get("result_summary") or {},
+        "dataSource": result.get("dataSource"),
+        "data_range_notice": result.get("data_range_notice"),
+    }
+    cache_set_json(cache_key, entry, ttl=result_cache_ttl())
+
+
+def restore_cached_result(cache_key: str, storage_key: str) -> dict | None:
+    """Copy a cached run's artifacts under ``storage_key``; return the rebuilt result or None on a miss."""
+    entry = cache_get_json(cache_key)
+    if not isinstance(entry, dict) or not entry.get("storage_key"):
+        return None
+    try:
+        artifacts = {name: read_json(f"{entry['storage_key']}/{name}.json") for name in RESULT_ARTIFACTS}
+    except (OSError, ValueError):
+        return None
+    if entry["storage_key"] != storage_key:
+        for name, payload in artifacts.items():
+            write_json(f"{storage_key}/{name}.json", payload)
+
+    result = {
+        "kline": artifacts["kline"],
+        "trades": artifacts["trades"],
+        "summary": entry.get("result_summary") or {},
+        "equity_curve": artifacts["equity_curve"],
+        "dataSource": entry.get("dataSource"),
+        "cached": True,
+    }
+    if entry.get("data_range_notice"):
+        result["data_range_notice"] = entry["data_range_notice"]
+    return result
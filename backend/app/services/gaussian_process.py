@@ -0,0 +1,122 @@
+"""NumPy Gaussian-process surrogate and expected-improvement acquisition for the optimizer.
+
+Inputs are expected to be scaled to the unit hypercube; targets are standardized internally.
+"""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+
+LENGTH_SCALES = (0.05, 0.1, 0.2, 0.35, 0.5, 0.8)
+DEFAULT_NOISE = 1e-6
+
+
+def rbf_kernel(a: np.ndarray, b: np.ndarray, length_scale: float) -> np.ndarray:
+    sq_dist = np.sum(a * a, axis=1)[:, None] + np.sum(b * b, axis=1)[None, :] - 2.0 * (a @ b.T)
+    return np.exp(-0.5 * np.maximum(sq_dist, 0.0) / (length_scale * length_scale))
+
+
+def _normal_cdf(z: np.ndarray) -> np.ndarray:
+    # Abramowitz & Stegun 7.1.26 erf approximation (|error| < 1.5e-7); avoids a SciPy dependency.
+    x = np.abs(z) / math.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.3275911 * x)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    erf = 1.0 - poly * np.exp(-x * x)
+    return 0.5 * (1.0 + np.sign(z) * erf)
+
+
+def _normal_pdf(z: np.ndarray) -> np.ndarray:
+    return np.exp(-0.5 * z * z) / math.sqrt(2.0 * math.pi)
+
+
+def expected_improvement(mean: np.ndarray, std: np.ndarray, best: float, xi: float = 0.01) -> np.ndarray:
+    """EI for maximization, vectorized over candidates."""
+    std = np.maximum(std, 1e-12)
+    improvement = mean - best - xi
+    z = improvement / std
+    return np.maximum(improvement * _normal_cdf(z) + std * _normal_pdf(z), 0.0)
+
+
+class GaussianProcess:
+    """Zero-mean GP with an RBF kernel over standardized targets.
+
+    ``fit`` factorizes the kernel matrix once; ``add_observation`` extends the Cholesky factor
+    by one row in O(n^2) so batch proposals can condition on pending points cheaply.
+    """
+
+    def __init__(self, length_scale: float | None = None, noise: float = DEFAULT_NOISE):
+        self.length_scale = length_scale
+        self.noise = noise
+        self._x = None
+        self._y = None
+        self._chol = None
+        self._alpha = None
+        self._jitter = noise
+        self._y_mean = 0.0
+        self._y_scale = 1.0
+
+    def fit(self, x, y) -> "GaussianProcess":
+        x = np.atleast_2d(np.asarray(x, dtype=np.float64))
+        y = np.asarray(y, dtype=np.float64).ravel()
+        self._y_mean = float(np.mean(y))
+        scale = float(np.std(y))
+        self._y_scale = scale if scale > 0 else 1.0
+        self._x = x
+        self._y = (y - self._y_mean) / self._y_scale
+
+        if self.length_scale is None:
+            self.length_scale = max(LENGTH_SCALES, key=self._log_marginal_likelihood)
+        self._chol, self._jitter = self._cholesky(rbf_kernel(x, x, self.length_scale))
+        self._update_alpha()
+        return self
+
+    def add_observation(self, x_new, y_new: float) -> None:
+        x_new = np.atleast_2d(np.asarray(x_new, dtype=np.float64))
+        k = rbf_kernel(self._x, x_new, self.length_scale)[:, 0]
+        row = np.linalg.solve(self._chol, k)
+        diagonal = math.sqrt(max(1.0 + self._jitter - float(row @ row), self._jitter))
+
+        size = self._chol.shape[0]
+        chol = np.zeros((size + 1, size + 1))
+        chol[:size, :size] = self._chol
+        chol[size, :size] = row
+        chol[size, size] = diagonal
+
+        self._chol = chol
+        self._x = np.vstack([self._x, x_new])
+        self._y = np.append(self._y, (float(y_new) - self._y_mean) / self._y_scale)
+        self._update_alpha()
+
+    def predict(self, x) -> tuple[np.ndarray, np.ndarray]:
+        x = np.atleast_2d(np.asarray(x, dtype=np.float64))
+        k = rbf_kernel(x, self._x, self.length_scale)
+        mean = k @ self._alpha
+        v = np.linalg.solve(self._chol, k.T)
+        variance = np.maximum(1.0 - np.sum(v * v, axis=0), 0.0)
+        return mean * self._y_scale + self._y_mean, np.sqrt(variance) * self._y_scale
+
+    def _cholesky(self, kernel: np.ndarray) -> tuple[np.ndarray, float]:
+        # Duplicate inputs make the kernel singular; grow the jitter until it factorizes.
+        jitter = max(self.noise, 1e-10)
+        identity = np.eye(kernel.shape[0])
+        while True:
+            try:
+                return np.linalg.cholesky(kernel + jitter * identity), jitter
+            except np.linalg.LinAlgError:
+                jitter *= 10.0
+                if jitter > 1.0:
+                    raise
+
+    def _update_alpha(self) -> None:
+        self._alpha = np.linalg.solve(self._chol.T, np.linalg.solve(self._chol, self._y))
+
+    def _log_marginal_likelihood(self, length_scale: float) -> float:
+        try:
+            chol, _ = self._cholesky(rbf_kernel(self._x, self._x, length_scale))
+        except np.linalg.LinAlgError:
+            return -math.inf
+        alpha = np.linalg.solve(chol.T, np.linalg.solve(chol, self._y))
+        return float(-0.5 * self._y @ alpha - np.sum(np.log(np.diag(chol))))
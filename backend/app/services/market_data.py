@@ -1,4 +1,5 @@
 import os
+import time
 from datetime import date, datetime, timedelta
 
 from sqlalchemy import select
@@ -6,8 +7,9 @@ from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from ..extensions import db
-from ..models import MarketDataCache
+from ..models import MarketDataCache, MarketDataCoverage, TradingCalendarDay
 from ..providers import AkShareClient, JoinQuantClient
+from ..utils.cache import cache_get_json, cache_set_json, single_flight
 
 _CANONICAL_MARKET_DATA_PROVIDERS = {"joinquant", "akshare"}
 _MARKET_DATA_PROVIDER_ALIASES = {
@@ -17,6 +19,12 @@ _MARKET_DATA_PROVIDER_ALIASES = {
     "akshare": "akshare",
     "ak": "akshare",
 }
+# Every supported provider serves A-shares, which trade on the shared SSE/SZSE calendar.
+_CALENDAR_MARKET = "CN"
+_CALENDAR_REFRESH_KEY = "market_data:calendar:refresh:{market}"
+_CALENDAR_REFRESH_TTL_SECONDS = 6 * 3600
+_INSERT_BATCH_SIZE = 500
+_FETCH_DONE_TTL_SECONDS = 60
 
 
 def _normalize_provider_name(value):
@@ -52,6 +60,9 @@ class _AkShareDailyDataClientAdapter:
             adjust="qfq",
         )
 
+    def fetch_trade_days(self):
+        return self.client.fetch_trade_days()
+
 
 def _build_market_data_client(provider_key):
     if provider_key == "akshare":
@@ -106,31 +117,105 @@ class MarketDataService:
             raise ValueError("end_date must be greater than or equal to start_date")
 
         cached_rows = self._query_cached(symbol, start_date, end_date)
-        missing_dates = self._compute_missing_weekdays(start_date, end_date, cached_rows)
+        missing_dates = self._compute_missing_dates(symbol, start_date, end_date, cached_rows)
         if not missing_dates:
             return {
                 "bars": [self._to_payload(row) for row in cached_rows],
                 "data_range_notice": None,
             }
 
-        try:
-            fetched_rows = self.client.fetch_daily_data(symbol, min(missing_dates), max(missing_dates))
-        except Exception:
+        # Workers missing the same dates share one provider call; the others wait for its rows.
+        flight_key = f"market_data:fetch:{self.provider_key}:{symbol}:{min(missing_dates)}:{max(missing_dates)}"
+        noticed_at = time.time()
+        fetched = single_flight(
+            flight_key,
+            lambda: self._fetch_missing(flight_key, symbol, start_date, end_date, missing_dates),
+            probe=lambda: True if (cache_get_json(f"{flight_key}:done") or 0) >= noticed_at else None,
+        )
+        if not fetched:
             return {
                 "bars": [self._to_payload(row) for row in cached_rows],
                 "data_range_notice": self._build_range_notice(cached_rows),
             }
 
-        if fetched_rows:
-            self._bulk_insert(fetched_rows)
-            self.session.commit()
-
         refreshed_rows = self._query_cached(symbol, start_date, end_date)
         return {
             "bars": [self._to_payload(row) for row in refreshed_rows],
             "data_range_notice": None,
         }
 
+    def get_market_data_many(self, symbols, start_date, end_date):
+        """``get_market_data`` for several symbols, filling every gap with one batched provider fetch.
+
+        Returns ``{symbol: {"bars": [...], "data_range_notice": ...}}`` in request order.
+        """
+        start_date = _coerce_date(start_date)
+        end_date = _coerce_date(end_date)
+        if end_date < start_date:
+            raise ValueError("end_date must be greater than or equal to start_date")
+        symbols = list(dict.fromkeys(symbols))
+        if not symbols:
+            return {}
+
+        cached = self._query_cached_many(symbols, start_date, end_date)
+        trading_days = self._trading_days(start_date, min(end_date, date.today()))
+        missing = {}
+        for symbol in symbols:
+            dates = self._compute_missing_dates(symbol, start_date, end_date, cached[symbol], trading_days)
+            if dates:
+                missing[symbol] = dates
+
+        failed = False
+        if missing:
+            fetch_start = min(dates[0] for dates in missing.values())
+            fetch_end = max(dates[-1] for dates in missing.values())
+            try:
+                fetched_rows = self._fetch_daily_many(list(missing), fetch_start, fetch_end)
+            except Exception:
+                failed = True
+            else:
+                if fetched_rows:
+                    self._bulk_insert(fetched_rows)
+                for symbol in missing:
+                    self._record_coverage(symbol, start_date, end_date)
+                self.session.commit()
+                cached = self._query_cached_many(symbols, start_date, end_date)
+
+        return {
+            symbol: {
+                "bars": [self._to_payload(row) for row in cached[symbol]],
+                "data_range_notice": (
+                    self._build_range_notice(cached[symbol]) if failed and symbol in missing else None
+                ),
+            }
+            for symbol in symbols
+        }
+
+    def _fetch_daily_many(self, symbols, start_date, end_date):
+        fetch_many = getattr(self.client, "fetch_daily_data_many", None)
+        if fetch_many is None:
+            return [
+                row for symbol in symbols for row in self.client.fetch_daily_data(symbol, start_date, end_date)
+            ]
+        return [row for rows in fetch_many(symbols, start_date, end_date).values() for row in rows]
+
+    def _fetch_missing(self, flight_key, symbol, start_date, end_date, missing_dates):
+        try:
+            fetched_rows = self.client.fetch_daily_data(symbol, min(missing_dates), max(missing_dates))
+        except Exception:
+            return False
+
+        if fetched_rows:
+            self._bulk_insert(fetched_rows)
+        # Everything in the window is now cached or known to have no bar (holiday, suspension), so
+        # record it even when the provider returned nothing.
+        self._record_coverage(symbol, start_date, end_date)
+        self.session.commit()
+        # Tells workers waiting on this fetch that its rows are committed; today's bar may still be
+        # missing, so they can't tell from the cache table alone.
+        cache_set_json(f"{flight_key}:done", time.time(), ttl=_FETCH_DONE_TTL_SECONDS)
+        return True
+
     def _query_cached(self, symbol, start_date, end_date):
         stmt = (
             select(MarketDataCache)
@@ -141,9 +226,122 @@ class MarketDataService:
         )
         return list(self.session.execute(stmt).scalars())
 
-    def _compute_missing_weekdays(self, start_date, end_date, cached_rows):
+    def _compute_missing_dates(self, symbol, start_date, end_date, cached_rows, trading_days=None):
+        """Trading days in the range with no cached bar that no earlier fetch has already covered."""
+        end_date = min(end_date, date.today())
+        if end_date < start_date:
+            return []
+        if trading_days is None:
+            trading_days = self._trading_days(start_date, end_date)
         cached_dates = {row.trade_date for row in cached_rows}
-        return [trade_date for trade_date in _weekday_dates(start_date, end_date) if trade_date not in cached_dates]
+        covered = self._query_coverage(symbol, start_date, end_date)
+        return [
+            trade_date
+            for trade_date in trading_days
+            if trade_date not in cached_dates
+            and not any(first <= trade_date <= last for first, last in covered)
+        ]
+
+    def _trading_days(self, start_date, end_date):
+        """Calendar trading days where the local calendar reaches, weekdays outside of it."""
+        bounds = self._calendar_bounds()
+        if bounds is None or bounds[1] < end_date:
+            self._refresh_calendar()
+            bounds = self._calendar_bounds()
+        if bounds is None:
+            return list(_weekday_dates(start_date, end_date))
+
+        first, last = bounds
+        days = []
+        if start_date < first:
+            days.extend(_weekday_dates(start_date, min(end_date, first - timedelta(days=1))))
+        if start_date <= last and end_date >= first:
+            stmt = (
+                select(TradingCalendarDay.trade_date)
+                .where(TradingCalendarDay.market == _CALENDAR_MARKET)
+                .where(TradingCalendarDay.trade_date >= max(start_date, first))
+                .where(TradingCalendarDay.trade_date <= min(end_date, last))
+                .order_by(TradingCalendarDay.trade_date.asc())
+            )
+            days.extend(self.session.execute(stmt).scalars())
+        if end_date > last:
+            days.extend(_weekday_dates(max(start_date, last + timedelta(days=1)), end_date))
+        return days
+
+    def _calendar_bounds(self):
+        stmt = select(
+            db.func.min(TradingCalendarDay.trade_date),
+            db.func.max(TradingCalendarDay.trade_date),
+        ).where(TradingCalendarDay.market == _CALENDAR_MARKET)
+        first, last = self.session.execute(stmt).one()
+        if first is None:
+            return None
+        return _coerce_date(first), _coerce_date(last)
+
+    def _refresh_calendar(self):
+        """Seed the local calendar from the provider, at most once per refresh window across workers."""
+        fetch_trade_days = getattr(self.client, "fetch_trade_days", None)
+        if fetch_trade_days is None:
+            return
+        refresh_key = _CALENDAR_REFRESH_KEY.format(market=_CALENDAR_MARKET)
+        if cache_get_json(refresh_key) is not None:
+            return
+        cache_set_json(refresh_key, self.provider_key, ttl=_CALENDAR_REFRESH_TTL_SECONDS)
+        try:
+            trade_days = fetch_trade_days()
+        except Exception:
+            return
+        if not trade_days:
+            return
+        payload = [
+            {"market": _CALENDAR_MARKET, "trade_date": _coerce_date(item), "source": self.provider_key}
+            for item in trade_days
+        ]
+        self._insert_ignore(TradingCalendarDay, payload, ["market", "trade_date"])
+        self.session.commit()
+
+    def _query_cached_many(self, symbols, start_date, end_date):
+        stmt = (
+            select(MarketDataCache)
+            .where(MarketDataCache.symbol.in_(symbols))
+            .where(MarketDataCache.trade_date >= start_date)
+            .where(MarketDataCache.trade_date <= end_date)
+            .order_by(MarketDataCache.symbol.asc(), MarketDataCache.trade_date.asc())
+        )
+        rows = {symbol: [] for symbol in symbols}
+        for row in self.session.execute(stmt).scalars():
+            rows[row.symbol].append(row)
+        return rows
+
+    def _query_coverage(self, symbol, start_date, end_date):
+        stmt = (
+            select(MarketDataCoverage.start_date, MarketDataCoverage.end_date)
+            .where(MarketDataCoverage.symbol == symbol)
+            .where(MarketDataCoverage.source == self.provider_key)
+            .where(MarketDataCoverage.start_date <= end_date)
+            .where(MarketDataCoverage.end_date >= start_date)
+        )
+        return [(row.start_date, row.end_date) for row in self.session.execute(stmt)]
+
+    def _record_coverage(self, symbol, start_date, end_date):
+        # Today's bar may not be published yet, so only closed days count as covered.
+        end_date = min(end_date, date.today() - timedelta(days=1))
+        if end_date < start_date:
+            return
+        stmt = (
+            select(MarketDataCoverage)
+            .where(MarketDataCoverage.symbol == symbol)
+            .where(MarketDataCoverage.source == self.provider_key)
+            .where(MarketDataCoverage.start_date <= end_date + timedelta(days=1))
+            .where(MarketDataCoverage.end_date >= start_date - timedelta(days=1))
+        )
+        for existing in self.session.execute(stmt).scalars():
+            start_date = min(start_date, existing.start_date)
+            end_date = max(end_date, existing.end_date)
+            self.session.delete(existing)
+        self.session.add(
+            MarketDataCoverage(symbol=symbol, source=self.provider_key, start_date=start_date, end_date=end_date)
+        )
 
     def _bulk_insert(self, rows):
         payload = [
@@ -159,24 +357,26 @@ class MarketDataService:
             }
             for item in rows
         ]
+        self._insert_ignore(MarketDataCache, payload, ["symbol", "trade_date"])
+
+    def _insert_ignore(self, model, payload, index_elements):
         if not payload:
             return
 
-        table = MarketDataCache.__table__
+        table = model.__table__
         dialect = self.session.get_bind().dialect.name
-        if dialect == "postgresql":
-            stmt = pg_insert(table).values(payload).on_conflict_do_nothing(index_elements=["symbol", "trade_date"])
-            self.session.execute(stmt)
-            return
-        if dialect == "sqlite":
-            stmt = sqlite_insert(table).values(payload).on_conflict_do_nothing(index_elements=["symbol", "trade_date"])
-            self.session.execute(stmt)
+        if dialect in ("postgresql", "sqlite"):
+            insert = pg_insert if dialect == "postgresql" else sqlite_insert
+            for offset in range(0, len(payload), _INSERT_BATCH_SIZE):
+                batch = payload[offset:offset + _INSERT_BATCH_SIZE]
+                stmt = insert(table).values(batch).on_conflict_do_nothing(index_elements=index_elements)
+                self.session.execute(stmt)
             return
 
         for item in payload:
-            exists = self.session.get(MarketDataCache, (item["symbol"], item["trade_date"]))
+            exists = self.session.get(model, tuple(item[name] for name in index_elements))
             if exists is None:
-                self.session.add(MarketDataCache(**item))
+                self.session.add(model(**item))
 
     def _build_range_notice(self, rows):
         if not rows:
@@ -3,10 +3,12 @@
 Pure algorithm, no LLM. Searches parameter space for better combinations
 using grid search and optional Bayesian optimization.
 
-Three levels:
+Four levels:
 - quick: single coarse grid (3 points per param), ~30s
 - standard: coarse + fine grid (5 points each), ~2min
 - deep: coarse + fine + Bayesian (50 iterations), ~10min
+- halving: dense grid (7 points per param) pruned by successive halving on
+  growing in-sample prefixes; optionally several Hyperband brackets
 """
 
 from __future__ import annotations
@@ -16,15 +18,29 @@ import math
 from dataclasses import dataclass
 from typing import Any
 
-from ..backtest.engine import run_backtest
+import numpy as np
+
+from ..backtest.engine import load_backtest_bars
+from ..backtest.frame import BarFrame
+from ..extensions import db
+from ..models import User
+from ..quota import get_optimizer_concurrency_limit
+from .gaussian_process import GaussianProcess, expected_improvement
+from .optimizer_evaluators import get_optimizer_evaluator
 
 
 _OPTIMIZE_LEVELS = {
     "quick": {"coarse_points": 3, "fine_points": 0, "bayesian_iter": 0, "concurrency": 4},
     "standard": {"coarse_points": 5, "fine_points": 5, "bayesian_iter": 0, "concurrency": 8},
     "deep": {"coarse_points": 5, "fine_points": 5, "bayesian_iter": 50, "concurrency": 16},
+    "halving": {
+        "coarse_points": 7, "fine_points": 0, "bayesian_iter": 0, "concurrency": 8,
+        "halving_eta": 3, "halving_min_bars": 50, "halving_brackets": 1,
+    },
 }
 
+_BAYESIAN_CANDIDATES = 2048
+
 _OBJECTIVE_WEIGHTS = {
     "conservative": {"return": 0.3, "drawdown": 0.5, "sharpe": 0.2},
     "balanced": {"return": 0.4, "drawdown": 0.3, "sharpe": 0.3},
@@ -32,12 +48,25 @@ _OBJECTIVE_WEIGHTS = {
 }
 
 
+@dataclass(frozen=True)
+class _SampleData:
+    """Bars loaded once per optimization and split in memory.
+
+    Without an explicit time range there is nothing to hold out: ``in_sample`` is every bar and
+    ``out_of_sample`` is None.
+    """
+    in_sample: BarFrame
+    out_of_sample: BarFrame | None
+
+
 @dataclass(frozen=True)
 class OptimizationResult:
     top_results: list[dict]
     overfitting_risk: str  # "low", "medium", "high"
     search_space_size: int
     evaluations: int
+    bar_evaluations: int = 0
+    bar_evaluations_saved: int = 0
 
 
 def optimize_parameters(
@@ -72,6 +101,7 @@ def optimize_parameters(
     """
     config = _OPTIMIZE_LEVELS.get(level, _OPTIMIZE_LEVELS["standard"])
     weights = _OBJECTIVE_WEIGHTS.get(risk_style, _OBJECTIVE_WEIGHTS["balanced"])
+    evaluator = get_optimizer_evaluator(_resolve_concurrency(config["concurrency"], user_id))
 
     searchable = _build_search_space(parameters)
     if not searchable:
@@ -82,11 +112,21 @@ def optimize_parameters(
 
     # Step 1: Coarse grid search on in-sample data
     coarse_grid = _generate_grid(searchable, config["coarse_points"])
-    coarse_results = _evaluate_grid(
-        coarse_grid, strategy_id, strategy_version, symbol,
-        interval, limit, start_time, end_time, data_source, user_id,
-        split_ratio=split_ratio, sample="in", weights=weights,
-    )
+    data = _load_sample_data(symbol, interval, limit, start_time, end_time, data_source, split_ratio)
+    coarse_results = []
+    halving = None
+    if data is not None and config.get("halving_eta"):
+        halving = _hyperband_search(
+            coarse_grid, strategy_id, strategy_version, symbol, interval, data_source, user_id,
+            weights=weights, evaluator=evaluator, data=data, eta=config["halving_eta"],
+            min_bars=config["halving_min_bars"], brackets=config["halving_brackets"],
+        )
+        coarse_results = halving.results
+    elif data is not None:
+        coarse_results = _evaluate_grid(
+            coarse_grid, strategy_id, strategy_version, symbol, interval, data_source, user_id,
+            weights=weights, evaluator=evaluator, bars=data.in_sample,
+        )
 
     if not coarse_results:
         return OptimizationResult(
@@ -102,9 +142,8 @@ def optimize_parameters(
         narrow_space = _narrow_search_space(searchable, top_coarse)
         fine_grid = _generate_grid(narrow_space, config["fine_points"])
         fine_results = _evaluate_grid(
-            fine_grid, strategy_id, strategy_version, symbol,
-            interval, limit, start_time, end_time, data_source, user_id,
-            split_ratio=split_ratio, sample="in", weights=weights,
+            fine_grid, strategy_id, strategy_version, symbol, interval, data_source, user_id,
+            weights=weights, evaluator=evaluator, bars=data.in_sample,
         )
         all_results.extend(fine_results)
 
@@ -112,9 +151,8 @@ def optimize_parameters(
     if config["bayesian_iter"] > 0:
         bayesian_results = _bayesian_optimize(
             searchable, all_results, config["bayesian_iter"],
-            strategy_id, strategy_version, symbol,
-            interval, limit, start_time, end_time, data_source, user_id,
-            split_ratio=split_ratio, weights=weights,
+            strategy_id, strategy_version, symbol, interval, data_source, user_id,
+            weights=weights, evaluator=evaluator, data=data,
         )
         all_results.extend(bayesian_results)
 
@@ -123,9 +161,8 @@ def optimize_parameters(
     top_candidates = ranked[:min(10, len(ranked))]
 
     validated = _validate_out_of_sample(
-        top_candidates, strategy_id, strategy_version, symbol,
-        interval, limit, start_time, end_time, data_source, user_id,
-        split_ratio=split_ratio, weights=weights,
+        top_candidates, strategy_id, strategy_version, symbol, interval, data_source, user_id,
+        weights=weights, evaluator=evaluator, data=data,
     )
 
     # Step 5: Overfitting detection
@@ -134,11 +171,55 @@ def optimize_parameters(
     # Step 6: Return top 3
     top_3 = sorted(validated, key=lambda r: r["combined_score"], reverse=True)[:3]
 
+    bar_count = len(data.in_sample)
+    bar_evaluations = len(all_results) * bar_count
+    evaluations = len(all_results)
+    bar_evaluations_saved = 0
+    if halving is not None:
+        evaluations += halving.evaluations - len(halving.results)
+        bar_evaluations += halving.bar_evaluations - len(halving.results) * bar_count
+        bar_evaluations_saved = halving.candidates * bar_count - halving.bar_evaluations
+
     return OptimizationResult(
         top_results=[_format_result(r) for r in top_3],
         overfitting_risk=overfitting_risk,
         search_space_size=len(searchable),
-        evaluations=len(all_results),
+        evaluations=evaluations,
+        bar_evaluations=bar_evaluations,
+        bar_evaluations_saved=bar_evaluations_saved,
+    )
+
+
+def _resolve_concurrency(level_concurrency: int, user_id: str | None) -> int:
+    """Cap the level's concurrency by what the user's plan allows."""
+    plan_level = None
+    if user_id:
+        user = db.session.get(User, user_id)
+        plan_level = user.plan_level if user is not None else None
+    return max(1, min(level_concurrency, get_optimizer_concurrency_limit(plan_level)))
+
+
+def _load_sample_data(symbol, interval, limit, start_time, end_time, data_source, split_ratio):
+    """Fetch the whole window once; the in/out-of-sample split happens on the frame."""
+    try:
+        full = load_backtest_bars(
+            symbol,
+            interval=interval,
+            limit=None if start_time and end_time else limit,
+            start_time=start_time,
+            end_time=end_time,
+            data_source=data_source,
+        )
+    except Exception:
+        return None
+
+    if not start_time or not end_time:
+        return _SampleData(in_sample=full, out_of_sample=None)
+    # ``between`` is inclusive on both ends; the bar at the split point is out-of-sample only.
+    split_point = start_time + int((end_time - start_time) * split_ratio)
+    return _SampleData(
+        in_sample=full.between(start_time, split_point - 1),
+        out_of_sample=full.between(split_point, end_time),
     )
 
 
@@ -202,49 +283,126 @@ def _snap_to_step(values, step, minimum, maximum):
 
 
 def _evaluate_grid(
-    grid, strategy_id, strategy_version, symbol,
-    interval, limit, start_time, end_time, data_source, user_id,
-    split_ratio, sample, weights,
+    grid, strategy_id, strategy_version, symbol, interval, data_source, user_id,
+    weights, evaluator, bars,
 ):
-    """Evaluate each point in the grid."""
-    if start_time and end_time:
-        duration = end_time - start_time
-        split_point = start_time + int(duration * split_ratio)
-        if sample == "in":
-            eval_start, eval_end = start_time, split_point
-        else:
-            eval_start, eval_end = split_point, end_time
-    else:
-        eval_start, eval_end = start_time, end_time
-
+    """Evaluate each point in the grid on ``bars``."""
+    outcomes = _run_batch(
+        evaluator, grid, bars, strategy_id, strategy_version, symbol, interval, data_source, user_id,
+    )
     results = []
-    for params in grid:
-        try:
-            bt_result = run_backtest(
-                symbol=symbol,
-                strategy_id=strategy_id,
-                strategy_version=strategy_version,
-                strategy_params=params,
-                interval=interval,
-                limit=limit,
-                start_time=eval_start,
-                end_time=eval_end,
-                data_source=data_source,
-                user_id=user_id,
-            )
-            summary = bt_result.get("summary", {})
-            score = _compute_objective(summary, weights)
-            results.append({
-                "params": params,
-                "score": score,
-                "summary": summary,
-                "trades": bt_result.get("trades", []),
-            })
-        except Exception:
+    for params, bt_result in zip(grid, outcomes):
+        if isinstance(bt_result, Exception):
             continue
+        summary = bt_result.get("summary", {})
+        score = _compute_objective(summary, weights)
+        results.append({
+            "params": params,
+            "score": score,
+            "summary": summary,
+            "trades": bt_result.get("trades", []),
+        })
     return results
 
 
+def _run_batch(
+    evaluator, param_sets, bars, strategy_id, strategy_version, symbol,
+    interval, data_source, user_id,
+):
+    """Backtest all parameter sets on ``bars`` through the evaluator; failures come back as exceptions."""
+    return evaluator.evaluate(param_sets, {
+        "symbol": symbol,
+        "strategy_id": strategy_id,
+        "strategy_version": strategy_version,
+        "interval": interval,
+        "data_source": data_source,
+        "user_id": user_id,
+        "bars": bars,
+    })
+
+
+@dataclass(frozen=True)
+class _HalvingOutcome:
+    results: list[dict]  # survivors scored on the full in-sample window
+    candidates: int  # distinct parameter sets that entered any bracket
+    evaluations: int  # backtests run, across all rungs
+    bar_evaluations: int  # sum of window lengths over those backtests
+
+
+def _hyperband_search(
+    grid, strategy_id, strategy_version, symbol, interval, data_source, user_id,
+    weights, evaluator, data, eta, min_bars, brackets=1, rng=None,
+):
+    """Successive halving over in-sample prefixes, optionally repeated as Hyperband brackets.
+
+    Bracket 0 starts every grid point on the shortest prefix (at least ``min_bars`` bars) and
+    keeps the top 1/eta at each rung until survivors run on the whole window. Later brackets
+    trade breadth for fidelity: fewer, randomly drawn points starting on longer prefixes.
+    """
+    total = len(data.in_sample)
+    max_rung = 0
+    while total // (eta ** (max_rung + 1)) >= min_bars:
+        max_rung += 1
+
+    rng = rng if rng is not None else np.random.default_rng()
+    cache = {}
+    survivors = {}
+    evaluations = 0
+    bar_evaluations = 0
+    for bracket in range(min(max(brackets, 1), max_rung + 1)):
+        rungs = max_rung - bracket
+        if bracket == 0:
+            candidates = list(grid)
+        else:
+            count = min(len(grid), math.ceil((max_rung + 1) / (rungs + 1) * eta ** rungs))
+            candidates = [grid[index] for index in rng.permutation(len(grid))[:count]]
+
+        for rung in range(rungs + 1):
+            length = total if rung == rungs else max(total // (eta ** (rungs - rung)), 1)
+            pending = [params for params in candidates if (_params_key(params), length) not in cache]
+            if pending:
+                outcomes = _run_batch(
+                    evaluator, pending, data.in_sample.take(slice(0, length)),
+                    strategy_id, strategy_version, symbol, interval, data_source, user_id,
+                )
+                evaluations += len(pending)
+                bar_evaluations += len(pending) * length
+                for params, bt_result in zip(pending, outcomes):
+                    cache[(_params_key(params), length)] = _scored(params, bt_result, weights)
+
+            scored = [cache[(_params_key(params), length)] for params in candidates]
+            scored = sorted((item for item in scored if item is not None), key=lambda r: r["score"], reverse=True)
+            if rung == rungs:
+                for item in scored:
+                    survivors[_params_key(item["params"])] = item
+                break
+            candidates = [item["params"] for item in scored[:max(math.ceil(len(scored) / eta), 1)]]
+
+    distinct = {key for key, _ in cache}
+    return _HalvingOutcome(
+        results=list(survivors.values()),
+        candidates=len(distinct),
+        evaluations=evaluations,
+        bar_evaluations=bar_evaluations,
+    )
+
+
+def _params_key(params):
+    return tuple(sorted(params.items()))
+
+
+def _scored(params, bt_result, weights):
+    if isinstance(bt_result, Exception):
+        return None
+    summary = bt_result.get("summary", {})
+    return {
+        "params": params,
+        "score": _compute_objective(summary, weights),
+        "summary": summary,
+        "trades": bt_result.get("trades", []),
+    }
+
+
 def _compute_objective(summary: dict, weights: dict) -> float:
     """Compute weighted objective score from backtest summary."""
     total_return = summary.get("totalReturn", 0)
@@ -288,130 +446,168 @@ def _narrow_search_space(search_space, top_results) -> list[dict]:
 
 def _bayesian_optimize(
     search_space, existing_results, n_iter,
-    strategy_id, strategy_version, symbol,
-    interval, limit, start_time, end_time, data_source, user_id,
-    split_ratio, weights,
+    strategy_id, strategy_version, symbol, interval, data_source, user_id,
+    weights, evaluator, data, rng=None,
 ):
-    """Simple Bayesian-style optimization using expected improvement heuristic.
+    """Gaussian-process Bayesian optimization with expected-improvement acquisition.
 
-    Uses a surrogate model based on Gaussian kernel interpolation over
-    existing results to suggest promising points.
+    Each round fits the surrogate to every score seen so far and proposes as many
+    points as the evaluator runs concurrently. Candidates are scored on the in-sample
+    bars, like every other search phase, so the surrogate sees a single objective.
     """
     if not existing_results or n_iter <= 0:
         return []
 
+    rng = rng if rng is not None else np.random.default_rng()
     results = []
     evaluated_params = [r["params"] for r in existing_results]
-    best_score = max(r["score"] for r in existing_results)
+    scores = [r["score"] for r in existing_results]
+    remaining = n_iter
 
-    for i in range(n_iter):
-        candidate = _suggest_next_point(search_space, evaluated_params, best_score)
-        if candidate is None:
+    while remaining > 0:
+        candidates = _suggest_points(
+            search_space, evaluated_params, scores, min(evaluator.concurrency, remaining), rng,
+        )
+        if not candidates:
             break
+        remaining -= len(candidates)
 
-        try:
-            bt_result = run_backtest(
-                symbol=symbol,
-                strategy_id=strategy_id,
-                strategy_version=strategy_version,
-                strategy_params=candidate,
-                interval=interval,
-                limit=limit,
-                start_time=start_time,
-                end_time=end_time,
-                data_source=data_source,
-                user_id=user_id,
-            )
+        outcomes = _run_batch(
+            evaluator, candidates, data.in_sample, strategy_id, strategy_version, symbol,
+            interval, data_source, user_id,
+        )
+        for candidate, bt_result in zip(candidates, outcomes):
+            # Failed points stay "evaluated" so they are not proposed again.
+            evaluated_params.append(candidate)
+            if isinstance(bt_result, Exception):
+                scores.append(min(scores))
+                continue
             summary = bt_result.get("summary", {})
             score = _compute_objective(summary, weights)
+            scores.append(score)
             results.append({
                 "params": candidate,
                 "score": score,
                 "summary": summary,
                 "trades": bt_result.get("trades", []),
             })
-            evaluated_params.append(candidate)
-            if score > best_score:
-                best_score = score
-        except Exception:
-            continue
 
     return results
 
 
-def _suggest_next_point(search_space, evaluated, best_score):
-    """Suggest next evaluation point using Thompson sampling approximation."""
-    import random
-
-    for _ in range(50):
-        candidate = {}
-        for param in search_space:
-            if param["is_int"]:
-                candidate[param["key"]] = random.randint(int(param["min"]), int(param["max"]))
-            else:
-                candidate[param["key"]] = random.uniform(param["min"], param["max"])
-
-        # Check if too close to existing point
-        min_distance = float("inf")
-        for existing in evaluated:
-            dist = sum(
-                (candidate.get(p["key"], 0) - existing.get(p["key"], 0)) ** 2
-                for p in search_space
+def _suggest_points(search_space, evaluated, scores, count, rng):
+    """Propose up to ``count`` new points by maximizing EI over a random candidate batch.
+
+    Points after the first are chosen with the "kriging believer" heuristic: each pick is
+    added to the surrogate at its predicted mean before the acquisition is recomputed.
+    """
+    lows = np.array([p["min"] for p in search_space])
+    spans = np.array([p["max"] for p in search_space]) - lows
+    observed = _to_unit(search_space, evaluated, lows, spans)
+
+    candidates = lows + rng.random((_BAYESIAN_CANDIDATES, len(search_space))) * spans
+    if len(evaluated):
+        # Half of the batch explores around the current leaders.
+        leaders = observed[np.argsort(scores)[-5:]]
+        local = leaders[rng.integers(len(leaders), size=_BAYESIAN_CANDIDATES // 2)]
+        local = np.clip(local + rng.normal(scale=0.1, size=local.shape), 0.0, 1.0)
+        candidates = np.vstack([candidates, lows + local * spans])
+    candidates = _snap_candidates(search_space, candidates)
+    unit = (candidates - lows) / spans
+
+    surrogate = None
+    if len(evaluated) >= 2:
+        surrogate = GaussianProcess().fit(observed, scores)
+    best = max(scores) if len(scores) else 0.0
+    taken = observed
+
+    proposals = []
+    for _ in range(count):
+        if surrogate is None:
+            acquisition = rng.random(len(unit))
+        else:
+            mean, std = surrogate.predict(unit)
+            acquisition = expected_improvement(mean, std, best)
+        if len(taken):
+            distances = np.min(
+                np.sum((unit[:, None, :] - taken[None, :, :]) ** 2, axis=2), axis=1,
             )
-            min_distance = min(min_distance, dist)
+            acquisition = np.where(distances < 1e-12, -np.inf, acquisition)
+        index = int(np.argmax(acquisition))
+        if not np.isfinite(acquisition[index]):
+            break
 
-        # Prefer points far from existing evaluations (exploration)
-        if min_distance > 0.01 or len(evaluated) < 5:
-            return candidate
+        proposals.append(candidates[index])
+        taken = np.vstack([taken, unit[index:index + 1]]) if len(taken) else unit[index:index + 1]
+        if surrogate is not None:
+            surrogate.add_observation(unit[index], float(mean[index]))
 
-    return candidate
+    return [_to_params(search_space, row) for row in proposals]
+
+
+def _to_unit(search_space, params_list, lows, spans):
+    if not params_list:
+        return np.empty((0, len(search_space)))
+    values = np.array([
+        [float(params.get(p["key"], p["default"] if p["default"] is not None else p["min"])) for p in search_space]
+        for params in params_list
+    ])
+    return np.clip((values - lows) / spans, 0.0, 1.0)
+
+
+def _snap_candidates(search_space, values):
+    """Vectorized counterpart of ``_snap_to_step`` plus integer rounding, column by column."""
+    values = np.array(values, dtype=np.float64)
+    for column, param in enumerate(search_space):
+        snapped = values[:, column]
+        if param["step"] is not None:
+            snapped = np.round(snapped / param["step"]) * param["step"]
+        if param["is_int"]:
+            snapped = np.round(snapped)
+        values[:, column] = np.clip(snapped, param["min"], param["max"])
+    return values
+
+
+def _to_params(search_space, row):
+    return {
+        p["key"]: int(value) if p["is_int"] else float(value)
+        for p, value in zip(search_space, row)
+    }
 
 
 def _validate_out_of_sample(
-    candidates, strategy_id, strategy_version, symbol,
-    interval, limit, start_time, end_time, data_source, user_id,
-    split_ratio, weights,
+    candidates, strategy_id, strategy_version, symbol, interval, data_source, user_id,
+    weights, evaluator, data,
 ):
     """Re-evaluate top candidates on out-of-sample data."""
-    if not start_time or not end_time:
+    if data.out_of_sample is None:
         return [
             {**c, "oos_score": c["score"], "combined_score": c["score"]}
             for c in candidates
         ]
 
-    duration = end_time - start_time
-    split_point = start_time + int(duration * split_ratio)
-
+    outcomes = _run_batch(
+        evaluator, [candidate["params"] for candidate in candidates], data.out_of_sample,
+        strategy_id, strategy_version, symbol, interval, data_source, user_id,
+    )
     validated = []
-    for candidate in candidates:
-        try:
-            bt_result = run_backtest(
-                symbol=symbol,
-                strategy_id=strategy_id,
-                strategy_version=strategy_version,
-                strategy_params=candidate["params"],
-                interval=interval,
-                limit=limit,
-                start_time=split_point,
-                end_time=end_time,
-                data_source=data_source,
-                user_id=user_id,
-            )
-            oos_summary = bt_result.get("summary", {})
-            oos_score = _compute_objective(oos_summary, weights)
-            combined_score = (candidate["score"] + oos_score) / 2
-            validated.append({
-                **candidate,
-                "oos_score": oos_score,
-                "oos_summary": oos_summary,
-                "combined_score": combined_score,
-            })
-        except Exception:
+    for candidate, bt_result in zip(candidates, outcomes):
+        if isinstance(bt_result, Exception):
             validated.append({
                 **candidate,
                 "oos_score": candidate["score"] * 0.5,
                 "combined_score": candidate["score"] * 0.75,
             })
+            continue
+        oos_summary = bt_result.get("summary", {})
+        oos_score = _compute_objective(oos_summary, weights)
+        combined_score = (candidate["score"] + oos_score) / 2
+        validated.append({
+            **candidate,
+            "oos_score": oos_score,
+            "oos_summary": oos_summary,
+            "combined_score": combined_score,
+        })
 
     return validated
 
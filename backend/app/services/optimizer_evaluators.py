@@ -0,0 +1,142 @@
+"""Parallel evaluation backends for the parameter optimizer.
+
+An evaluator takes a list of parameter sets plus the shared backtest arguments and
+returns one entry per set, in order: ``{"summary": ..., "trades": ...}`` or the
+exception that made that set fail. Work is split into at most ``concurrency``
+batches, each backtested in a single sandbox session.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from flask import current_app, has_app_context
+
+from ..backtest.engine import run_backtest_batch
+from ..backtest.frame import BarFrame
+from ..strategy_runtime.errors import StrategyRuntimeError
+
+
+LOCAL_BACKEND = "local"
+CELERY_BACKEND = "celery"
+DEFAULT_CELERY_TIMEOUT_SECONDS = 1800
+
+
+def _split(param_sets, concurrency):
+    size = max(math.ceil(len(param_sets) / max(concurrency, 1)), 1)
+    return [(start, param_sets[start:start + size]) for start in range(0, len(param_sets), size)]
+
+
+def evaluate_batch(param_sets, backtest_kwargs):
+    try:
+        results = run_backtest_batch(param_sets=param_sets, **backtest_kwargs)
+    except Exception as exc:
+        return [exc] * len(param_sets)
+    return [
+        item if isinstance(item, Exception) else {
+            "summary": item.get("summary") or {},
+            "trades": item.get("trades") or [],
+        }
+        for item in results
+    ]
+
+
+class LocalEvaluator:
+    """Fan batches out over threads in this process; each thread drives its own sandbox run."""
+
+    backend = LOCAL_BACKEND
+
+    def __init__(self, concurrency):
+        self.concurrency = max(int(concurrency), 1)
+
+    def evaluate(self, param_sets, backtest_kwargs):
+        param_sets = list(param_sets)
+        if not param_sets:
+            return []
+        chunks = _split(param_sets, self.concurrency)
+        if len(chunks) == 1:
+            return evaluate_batch(param_sets, backtest_kwargs)
+
+        app = current_app._get_current_object() if has_app_context() else None
+        results = [None] * len(param_sets)
+        with ThreadPoolExecutor(max_workers=len(chunks), thread_name_prefix="optimizer") as executor:
+            futures = {
+                executor.submit(self._run_chunk, app, chunk, backtest_kwargs): (start, len(chunk))
+                for start, chunk in chunks
+            }
+            for future in as_completed(futures):
+                start, size = futures[future]
+                results[start:start + size] = future.result()
+        return results
+
+    @staticmethod
+    def _run_chunk(app, chunk, backtest_kwargs):
+        if app is None:
+            return evaluate_batch(chunk, backtest_kwargs)
+        with app.app_context():
+            return evaluate_batch(chunk, backtest_kwargs)
+
+
+class CeleryEvaluator:
+    """Fan batches out as a Celery group on the backtest queue."""
+
+    backend = CELERY_BACKEND
+
+    def __init__(self, concurrency, timeout_seconds=None):
+        self.concurrency = max(int(concurrency), 1)
+        self.timeout_seconds = timeout_seconds or int(
+            os.getenv("OPTIMIZER_CELERY_TIMEOUT_SECONDS", DEFAULT_CELERY_TIMEOUT_SECONDS)
+        )
+
+    def evaluate(self, param_sets, backtest_kwargs):
+        from celery import group
+
+        from ..tasks.backtests import run_backtest_batch_task
+
+        param_sets = list(param_sets)
+        if not param_sets:
+            return []
+        task_kwargs = dict(backtest_kwargs)
+        if isinstance(task_kwargs.get("bars"), BarFrame):
+            task_kwargs["bars"] = task_kwargs["bars"].to_columns()
+        chunks = _split(param_sets, self.concurrency)
+        group_result = group(
+            run_backtest_batch_task.s(chunk, task_kwargs) for _, chunk in chunks
+        ).apply_async()
+        try:
+            outcomes = group_result.join(timeout=self.timeout_seconds, propagate=False)
+        except Exception as exc:
+            outcomes = [exc] * len(chunks)
+
+        results = []
+        for (_, chunk), outcome in zip(chunks, outcomes):
+            if not isinstance(outcome, list):
+                error = outcome if isinstance(outcome, Exception) else StrategyRuntimeError("optimizer_task_failed")
+                results.extend([error] * len(chunk))
+                continue
+            results.extend(_from_task_payload(item) for item in outcome)
+        return results
+
+
+def to_task_payload(evaluation):
+    if isinstance(evaluation, StrategyRuntimeError):
+        return {"ok": False, "error": evaluation.message, "details": evaluation.details}
+    if isinstance(evaluation, Exception):
+        return {"ok": False, "error": str(evaluation), "details": None}
+    return {"ok": True, **evaluation}
+
+
+def _from_task_payload(payload):
+    payload = payload or {}
+    if not payload.get("ok"):
+        return StrategyRuntimeError(payload.get("error") or "strategy_runtime_error", payload.get("details"))
+    return {"summary": payload.get("summary") or {}, "trades": payload.get("trades") or []}
+
+
+def get_optimizer_evaluator(concurrency, backend=None):
+    backend = (backend or os.getenv("OPTIMIZER_EVALUATOR_BACKEND") or LOCAL_BACKEND).strip().lower()
+    if backend == CELERY_BACKEND:
+        return CeleryEvaluator(concurrency)
+    return LocalEvaluator(concurrency)
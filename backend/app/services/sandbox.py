@@ -4,9 +4,15 @@ import multiprocessing
 import os
 import threading
 
+from ..backtest.frame import bars_to_records
 from ..backtest.sandbox_template import RESULT_PREFIX, build_sandbox_script
 from ..strategy_runtime.errors import StrategyRuntimeError
-from ..strategy_runtime.sandbox import run_strategy_in_subprocess, run_strategy_inline
+from ..strategy_runtime.sandbox import (
+    run_strategy_batch_in_subprocess,
+    run_strategy_batch_inline,
+    run_strategy_in_subprocess,
+    run_strategy_inline,
+)
 
 try:
     from e2b_code_interpreter import Sandbox as E2BSandbox
@@ -37,12 +43,42 @@ class SandboxService:
             outcome = self._execute_locally(code, market_data, params, execution_metadata, timeout_seconds)
             return outcome
 
+        return self._execute_remotely(code, market_data, params, execution_metadata, timeout_seconds) or {
+            "trades": [],
+            "logs": [],
+        }
+
+    def execute_strategy_batch(self, code, market_data, param_sets, metadata=None):
+        """Run one strategy over the same bars for each parameter set, loading the code once.
+
+        Returns one entry per parameter set: ``{"ok": True, "trades", "logs"}`` or
+        ``{"ok": False, "error_code", "error"}`` when that set alone failed.
+        """
+        execution_metadata = dict(metadata or {})
+        timeout_seconds = int(execution_metadata.get('timeout_seconds') or DEFAULT_TIMEOUT_SECONDS)
+        param_sets = [dict(item or {}) for item in param_sets or []]
+        if not param_sets:
+            return []
+
+        if self._should_use_local():
+            results = self._execute_batch_locally(code, market_data, param_sets, execution_metadata, timeout_seconds)
+        else:
+            outcome = self._execute_remotely(
+                code, market_data, None, execution_metadata, timeout_seconds, param_sets=param_sets,
+            )
+            results = (outcome or {}).get('results') or []
+        return [self._batch_entry(item) for item in results]
+
+    def _execute_remotely(self, code, market_data, params, execution_metadata, timeout_seconds, param_sets=None):
         self._ensure_remote_available()
         self._warm_pool_if_needed(timeout_seconds)
         sandbox = self._acquire(timeout_seconds)
         keep_warm = self.pool_size > 0
         try:
-            script = build_sandbox_script(code, market_data, params, execution_metadata)
+            remote_market_data = dict(market_data or {})
+            if 'bars' in remote_market_data:
+                remote_market_data['bars'] = bars_to_records(remote_market_data['bars'])
+            script = build_sandbox_script(code, remote_market_data, params, execution_metadata, param_sets=param_sets)
             execution = sandbox.run_code(
                 script,
                 timeout=timeout_seconds,
@@ -55,7 +91,7 @@ class SandboxService:
                 if 'timeout' in error.lower():
                     raise StrategyRuntimeError('strategy_timeout', {"reason": error})
                 raise StrategyRuntimeError('strategy_runtime_error', {"reason": error})
-            return payload.get('result') or {"trades": [], "logs": []}
+            return payload.get('result')
         except Exception as exc:
             keep_warm = False
             if isinstance(exc, StrategyRuntimeError):
@@ -77,12 +113,50 @@ class SandboxService:
         }
         if runner is run_strategy_in_subprocess:
             runner_kwargs["timeout_seconds"] = timeout_seconds
+        runner_kwargs.update(self._entrypoint_kwargs(metadata))
         outcome = runner(**runner_kwargs)
         return {
             "trades": outcome.get('trades') or [],
             "logs": outcome.get('logs') or [],
         }
 
+    def _execute_batch_locally(self, code, market_data, param_sets, metadata, timeout_seconds):
+        runner_kwargs = {
+            "symbol": (market_data or {}).get('symbol'),
+            "source": code,
+            "callable_name": metadata.get('callable_name'),
+            "bars": (market_data or {}).get('bars') or [],
+            "param_sets": param_sets,
+        }
+        runner_kwargs.update(self._entrypoint_kwargs(metadata))
+        if self._should_use_inline_local():
+            return run_strategy_batch_inline(**runner_kwargs)
+        return run_strategy_batch_in_subprocess(
+            timeout_seconds=timeout_seconds,
+            per_set_timeout_seconds=metadata.get('per_set_timeout_seconds'),
+            **runner_kwargs,
+        )
+
+    @staticmethod
+    def _entrypoint_kwargs(metadata):
+        # Only forwarded when the manifest declared them, so runners keep their defaults otherwise.
+        return {key: metadata[key] for key in ('lookback', 'interface', 'output') if metadata.get(key)}
+
+    @staticmethod
+    def _batch_entry(item):
+        item = item or {}
+        if not item.get('ok'):
+            return {
+                "ok": False,
+                "error_code": item.get('error_code') or 'strategy_runtime_error',
+                "error": item.get('error'),
+            }
+        return {
+            "ok": True,
+            "trades": item.get('trades') or [],
+            "logs": item.get('logs') or [],
+        }
+
     @staticmethod
     def _is_test_env():
         return os.getenv('FLASK_ENV', '').lower() in {'test', 'testing'}
@@ -180,3 +254,7 @@ def get_sandbox_service():
 
 def execute_strategy(code, market_data, params, metadata=None):
     return get_sandbox_service().execute_strategy(code, market_data, params, metadata=metadata)
+
+
+def execute_strategy_batch(code, market_data, param_sets, metadata=None):
+    return get_sandbox_service().execute_strategy_batch(code, market_data, param_sets, metadata=metadata)
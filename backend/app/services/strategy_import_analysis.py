@@ -244,6 +244,15 @@ def _inspect_source(source, path):
                     "confidence": 0.8,
                 }
             )
+        if isinstance(node, ast.FunctionDef) and node.name == "on_bars":
+            candidates.append(
+                {
+                    "path": path,
+                    "callable": "on_bars",
+                    "interface": "vector_v1",
+                    "confidence": 0.8,
+                }
+            )
     return {
         "candidates": _dedupe_candidates(candidates),
         "syntaxValid": True,
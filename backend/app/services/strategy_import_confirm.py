@@ -10,6 +10,7 @@ from qysp.builder import build_package
 
 from ..extensions import db
 from ..models import File, StrategyImportDraft, StrategyVersion
+from ..strategy_runtime.loader import invalidate_strategy_package_cache
 from .strategy_import import (
     _strategy_storage_root,
     _upsert_strategy,
@@ -138,6 +139,7 @@ def confirm_strategy_import(draft_import_id, *, owner_id, payload):
 
         draft.status = "confirmed"
         db.session.commit()
+        invalidate_strategy_package_cache(strategy.id)
         return strategy, version, built_file
     finally:
         if temp_root.exists():
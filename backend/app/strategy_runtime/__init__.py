@@ -1,10 +1,17 @@
 from .errors import StrategyRuntimeError, as_response
-from .executor import execute_backtest_strategy, preflight_strategy
+from .executor import (
+    execute_backtest_strategy,
+    execute_backtest_strategy_batch,
+    preflight_strategy,
+    preflight_strategy_batch,
+)
 
 __all__ = [
     'StrategyRuntimeError',
     'as_response',
     'execute_backtest_strategy',
+    'execute_backtest_strategy_batch',
     'preflight_strategy',
+    'preflight_strategy_batch',
 ]
 
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Iterator
 
 from qysp import Account, BarData, ParameterAccessor, Position, StrategyContext as QYSPStrategyContext
 
+from ..backtest.frame import BarFrame
+from .history import DEFAULT_LOOKBACK, BarHistory
+
 
 INITIAL_CAPITAL = 100_000.0
 
@@ -40,12 +43,19 @@ class RuntimeBarData(BarData):
 
 
 class StrategyContext(QYSPStrategyContext):
-    def __init__(self, symbol: str, params: dict[str, Any] | None, initial_cash: float = INITIAL_CAPITAL) -> None:
+    def __init__(
+        self,
+        symbol: str,
+        params: dict[str, Any] | None,
+        initial_cash: float = INITIAL_CAPITAL,
+        lookback: int | None = None,
+    ) -> None:
         self.symbol = symbol
         self.params = dict(params or {})
         self.orders: list[dict[str, Any]] = []
         self.logs: list[str] = []
         self._latest_bar: RuntimeBarData | None = None
+        self._history = BarHistory(lookback or DEFAULT_LOOKBACK)
         super().__init__(
             account=Account(cash=float(initial_cash)),
             parameters=ParameterAccessor(self.params),
@@ -53,6 +63,7 @@ class StrategyContext(QYSPStrategyContext):
 
     def sync_bar(self, bar: RuntimeBarData) -> None:
         self._latest_bar = bar
+        self._history.push(bar)
         self.symbol = bar.symbol or self.symbol
         self.current_dt = bar.datetime
 
@@ -60,6 +71,14 @@ class StrategyContext(QYSPStrategyContext):
         if position is not None:
             position.current_price = float(bar.close)
 
+    def history(self, field: str, n: int | None = None):
+        """Read-only view of the last ``n`` values of ``field`` (oldest first), the current bar included.
+
+        Fewer values come back until ``n`` bars have arrived; ``n`` may not exceed the manifest's
+        ``runtime.lookback``.
+        """
+        return self._history.view(field, n)
+
     def emit_order(self, order: Any) -> None:
         normalized = normalize_order(order, default_symbol=self.symbol)
         if normalized is None:
@@ -125,6 +144,33 @@ def make_bar(symbol: str, raw_bar: dict[str, Any]) -> RuntimeBarData:
     )
 
 
+def iter_frame_bars(symbol: str, frame: BarFrame) -> Iterator[RuntimeBarData]:
+    # Columns are copied out up front so no view into the frame (possibly shared memory) outlives this call.
+    columns = zip(
+        frame.time.tolist(),
+        frame.open.tolist(),
+        frame.high.tolist(),
+        frame.low.tolist(),
+        frame.close.tolist(),
+        frame.volume.tolist(),
+    )
+    return _bars_from_columns(symbol, columns)
+
+
+def _bars_from_columns(symbol: str, columns) -> Iterator[RuntimeBarData]:
+    for raw_time, open_, high, low, close, volume in columns:
+        yield RuntimeBarData(
+            symbol=symbol,
+            open=open_,
+            high=high,
+            low=low,
+            close=close,
+            volume=int(volume),
+            datetime=_coerce_datetime(raw_time),
+            time=raw_time,
+        )
+
+
 def normalize_order(order: Any, *, default_symbol: str) -> dict[str, Any] | None:
     if order is None:
         return None
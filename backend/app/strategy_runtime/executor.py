@@ -1,6 +1,8 @@
 from ..services import sandbox as sandbox_service
 from .loader import load_strategy_package
+from .manifest import manifest_entrypoint_mode, manifest_lookback
 from .params import validate_and_merge_params
+from .errors import StrategyRuntimeError
 from .sandbox import guard_strategy_source
 
 
@@ -11,6 +13,29 @@ def preflight_strategy(strategy_id, strategy_version, strategy_params, user_id=N
     return loaded, params
 
 
+def preflight_strategy_batch(strategy_id, strategy_version, param_sets, user_id=None):
+    """Load and guard the package once; validate each parameter set independently.
+
+    Invalid sets come back as the StrategyRuntimeError that rejected them.
+    """
+    loaded = load_strategy_package(strategy_id, strategy_version, user_id=user_id)
+    guard_strategy_source(loaded.get('source') or '')
+    definitions = (loaded.get('manifest') or {}).get('parameters')
+    validated = []
+    for strategy_params in param_sets:
+        try:
+            validated.append(validate_and_merge_params(definitions, strategy_params))
+        except StrategyRuntimeError as exc:
+            validated.append(exc)
+    return loaded, validated
+
+
+def _manifest_metadata(loaded_strategy):
+    manifest = loaded_strategy.get('manifest')
+    interface, output = manifest_entrypoint_mode(manifest)
+    return {"lookback": manifest_lookback(manifest), "interface": interface, "output": output}
+
+
 def execute_backtest_strategy(symbol, bars, loaded_strategy, params, timeout_seconds=300):
     outcome = sandbox_service.execute_strategy(
         code=loaded_strategy['source'],
@@ -21,6 +46,7 @@ def execute_backtest_strategy(symbol, bars, loaded_strategy, params, timeout_sec
             "strategy_id": loaded_strategy['strategy_id'],
             "strategy_version": loaded_strategy['version'],
             "symbol": symbol,
+            **_manifest_metadata(loaded_strategy),
             "timeout_seconds": timeout_seconds,
         },
     )
@@ -33,3 +59,53 @@ def execute_backtest_strategy(symbol, bars, loaded_strategy, params, timeout_sec
             "logs": outcome.get('logs') or [],
         },
     }
+
+
+def execute_backtest_strategy_batch(symbol, bars, loaded_strategy, param_sets, timeout_seconds=300):
+    """Run every parameter set in one sandbox session.
+
+    Each parameter set gets its own ``timeout_seconds`` deadline inside the session, so a set that
+    overruns fails alone while the others keep their results. Each entry mirrors
+    ``execute_backtest_strategy`` or, for a set that failed on its own, is a StrategyRuntimeError.
+    """
+    param_sets = list(param_sets)
+    if not param_sets:
+        return []
+    try:
+        outcomes = sandbox_service.execute_strategy_batch(
+            code=loaded_strategy['source'],
+            market_data={"symbol": symbol, "bars": bars},
+            param_sets=param_sets,
+            metadata={
+                "callable_name": loaded_strategy['entrypoint_callable'],
+                "strategy_id": loaded_strategy['strategy_id'],
+                "strategy_version": loaded_strategy['version'],
+                "symbol": symbol,
+                **_manifest_metadata(loaded_strategy),
+                "timeout_seconds": timeout_seconds * len(param_sets),
+                "per_set_timeout_seconds": timeout_seconds,
+            },
+        )
+    except StrategyRuntimeError as exc:
+        # Only reached when a set could not be interrupted (e.g. blocked in native code), so
+        # nothing from the session survives; every set reports the timeout.
+        if exc.message != 'strategy_timeout':
+            raise
+        return [exc] * len(param_sets)
+    results = []
+    for params, outcome in zip(param_sets, outcomes):
+        if not outcome.get('ok'):
+            results.append(StrategyRuntimeError(outcome.get('error_code') or 'strategy_runtime_error', {
+                "reason": outcome.get('error'),
+            }))
+            continue
+        results.append({
+            "trades": outcome.get('trades') or [],
+            "runtime": {
+                "strategyId": loaded_strategy['strategy_id'],
+                "strategyVersion": loaded_strategy['version'],
+                "params": params,
+                "logs": outcome.get('logs') or [],
+            },
+        })
+    return results
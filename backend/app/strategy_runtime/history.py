@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import numpy as np
+
+
+HISTORY_FIELDS = ('time', 'open', 'high', 'low', 'close', 'volume')
+DEFAULT_LOOKBACK = 256
+MAX_LOOKBACK = 100_000
+
+
+class BarHistory:
+    """The last ``capacity`` bars of each field, in preallocated ring buffers.
+
+    Every buffer is twice the capacity and each value is written to both halves, so the newest
+    ``n`` values are always one contiguous slice and ``view`` never copies. A view reflects the
+    buffer at the time of the call; later bars overwrite it, so keep a ``.copy()`` to retain it.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_LOOKBACK) -> None:
+        capacity = int(capacity)
+        if not 0 < capacity <= MAX_LOOKBACK:
+            raise ValueError(f'lookback must be between 1 and {MAX_LOOKBACK}, got {capacity}')
+        self.capacity = capacity
+        self._buffers = {
+            name: np.zeros(2 * capacity, dtype=np.int64 if name == 'time' else np.float64)
+            for name in HISTORY_FIELDS
+        }
+        self._count = 0
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    def push(self, bar) -> None:
+        slot = self._count % self.capacity
+        mirror = slot + self.capacity
+        for name, buffer in self._buffers.items():
+            value = getattr(bar, name)
+            if name == 'time' and value is None:
+                value = int(bar.datetime.timestamp() * 1000)
+            buffer[slot] = buffer[mirror] = value
+        self._count += 1
+
+    def view(self, field: str, n: int | None = None) -> np.ndarray:
+        buffer = self._buffers.get(field)
+        if buffer is None:
+            raise ValueError(f'unknown history field: {field}')
+        available = len(self)
+        if n is None:
+            n = available
+        n = int(n)
+        if n < 0:
+            raise ValueError(f'history length must not be negative, got {n}')
+        if n > self.capacity:
+            raise ValueError(f'history({field!r}, {n}) exceeds the declared lookback of {self.capacity} bars')
+        n = min(n, available)
+
+        end = (self._count - 1) % self.capacity + self.capacity + 1 if self._count else 0
+        values = buffer[end - n:end]
+        values.flags.writeable = False
+        return values
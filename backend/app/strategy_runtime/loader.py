@@ -1,6 +1,10 @@
+import copy
+import hashlib
 import json
 import os
+import threading
 import zipfile
+from collections import OrderedDict
 
 from ..extensions import db
 from ..models import File, Strategy, StrategyVersion
@@ -9,6 +13,9 @@ from .errors import StrategyRuntimeError
 from .manifest import normalize_zip_path, validate_manifest
 
 
+DEFAULT_PACKAGE_CACHE_SIZE = 64
+
+
 def _can_access_strategy(strategy, user_id):
     if user_id is not None and strategy.owner_id == user_id:
         return True
@@ -41,6 +48,90 @@ def _find_strategy_version(strategy, source_strategy, version):
     return strategy_version
 
 
+def describe_strategy_package(strategy_id, version, user_id=None):
+    """Identify the package ``load_strategy_package`` would load without opening the archive."""
+    if not strategy_id:
+        raise StrategyRuntimeError('strategy_id_required')
+
+    strategy, source_strategy = _resolve_runtime_strategy(strategy_id, user_id=user_id)
+    strategy_version = _find_strategy_version(strategy, source_strategy, version)
+    code_strategy = strategy if strategy.code_encrypted else source_strategy
+    return {
+        "strategy_id": strategy_id,
+        "version": strategy_version.version,
+        "version_id": strategy_version.id,
+        "file_id": strategy_version.file_id,
+        "code_hash": code_strategy.code_hash,
+    }
+
+
+class _PackageCache:
+    """Bounded LRU of validated, decrypted packages shared by every caller in the process.
+
+    Keys cover everything the loaded package depends on: the archive path with its mtime and size,
+    the strategy version and the identity of the code it runs, so a republished package or a
+    re-encrypted strategy misses on its own. ``invalidate`` drops entries eagerly on publish.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def max_entries():
+        try:
+            return max(int(os.getenv('STRATEGY_PACKAGE_CACHE_SIZE', DEFAULT_PACKAGE_CACHE_SIZE)), 0)
+        except (TypeError, ValueError):
+            return DEFAULT_PACKAGE_CACHE_SIZE
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, package, strategy_ids):
+        limit = self.max_entries()
+        with self._lock:
+            if limit <= 0:
+                return
+            self._entries[key] = (package, frozenset(strategy_ids))
+            self._entries.move_to_end(key)
+            while len(self._entries) > limit:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, strategy_id=None):
+        with self._lock:
+            if strategy_id is None:
+                self._entries.clear()
+                return
+            for key in [key for key, (_, ids) in self._entries.items() if strategy_id in ids]:
+                del self._entries[key]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_package_cache = _PackageCache()
+
+
+def invalidate_strategy_package_cache(strategy_id=None):
+    """Forget loaded packages of ``strategy_id`` (or of every strategy) after a (re)publish."""
+    _package_cache.invalidate(strategy_id)
+
+
+def _code_identity(code_strategy):
+    if not code_strategy or not code_strategy.code_encrypted:
+        return None
+    return code_strategy.code_hash or hashlib.sha256(code_strategy.code_encrypted).hexdigest()
+
+
 def load_strategy_package(strategy_id, version, user_id=None):
     if not strategy_id:
         raise StrategyRuntimeError('strategy_id_required')
@@ -54,7 +145,38 @@ def load_strategy_package(strategy_id, version, user_id=None):
     archive_path = file_record.path
     if not archive_path or not os.path.exists(archive_path):
         raise StrategyRuntimeError('strategy_file_missing')
+    try:
+        archive_stat = os.stat(archive_path)
+    except OSError:
+        raise StrategyRuntimeError('strategy_file_missing')
+
+    code_strategy = strategy if strategy.code_encrypted else source_strategy
+    cache_key = (
+        archive_path,
+        archive_stat.st_mtime_ns,
+        archive_stat.st_size,
+        strategy_version.id,
+        source_strategy.id,
+        code_strategy.id if code_strategy else None,
+        _code_identity(code_strategy),
+    )
+    package = _package_cache.get(cache_key)
+    if package is None:
+        package = _read_strategy_package(archive_path, source_strategy, strategy_version, code_strategy)
+        _package_cache.put(cache_key, package, {strategy.id, source_strategy.id})
 
+    return {
+        "strategy_id": strategy_id,
+        "version": package["version"],
+        # Callers may adjust the manifest; the cached copy stays pristine.
+        "manifest": copy.deepcopy(package["manifest"]),
+        "entrypoint_path": package["entrypoint_path"],
+        "entrypoint_callable": package["entrypoint_callable"],
+        "source": package["source"],
+    }
+
+
+def _read_strategy_package(archive_path, source_strategy, strategy_version, code_strategy):
     try:
         with zipfile.ZipFile(archive_path) as archive:
             names = [normalize_zip_path(name) for name in archive.namelist() if not name.endswith('/')]
@@ -79,7 +201,6 @@ def load_strategy_package(strategy_id, version, user_id=None):
             if entrypoint_path not in names:
                 raise StrategyRuntimeError('entrypoint_missing')
 
-            code_strategy = strategy if strategy.code_encrypted else source_strategy
             if code_strategy and code_strategy.code_encrypted:
                 try:
                     source_bytes = decrypt_strategy(code_strategy.code_encrypted)
@@ -97,7 +218,6 @@ def load_strategy_package(strategy_id, version, user_id=None):
         raise StrategyRuntimeError('invalid_archive')
 
     return {
-        "strategy_id": strategy_id,
         "version": strategy_version.version,
         "manifest": manifest,
         "entrypoint_path": entrypoint_path,
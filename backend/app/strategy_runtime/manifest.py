@@ -1,4 +1,6 @@
 from .errors import StrategyRuntimeError
+from .history import MAX_LOOKBACK
+from .vector import EVENT_INTERFACE, OUTPUTS, VECTOR_INTERFACE
 
 
 def normalize_zip_path(path):
@@ -29,12 +31,35 @@ def validate_manifest(manifest):
     runtime = manifest.get('runtime') or {}
     if not runtime.get('name') or not runtime.get('version'):
         raise StrategyRuntimeError('invalid_runtime')
+    lookback = runtime.get('lookback')
+    if lookback is not None and (
+        isinstance(lookback, bool) or not isinstance(lookback, int) or not 0 < lookback <= MAX_LOOKBACK
+    ):
+        raise StrategyRuntimeError('invalid_lookback', {"max": MAX_LOOKBACK})
 
     entrypoint = manifest.get('entrypoint') or {}
     if not entrypoint.get('path') or not entrypoint.get('callable'):
         raise StrategyRuntimeError('invalid_entrypoint')
 
+    interface = entrypoint.get('interface')
+    if interface is not None and interface not in (EVENT_INTERFACE, VECTOR_INTERFACE):
+        raise StrategyRuntimeError('invalid_entrypoint', {"reason": f"unsupported_interface:{interface}"})
+    output = entrypoint.get('output')
+    if output is not None and (interface != VECTOR_INTERFACE or output not in OUTPUTS):
+        raise StrategyRuntimeError('invalid_entrypoint', {"reason": f"unsupported_output:{output}"})
+
     entrypoint['path'] = normalize_zip_path(entrypoint.get('path'))
     manifest['entrypoint'] = entrypoint
     return manifest
 
+
+
+def manifest_lookback(manifest):
+    """Bars of history the strategy declared it needs (``runtime.lookback``), or None."""
+    return ((manifest or {}).get('runtime') or {}).get('lookback')
+
+
+def manifest_entrypoint_mode(manifest):
+    """``(interface, output)`` declared by the manifest entry point; None for unset fields."""
+    entrypoint = (manifest or {}).get('entrypoint') or {}
+    return entrypoint.get('interface'), entrypoint.get('output')
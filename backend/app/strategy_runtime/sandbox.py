@@ -1,10 +1,19 @@
 import ast
 import builtins
+import hashlib
 import multiprocessing
+import os
+import signal
+import threading
 import traceback
+from collections import OrderedDict
+from contextlib import contextmanager
 
 from .errors import StrategyRuntimeError
-from .events import StrategyContext, make_bar, normalize_order, resolve_fill_price
+from .events import StrategyContext, iter_frame_bars, normalize_order, resolve_fill_price
+from .shared_bars import open_payload_bars, share_bars
+from .vector import OUTPUT_TARGET, VECTOR_INTERFACE, orders_from_output, read_only_frame, simulate_fills
+from .worker_pool import get_worker_pool
 
 FORBIDDEN_IMPORTS = {
     'os',
@@ -37,7 +46,105 @@ FORBIDDEN_BUILTINS = {
 _REAL_IMPORT = builtins.__import__
 
 
+HOOK_NAMES = ('on_bar', 'on_order', 'on_trade', 'on_risk', 'on_timer')
+# Names through which a hook can be attached or resolved without a plain ``def`` in the class body.
+DYNAMIC_ASSIGN_NAMES = frozenset({'setattr', '__setattr__', '__dict__'})
+DYNAMIC_LOOKUP_METHODS = frozenset({'__getattr__', '__getattribute__'})
+DEFAULT_CODE_CACHE_SIZE = 128
+
+
+class CompiledStrategy:
+    """A source string that passed the guard, compiled once.
+
+    ``hooks`` maps each top-level class to the per-bar hooks it defines, or to None when that can't
+    be known from the source alone (base classes, decorators, ``__getattr__``, or hooks assigned at
+    runtime anywhere in the module).
+    """
+
+    def __init__(self, digest, code, hooks):
+        self.digest = digest
+        self.code = code
+        self.hooks = hooks
+
+    def hooks_for(self, callable_name):
+        if callable_name not in self.hooks:
+            return None
+        return self.hooks[callable_name]
+
+
+class _CodeCache:
+    """Bounded LRU of guard verdicts and code objects keyed by the source's sha256.
+
+    Rejected sources are remembered too, so a parameter sweep over a bad strategy fails fast.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def max_entries():
+        try:
+            return max(int(os.getenv('STRATEGY_CODE_CACHE_SIZE', DEFAULT_CODE_CACHE_SIZE)), 0)
+        except (TypeError, ValueError):
+            return DEFAULT_CODE_CACHE_SIZE
+
+    def get(self, digest):
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            return entry
+
+    def put(self, digest, entry):
+        limit = self.max_entries()
+        with self._lock:
+            if limit <= 0:
+                return
+            self._entries[digest] = entry
+            self._entries.move_to_end(digest)
+            while len(self._entries) > limit:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+_code_cache = _CodeCache()
+
+
+def compile_strategy_source(source):
+    """Guard and compile ``source``, reusing the verdict for sources seen before in this process."""
+    digest = hashlib.sha256(source.encode('utf-8')).hexdigest()
+    entry = _code_cache.get(digest)
+    if entry is None:
+        try:
+            entry = _compile_guarded(digest, source)
+        except StrategyRuntimeError as exc:
+            entry = (exc.message, exc.details)
+        _code_cache.put(digest, entry)
+    if isinstance(entry, tuple):
+        raise StrategyRuntimeError(entry[0], dict(entry[1]) if entry[1] else entry[1])
+    return entry
+
+
 def guard_strategy_source(source):
+    compile_strategy_source(source)
+
+
+def _compile_guarded(digest, source):
     try:
         tree = ast.parse(source)
     except SyntaxError:
@@ -57,6 +164,49 @@ def guard_strategy_source(source):
             if node.func.id in FORBIDDEN_BUILTINS:
                 raise StrategyRuntimeError('sandbox_rejected', {"reason": f"forbidden_builtin:{node.func.id}"})
 
+    try:
+        code = compile(tree, '<strategy>', 'exec')
+    except (SyntaxError, ValueError):
+        raise StrategyRuntimeError('strategy_load_error', {"reason": "syntax_error"})
+    return CompiledStrategy(digest, code, _declared_hooks(tree))
+
+
+def _declared_hooks(tree):
+    # Hooks attached at runtime anywhere in the module make every class's hook set unknowable.
+    dynamic = _assigns_hooks(tree)
+    hooks = {}
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            hooks[node.name] = ('on_bar',)
+        elif isinstance(node, ast.ClassDef):
+            methods = [item.name for item in node.body if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef))]
+            if dynamic or node.bases or node.decorator_list or set(methods) & DYNAMIC_LOOKUP_METHODS:
+                hooks[node.name] = None
+            else:
+                hooks[node.name] = tuple(name for name in methods if name in HOOK_NAMES)
+    return hooks
+
+
+def _assigns_hooks(tree):
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Attribute) and (
+            node.attr in DYNAMIC_ASSIGN_NAMES or (isinstance(node.ctx, ast.Store) and node.attr in HOOK_NAMES)
+        ):
+            return True
+        if isinstance(node, ast.Name) and (
+            node.id in DYNAMIC_ASSIGN_NAMES or (isinstance(node.ctx, ast.Store) and node.id in HOOK_NAMES)
+        ):
+            return True
+    return False
+
+
+def strategy_code_cache_stats():
+    return _code_cache.stats()
+
+
+def clear_strategy_code_cache():
+    _code_cache.clear()
+
 
 def _restricted_import(name, globals=None, locals=None, fromlist=(), level=0):
     root = (name or '').split('.')[0]
@@ -126,8 +276,9 @@ def _create_strategy(target, ctx):
     raise ValueError('entrypoint_not_callable')
 
 
-def _worker(payload, queue):
-    queue.put(_execute_payload(payload))
+def _worker(payload, conn):
+    conn.send(_execute_payload(payload))
+    conn.close()
 
 
 def _collect_orders(ctx, returned_orders):
@@ -143,51 +294,66 @@ def _collect_orders(ctx, returned_orders):
     return normalized_orders
 
 
-def _execute_payload(payload):
-    strategy = None
-    try:
-        safe_builtins = _build_safe_builtins()
-        namespace = {'__builtins__': safe_builtins, '__name__': '__strategy__'}
-        exec(payload['source'], namespace, namespace)
+def _load_target(source, callable_name):
+    compiled = compile_strategy_source(source)
+    safe_builtins = _build_safe_builtins()
+    namespace = {'__builtins__': safe_builtins, '__name__': '__strategy__'}
+    exec(compiled.code, namespace, namespace)
 
-        target = namespace.get(payload['callable_name'])
-        if target is None:
-            raise ValueError('entrypoint_not_found')
+    target = namespace.get(callable_name)
+    if target is None:
+        raise ValueError('entrypoint_not_found')
+    return target, compiled.hooks_for(callable_name)
 
-        ctx = StrategyContext(payload['symbol'], payload.get('params') or {})
+
+def _bind_hooks(strategy, declared):
+    # Resolved once per run instead of one getattr per hook per bar.
+    names = HOOK_NAMES if declared is None else declared
+    handlers = {}
+    for name in names:
+        handler = getattr(strategy, name, None)
+        if callable(handler):
+            handlers[name] = handler
+    return handlers
+
+
+def _run_target(target, symbol, params, frame, hooks=None, lookback=None):
+    strategy = None
+    try:
+        ctx = StrategyContext(symbol, params or {}, lookback=lookback)
         strategy = _create_strategy(target, ctx)
-        trades = []
 
         _invoke_optional(strategy, 'on_init', ctx)
+        trades = _run_bars(strategy, ctx, iter_frame_bars(symbol, frame), hooks)
+        _invoke_optional(strategy, 'on_finish', ctx, {"tradeCount": len(trades)})
+        return {"ok": True, "trades": trades, "logs": ctx.logs}
+    except Exception as exc:
+        if strategy is not None:
+            try:
+                _invoke_optional(strategy, 'on_error', None, {"error": str(exc)})
+            except Exception:
+                pass
+        return _error_result(exc)
 
-        bars = payload.get('bars') or []
-        for index, raw_bar in enumerate(bars):
-            bar = make_bar(payload['symbol'], raw_bar)
-            ctx.sync_bar(bar)
-            returned_orders = _invoke_optional(strategy, 'on_bar', ctx, bar)
-
-            orders = _collect_orders(ctx, returned_orders)
-            for order in orders:
-                order_event = dict(order)
-                order_event['price'] = resolve_fill_price(order_event, bar)
-                order_event['index'] = index
-                _invoke_optional(strategy, 'on_order', ctx, order_event)
-
-                trade = {
-                    "symbol": order_event['symbol'],
-                    "side": order_event['side'],
-                    "price": order_event['price'],
-                    "quantity": order_event['quantity'],
-                    "timestamp": bar.get('time'),
-                    "pnl": None,
-                }
-                ctx.apply_trade(trade)
-                trades.append(trade)
-                _invoke_optional(strategy, 'on_trade', ctx, trade)
-
-            _invoke_optional(strategy, 'on_risk', ctx, {"index": index, "tradeCount": len(trades)})
-            _invoke_optional(strategy, 'on_timer', ctx, {"index": index, "time": bar.get('time')})
 
+def _run_vector_target(target, symbol, params, frame, output=None):
+    strategy = None
+    try:
+        ctx = StrategyContext(symbol, params or {})
+        if isinstance(target, type):
+            strategy = _create_strategy(target, ctx)
+            handler = getattr(strategy, 'on_bars', None)
+        else:
+            handler = target
+        if not callable(handler):
+            raise ValueError('entrypoint_not_callable')
+
+        _invoke_optional(strategy, 'on_init', ctx)
+        bars = read_only_frame(frame)
+        orders = orders_from_output(handler(ctx, bars), len(bars), output or OUTPUT_TARGET)
+        trades = simulate_fills(ctx.symbol, bars, orders)
+        for trade in trades:
+            ctx.apply_trade(trade)
         _invoke_optional(strategy, 'on_finish', ctx, {"tradeCount": len(trades)})
         return {"ok": True, "trades": trades, "logs": ctx.logs}
     except Exception as exc:
@@ -196,62 +362,243 @@ def _execute_payload(payload):
                 _invoke_optional(strategy, 'on_error', None, {"error": str(exc)})
             except Exception:
                 pass
+        return _error_result(exc)
+
+
+def _run_payload_target(target, hooks, payload, params, frame):
+    if payload.get('interface') == VECTOR_INTERFACE:
+        return _run_vector_target(target, payload['symbol'], params, frame, payload.get('output'))
+    return _run_target(target, payload['symbol'], params, frame, hooks, payload.get('lookback'))
+
+
+def _error_result(exc):
+    return {
+        "ok": False,
+        "error_code": 'strategy_runtime_error',
+        "error": str(exc),
+        "traceback": traceback.format_exc(),
+    }
+
+
+def _execute_payload(payload):
+    if 'param_sets' in payload:
+        return _execute_batch_payload(payload)
+    try:
+        target, hooks = _load_target(payload['source'], payload['callable_name'])
+        with open_payload_bars(payload) as source:
+            return _run_payload_target(target, hooks, payload, payload.get('params'), source.frame)
+    except Exception as exc:
+        return _error_result(exc)
+
+
+class _SetTimeout(BaseException):
+    # A BaseException so neither the strategy's nor the runner's ``except Exception`` swallows it.
+    pass
+
+
+@contextmanager
+def _set_deadline(seconds):
+    """Interrupt the block after ``seconds``; a no-op without SIGALRM or off the main thread."""
+    if not seconds or not hasattr(signal, 'setitimer') or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def _expire(signum, frame):
+        raise _SetTimeout()
+
+    previous = signal.signal(signal.SIGALRM, _expire)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _run_batch_item(target, hooks, payload, params, frame):
+    seconds = payload.get('per_set_timeout_seconds')
+    try:
+        with _set_deadline(seconds):
+            return _run_payload_target(target, hooks, payload, params, frame)
+    except _SetTimeout:
         return {
             "ok": False,
-            "error_code": 'strategy_runtime_error',
-            "error": str(exc),
-            "traceback": traceback.format_exc(),
+            "error_code": 'strategy_timeout',
+            "error": f'parameter set exceeded {seconds} seconds',
+            "traceback": None,
         }
 
 
-def run_strategy_in_subprocess(symbol, source, callable_name, bars, params, timeout_seconds=10):
-    guard_strategy_source(source)
-
-    queue = multiprocessing.Queue()
-    process = multiprocessing.Process(
-        target=_worker,
-        args=({
-            "symbol": symbol,
-            "source": source,
-            "callable_name": callable_name,
-            "bars": bars,
-            "params": params,
-        }, queue),
-    )
+def _execute_batch_payload(payload):
+    # The source is exec'd once; every parameter set gets its own context, strategy instance and,
+    # when ``per_set_timeout_seconds`` is given, its own deadline.
+    try:
+        target, hooks = _load_target(payload['source'], payload['callable_name'])
+        with open_payload_bars(payload) as source:
+            results = [
+                _run_batch_item(target, hooks, payload, params, source.frame)
+                for params in payload['param_sets']
+            ]
+        return {"ok": True, "results": results}
+    except Exception as exc:
+        return _error_result(exc)
+
+
+def _run_bars(strategy, ctx, bars, hooks=None):
+    handlers = _bind_hooks(strategy, hooks)
+    on_bar = handlers.get('on_bar')
+    on_order = handlers.get('on_order')
+    on_trade = handlers.get('on_trade')
+    on_risk = handlers.get('on_risk')
+    on_timer = handlers.get('on_timer')
+
+    trades = []
+    for index, bar in enumerate(bars):
+        ctx.sync_bar(bar)
+        returned_orders = on_bar(ctx, bar) if on_bar is not None else None
+
+        orders = _collect_orders(ctx, returned_orders)
+        for order in orders:
+            order_event = dict(order)
+            order_event['price'] = resolve_fill_price(order_event, bar)
+            order_event['index'] = index
+            if on_order is not None:
+                on_order(ctx, order_event)
+
+            trade = {
+                "symbol": order_event['symbol'],
+                "side": order_event['side'],
+                "price": order_event['price'],
+                "quantity": order_event['quantity'],
+                "timestamp": bar.get('time'),
+                "pnl": None,
+            }
+            ctx.apply_trade(trade)
+            trades.append(trade)
+            if on_trade is not None:
+                on_trade(ctx, trade)
+
+        if on_risk is not None:
+            on_risk(ctx, {"index": index, "tradeCount": len(trades)})
+        if on_timer is not None:
+            on_timer(ctx, {"index": index, "time": bar.get('time')})
+    return trades
+
+
+def _run_in_fresh_process(payload, timeout_seconds):
+    parent_conn, child_conn = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=_worker, args=(payload, child_conn))
     process.start()
-    process.join(timeout_seconds)
+    child_conn.close()
 
-    if process.is_alive():
-        process.terminate()
-        process.join()
-        raise StrategyRuntimeError('strategy_timeout')
-
-    if queue.empty():
+    # Drain the pipe before joining: a child blocked on a large result would otherwise never exit.
+    try:
+        if not parent_conn.poll(timeout_seconds):
+            process.terminate()
+            process.join()
+            raise StrategyRuntimeError('strategy_timeout')
+        result = parent_conn.recv()
+    except (EOFError, OSError):
         raise StrategyRuntimeError('strategy_runtime_error', {"reason": "no_result"})
+    finally:
+        parent_conn.close()
+
+    process.join()
+    return result
 
-    result = queue.get()
+
+def _dispatch(payload, bars, timeout_seconds):
+    shared = share_bars(bars)
+    if shared is not None:
+        payload["bars"] = None
+        payload["bars_shm"] = shared.descriptor
+
+    try:
+        pool = get_worker_pool()
+        if pool is not None:
+            return pool.run(payload, timeout_seconds)
+        return _run_in_fresh_process(payload, timeout_seconds)
+    finally:
+        if shared is not None:
+            shared.close()
+
+
+def _raise_for_result(result):
     if not result.get('ok'):
         raise StrategyRuntimeError(result.get('error_code') or 'strategy_runtime_error', {
             "reason": result.get('error'),
         })
-
     return result
 
 
-def run_strategy_inline(symbol, source, callable_name, bars, params):
+def run_strategy_in_subprocess(
+    symbol, source, callable_name, bars, params, timeout_seconds=10, lookback=None, interface=None, output=None,
+):
     guard_strategy_source(source)
 
-    result = _execute_payload({
+    payload = {
         "symbol": symbol,
         "source": source,
         "callable_name": callable_name,
         "bars": bars,
         "params": params,
-    })
-    if not result.get('ok'):
-        raise StrategyRuntimeError(result.get('error_code') or 'strategy_runtime_error', {
-            "reason": result.get('error'),
-        })
+        "lookback": lookback,
+        "interface": interface,
+        "output": output,
+    }
+    return _raise_for_result(_dispatch(payload, bars, timeout_seconds))
 
-    return result
 
+def run_strategy_inline(
+    symbol, source, callable_name, bars, params, lookback=None, interface=None, output=None,
+):
+    guard_strategy_source(source)
+
+    return _raise_for_result(_execute_payload({
+        "symbol": symbol,
+        "source": source,
+        "callable_name": callable_name,
+        "bars": bars,
+        "params": params,
+        "lookback": lookback,
+        "interface": interface,
+        "output": output,
+    }))
+
+
+def run_strategy_batch_in_subprocess(
+    symbol, source, callable_name, bars, param_sets, timeout_seconds=10, lookback=None, interface=None, output=None,
+    per_set_timeout_seconds=None,
+):
+    """``timeout_seconds`` bounds the whole session; a set past ``per_set_timeout_seconds`` fails alone."""
+    guard_strategy_source(source)
+
+    payload = {
+        "symbol": symbol,
+        "source": source,
+        "callable_name": callable_name,
+        "bars": bars,
+        "param_sets": list(param_sets),
+        "lookback": lookback,
+        "interface": interface,
+        "output": output,
+        "per_set_timeout_seconds": per_set_timeout_seconds,
+    }
+    return _raise_for_result(_dispatch(payload, bars, timeout_seconds))['results']
+
+
+def run_strategy_batch_inline(
+    symbol, source, callable_name, bars, param_sets, lookback=None, interface=None, output=None,
+):
+    guard_strategy_source(source)
+
+    return _raise_for_result(_execute_payload({
+        "symbol": symbol,
+        "source": source,
+        "callable_name": callable_name,
+        "bars": bars,
+        "param_sets": list(param_sets),
+        "lookback": lookback,
+        "interface": interface,
+        "output": output,
+    }))['results']
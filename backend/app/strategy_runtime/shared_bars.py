@@ -0,0 +1,120 @@
+import os
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from ..backtest.frame import BAR_FIELDS, BarFrame
+
+
+DEFAULT_MIN_SHARED_BARS = 2048
+_ITEM_SIZE = 8
+
+
+def min_shared_bars():
+    try:
+        return int(os.getenv('BACKTEST_SANDBOX_SHM_MIN_BARS', DEFAULT_MIN_SHARED_BARS))
+    except (TypeError, ValueError):
+        return DEFAULT_MIN_SHARED_BARS
+
+
+def _column_views(buffer, length):
+    views = {}
+    for position, name in enumerate(BAR_FIELDS):
+        dtype = np.int64 if name == 'time' else np.float64
+        views[name] = np.ndarray((length,), dtype=dtype, buffer=buffer, offset=position * length * _ITEM_SIZE)
+    return views
+
+
+class SharedBars:
+    """Owner side of a bar block: the six BarFrame columns laid out back to back in one segment."""
+
+    def __init__(self, frame):
+        self.length = len(frame)
+        self._shm = SharedMemory(create=True, size=max(self.length * len(BAR_FIELDS) * _ITEM_SIZE, 1))
+        views = _column_views(self._shm.buf, self.length)
+        for name in BAR_FIELDS:
+            views[name][:] = getattr(frame, name)
+        del views
+
+    @property
+    def descriptor(self):
+        return {"name": self._shm.name, "length": self.length}
+
+    def close(self):
+        if self._shm is None:
+            return
+        self._shm.close()
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+        self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class AttachedBars:
+    """Reader side: a BarFrame whose columns are views straight into the shared segment."""
+
+    def __init__(self, descriptor):
+        self._shm = _attach(descriptor['name'])
+        self.frame = BarFrame(**_column_views(self._shm.buf, int(descriptor['length'])))
+
+    def close(self):
+        # Views must be released before the mapping can be closed.
+        self.frame = None
+        if self._shm is not None:
+            self._shm.close()
+            self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class _LocalBars:
+    def __init__(self, bars):
+        self.frame = BarFrame.coerce(bars)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.frame = None
+
+
+def _attach(name):
+    try:
+        return SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+    # Before 3.13 attaching also registers the segment with the resource tracker, which would unlink
+    # it (or complain about a leak) when this reader exits. Only the owner may unlink, so skip it.
+    register = resource_tracker.register
+    resource_tracker.register = lambda *args, **kwargs: None
+    try:
+        return SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+def share_bars(bars):
+    """Return a SharedBars block for large inputs, or None when pickling them is cheaper."""
+    frame = BarFrame.coerce(bars)
+    if not len(frame) or len(frame) < min_shared_bars():
+        return None
+    return SharedBars(frame)
+
+
+def open_payload_bars(payload):
+    descriptor = payload.get('bars_shm')
+    if descriptor:
+        return AttachedBars(descriptor)
+    return _LocalBars(payload.get('bars'))
@@ -0,0 +1,62 @@
+"""Vectorized strategies: ``on_bars(ctx, frame)`` over whole columns instead of ``on_bar`` per bar.
+
+A ``vector_v1`` entry point receives every bar at once as a read-only BarFrame and returns one
+value per bar. With ``output: "target"`` (the default) the value is the position to hold after that
+bar; with ``output: "signal"`` it is the signed quantity to trade on that bar. Either way the
+orders are filled like event-driven market orders: at the bar's close, timestamped with the bar.
+"""
+
+import numpy as np
+
+from ..backtest.frame import BAR_FIELDS, BarFrame
+
+
+EVENT_INTERFACE = 'event_v1'
+VECTOR_INTERFACE = 'vector_v1'
+OUTPUT_TARGET = 'target'
+OUTPUT_SIGNAL = 'signal'
+OUTPUTS = (OUTPUT_TARGET, OUTPUT_SIGNAL)
+
+
+def read_only_frame(frame):
+    # Copied so the strategy can neither mutate nor outlive the (possibly shared-memory) source.
+    copy = BarFrame(*(np.array(getattr(frame, name)) for name in BAR_FIELDS))
+    for name in BAR_FIELDS:
+        getattr(copy, name).flags.writeable = False
+    return copy
+
+
+def orders_from_output(values, length, output=OUTPUT_TARGET):
+    """Signed order quantity per bar for an ``on_bars`` result."""
+    if output not in OUTPUTS:
+        raise ValueError(f'unknown on_bars output: {output}')
+    try:
+        values = np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        raise ValueError('on_bars must return one number per bar')
+    if values.ndim != 1 or values.shape[0] != length:
+        raise ValueError(f'on_bars must return {length} values, got shape {values.shape}')
+    if not np.isfinite(values).all():
+        raise ValueError('on_bars returned NaN or infinite values')
+    if output == OUTPUT_SIGNAL:
+        return values
+    return np.diff(values, prepend=0.0)
+
+
+def simulate_fills(symbol, frame, orders):
+    """Trades for per-bar signed order quantities, matching the event-driven market fills."""
+    indices = np.flatnonzero(orders)
+    quantities = orders[indices]
+    return [
+        {
+            "symbol": symbol,
+            "side": 'buy' if quantity > 0 else 'sell',
+            "price": price,
+            "quantity": abs(quantity),
+            "timestamp": timestamp,
+            "pnl": None,
+        }
+        for quantity, price, timestamp in zip(
+            quantities.tolist(), frame.close[indices].tolist(), frame.time[indices].tolist(),
+        )
+    ]
@@ -0,0 +1,285 @@
+import importlib
+import multiprocessing
+import os
+import pickle
+import signal
+import sys
+import threading
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+from .errors import StrategyRuntimeError
+
+
+DEFAULT_POOL_SIZE = 2
+DEFAULT_MAX_RUNS_PER_WORKER = 50
+DEFAULT_MAX_RSS_MB = 512
+PRELOAD_MODULES = (
+    'numpy',
+    'pandas',
+    'qysp',
+    'qysp.indicators',
+    'app.strategy_runtime.events',
+)
+
+
+def _env_int(name, default):
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _maxrss_mb(usage):
+    # ru_maxrss is reported in bytes on macOS and kilobytes elsewhere.
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return usage.ru_maxrss / divisor
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return 0.0
+    return _maxrss_mb(resource.getrusage(resource.RUSAGE_SELF))
+
+
+# Workers fork a fresh child per job so nothing a strategy patches (numpy, qysp, ...) survives into
+# the next tenant's job. Without fork every worker is retired after a single job instead.
+CAN_FORK = hasattr(os, 'fork')
+_active_child = None
+
+
+def _terminate(signum, frame):
+    if _active_child is not None:
+        try:
+            os.kill(_active_child, signal.SIGKILL)
+        except OSError:
+            pass
+    os._exit(1)
+
+
+def _run_forked(execute, payload):
+    """Run ``execute(payload)`` in a forked child; return its result and the child's peak RSS in MB."""
+    global _active_child
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        status = 0
+        try:
+            with os.fdopen(write_fd, 'wb') as handle:
+                pickle.dump(execute(payload), handle)
+        except BaseException:
+            status = 1
+        finally:
+            os._exit(status)
+
+    _active_child = pid
+    os.close(write_fd)
+    try:
+        with os.fdopen(read_fd, 'rb') as handle:
+            data = handle.read()
+    finally:
+        _, _, usage = os.wait4(pid, 0)
+        _active_child = None
+    rss_mb = _maxrss_mb(usage)
+    if not data:
+        return {"ok": False, "error_code": 'strategy_runtime_error', "error": 'no_result', "traceback": None}, rss_mb
+    return pickle.loads(data), rss_mb
+
+
+def _worker_main(conn, preload):
+    for name in preload:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            continue
+
+    from .sandbox import _execute_payload, compile_strategy_source
+
+    if CAN_FORK:
+        signal.signal(signal.SIGTERM, _terminate)
+
+    while True:
+        try:
+            payload = conn.recv()
+        except (EOFError, OSError):
+            break
+        if payload is None:
+            break
+        if not CAN_FORK:
+            conn.send((_execute_payload(payload), _peak_rss_mb()))
+            continue
+        # Compiled here so the code cache outlives the per-job child.
+        try:
+            compile_strategy_source(payload['source'])
+        except StrategyRuntimeError:
+            pass
+        result, job_rss_mb = _run_forked(_execute_payload, payload)
+        # RUSAGE_SELF never sees the job's child, so its peak is measured on exit and counted
+        # toward the worker's own (which grows with e.g. the code cache) for the RSS limit.
+        conn.send((result, max(job_rss_mb, _peak_rss_mb())))
+    conn.close()
+
+
+class _Worker:
+    def __init__(self, context, preload):
+        parent_conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, preload), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+        self.runs = 0
+        self.rss_mb = 0.0
+
+    def is_alive(self):
+        return self.process.is_alive()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(1)
+        self.kill()
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join()
+        self.conn.close()
+
+
+class SandboxWorkerPool:
+    def __init__(self, size=None, max_runs=None, max_rss_mb=None, preload=PRELOAD_MODULES, context=None):
+        self.size = max(int(size if size is not None else DEFAULT_POOL_SIZE), 1)
+        self.max_runs = max(int(max_runs if max_runs is not None else DEFAULT_MAX_RUNS_PER_WORKER), 1)
+        if not CAN_FORK:
+            self.max_runs = 1
+        self.max_rss_mb = float(max_rss_mb if max_rss_mb is not None else DEFAULT_MAX_RSS_MB)
+        self.preload = tuple(preload or ())
+        self._context = context or multiprocessing.get_context()
+        self._idle = []
+        self._busy = 0
+        self._condition = threading.Condition()
+        self._closed = False
+
+    def warm(self):
+        with self._condition:
+            missing = self.size - len(self._idle) - self._busy
+            for _ in range(max(missing, 0)):
+                self._idle.append(_Worker(self._context, self.preload))
+
+    def run(self, payload, timeout_seconds):
+        worker = self._acquire()
+        try:
+            worker.conn.send(payload)
+            if not worker.conn.poll(timeout_seconds):
+                self._discard(worker)
+                raise StrategyRuntimeError('strategy_timeout')
+            result, rss_mb = worker.conn.recv()
+        except StrategyRuntimeError:
+            raise
+        except (EOFError, OSError):
+            self._discard(worker)
+            raise StrategyRuntimeError('strategy_runtime_error', {"reason": "no_result"})
+        except BaseException:
+            self._discard(worker)
+            raise
+
+        worker.runs += 1
+        worker.rss_mb = rss_mb
+        self._release(worker)
+        return result
+
+    def shutdown(self):
+        with self._condition:
+            self._closed = True
+            workers, self._idle = self._idle, []
+            self._condition.notify_all()
+        for worker in workers:
+            worker.stop()
+
+    def stats(self):
+        with self._condition:
+            return {
+                "size": self.size,
+                "idle": len(self._idle),
+                "busy": self._busy,
+                "runs": [worker.runs for worker in self._idle],
+            }
+
+    def _acquire(self):
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise StrategyRuntimeError('sandbox_unavailable', {"reason": "worker_pool_closed"})
+                while self._idle:
+                    worker = self._idle.pop()
+                    if worker.is_alive():
+                        self._busy += 1
+                        return worker
+                    worker.kill()
+                if self._busy < self.size:
+                    self._busy += 1
+                    break
+                self._condition.wait()
+
+        try:
+            return _Worker(self._context, self.preload)
+        except BaseException:
+            with self._condition:
+                self._busy -= 1
+                self._condition.notify()
+            raise
+
+    def _release(self, worker):
+        recycle = worker.runs >= self.max_runs or (self.max_rss_mb > 0 and worker.rss_mb > self.max_rss_mb)
+        with self._condition:
+            self._busy -= 1
+            if not recycle and not self._closed:
+                self._idle.append(worker)
+                self._condition.notify()
+                return
+            self._condition.notify()
+        worker.stop()
+
+    def _discard(self, worker):
+        worker.kill()
+        with self._condition:
+            self._busy -= 1
+            self._condition.notify()
+
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def get_worker_pool():
+    global _pool, _pool_pid
+    size = _env_int('BACKTEST_SANDBOX_POOL_SIZE', DEFAULT_POOL_SIZE)
+    if size <= 0:
+        return None
+    with _pool_lock:
+        # A forked parent (e.g. a preloading web server) must not share worker pipes with its children.
+        if _pool is None or _pool_pid != os.getpid():
+            _pool_pid = os.getpid()
+            _pool = SandboxWorkerPool(
+                size=size,
+                max_runs=_env_int('BACKTEST_SANDBOX_WORKER_MAX_RUNS', DEFAULT_MAX_RUNS_PER_WORKER),
+                max_rss_mb=_env_int('BACKTEST_SANDBOX_WORKER_MAX_RSS_MB', DEFAULT_MAX_RSS_MB),
+            )
+            _pool.warm()
+        return _pool
+
+
+def shutdown_worker_pool():
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None and _pool_pid == os.getpid():
+        pool.shutdown()
@@ -3,11 +3,19 @@ import json
 from celery.exceptions import SoftTimeLimitExceeded
 from flask import has_app_context
 
-from ..backtest.engine import run_backtest
+from ..backtest.bar_store import get_bar_store
+from ..backtest.engine import fetch_backtest_bars, run_backtest, serialize_backtest_result
 from ..celery_app import celery_app
 from ..extensions import db
 from ..models import BacktestJob, BacktestJobStatus
 from ..quota import consume_backtest_quota, release_backtest_quota, reserve_backtest_quota
+from ..services.backtest_cache import (
+    build_result_cache_key,
+    restore_cached_result,
+    resolve_strategy_identity,
+    result_cache_enabled,
+    store_cached_result,
+)
 from ..services.error_parser import dump_execution_error
 from ..services.metrics import build_backtest_report
 from ..strategy_runtime import StrategyRuntimeError
@@ -40,19 +48,39 @@ def _run_job(job_id):
     job.error_message = None
     db.session.commit()
 
+    storage_key = build_backtest_storage_key(job.id)
+    limit = params.get('limit') if params.get('start_time') is None else None
+    cache_key = cached = None
     try:
-        result = run_backtest(
-            params.get('symbol'),
-            interval=params.get('interval'),
-            limit=params.get('limit') if params.get('start_time') is None else None,
-            start_time=params.get('start_time'),
-            end_time=params.get('end_time'),
-            strategy_id=params.get('strategy_id'),
-            strategy_version=params.get('strategy_version'),
-            strategy_params=params.get('strategy_params'),
-            data_source=params.get('data_source'),
-            user_id=job.user_id,
-        )
+        bars = data_range_notice = None
+        identity = resolve_strategy_identity(params, job.user_id) if result_cache_enabled(params) else None
+        if identity is not None:
+            bars, data_range_notice = fetch_backtest_bars(
+                params.get('symbol'),
+                interval=params.get('interval'),
+                limit=limit,
+                start_time=params.get('start_time'),
+                end_time=params.get('end_time'),
+                data_source=params.get('data_source'),
+            )
+            cache_key = build_result_cache_key(identity, params, bars)
+            cached = restore_cached_result(cache_key, storage_key)
+
+        if cached is None:
+            result = run_backtest(
+                params.get('symbol'),
+                interval=params.get('interval'),
+                limit=limit,
+                start_time=params.get('start_time'),
+                end_time=params.get('end_time'),
+                strategy_id=params.get('strategy_id'),
+                strategy_version=params.get('strategy_version'),
+                strategy_params=params.get('strategy_params'),
+                data_source=params.get('data_source'),
+                user_id=job.user_id,
+                bars=bars,
+                data_range_notice=data_range_notice,
+            )
     except SoftTimeLimitExceeded:
         job.status = BacktestJobStatus.TIMEOUT.value
         job.error_message = 'soft_time_limit_exceeded'
@@ -80,6 +108,9 @@ def _run_job(job_id):
         db.session.commit()
         return {"status": job.status}
 
+    if cached is not None:
+        return _complete_job(job, params, storage_key, cached["summary"], cached)
+
     try:
         if result.get('kline') or result.get('trades'):
             report = build_backtest_report(result.get('kline') or [], result.get('trades') or [])
@@ -89,9 +120,9 @@ def _run_job(job_id):
                 "equity_curve": [],
                 "trades": result.get('trades') or [],
             }
-        storage_key = build_backtest_storage_key(job.id)
         write_json(f"{storage_key}/equity_curve.json", report["equity_curve"])
         write_json(f"{storage_key}/trades.json", report["trades"])
+        result = serialize_backtest_result(result)
         write_json(f"{storage_key}/kline.json", result.get('kline') or [])
     except Exception as exc:
         job.status = BacktestJobStatus.FAILED.value
@@ -101,10 +132,20 @@ def _run_job(job_id):
         db.session.commit()
         return {"status": job.status}
 
+    if cache_key is not None:
+        store_cached_result(cache_key, storage_key, result, report)
+
+    result["summary"] = report["result_summary"]
+    result["equity_curve"] = report["equity_curve"]
+    result["trades"] = report["trades"]
+    return _complete_job(job, params, storage_key, report["result_summary"], result)
+
+
+def _complete_job(job, params, storage_key, result_summary, result):
     consume_backtest_quota(job.id)
     job.status = BacktestJobStatus.COMPLETED.value
     job.result_storage_key = storage_key
-    job.result_summary = report["result_summary"]
+    job.result_summary = result_summary
     job.completed_at = now_utc()
     db.session.commit()
 
@@ -112,10 +153,6 @@ def _run_job(job_id):
         from .report_generation import generate_backtest_report
 
         generate_backtest_report.delay(job.id, job.user_id, locale=params.get("locale", "en"))
-
-    result["summary"] = report["result_summary"]
-    result["equity_curve"] = report["equity_curve"]
-    result["trades"] = report["trades"]
     return result
 
 
@@ -129,3 +166,26 @@ def run_backtest_task(self, job_id):
     app = create_app()
     with app.app_context():
         return _run_job(job_id)
+
+
+@celery_app.task(bind=True, name='app.tasks.backtests.run_backtest_batch_task')
+def run_backtest_batch_task(self, param_sets, backtest_kwargs):
+    from ..services.optimizer_evaluators import evaluate_batch, to_task_payload
+
+    if has_app_context():
+        return [to_task_payload(item) for item in evaluate_batch(param_sets, backtest_kwargs)]
+
+    from .. import create_app
+
+    app = create_app()
+    with app.app_context():
+        return [to_task_payload(item) for item in evaluate_batch(param_sets, backtest_kwargs)]
+
+
+@celery_app.task(name='app.tasks.backtests.compact_bar_store_task')
+def compact_bar_store_task():
+    store = get_bar_store()
+    if store is None:
+        return {"series": 0, "bars": 0}
+    compacted = store.compact_all()
+    return {"series": len(compacted), "bars": sum(compacted.values())}
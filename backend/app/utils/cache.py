@@ -1,8 +1,13 @@
-import json
 import logging
 import os
 import threading
 import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+from .cache_codec import decode_payload, encode_payload, payload_size
 
 try:
     import redis
@@ -13,6 +18,170 @@ except Exception:  # pragma: no cover - fallback when redis isn't installed
 logger = logging.getLogger(__name__)
 
 
+DEFAULT_LOCAL_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_LOCAL_TTL_SECONDS = 10
+
+
+def _namespace(key):
+    return str(key).split(':', 1)[0]
+
+
+def _parse_namespace_budgets(raw):
+    """``binance=33554432,sinagold=8388608`` -> {'binance': 33554432, 'sinagold': 8388608}."""
+    budgets = {}
+    for item in (raw or '').split(','):
+        name, _, size = item.partition('=')
+        try:
+            budgets[name.strip()] = int(size)
+        except ValueError:
+            continue
+    return budgets
+
+
+class LRUStore:
+    """Byte-bounded LRU map with per-entry TTL, per-namespace budgets and counters.
+
+    The namespace of a key is its prefix up to the first ``:``. Each namespace is evicted in LRU
+    order once it exceeds its own budget (when one is configured) and, when the store as a whole
+    exceeds ``max_bytes``, the namespace using the most bytes gives up its oldest entries first.
+    Entry sizes are supplied by the caller, normally the length of the JSON payload.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_LOCAL_MAX_BYTES, namespace_budgets=None, clock=time.time):
+        self.max_bytes = int(max_bytes)
+        self.namespace_budgets = dict(namespace_budgets or {})
+        self._clock = clock
+        self._entries = {}
+        self._usage = {}
+        self._counters = {}
+        self._total = 0
+        self._lock = threading.Lock()
+
+    def _count(self, namespace, name, amount=1):
+        counters = self._counters.setdefault(
+            namespace, {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0}
+        )
+        counters[name] += amount
+
+    def get(self, key, default=None):
+        namespace = _namespace(key)
+        with self._lock:
+            entries = self._entries.get(namespace)
+            item = entries.get(key) if entries else None
+            if item is None:
+                self._count(namespace, 'misses')
+                return default
+            value, expires_at, _ = item
+            if expires_at is not None and expires_at <= self._clock():
+                self._remove(namespace, key)
+                self._count(namespace, 'expirations')
+                self._count(namespace, 'misses')
+                return default
+            entries.move_to_end(key)
+            self._count(namespace, 'hits')
+            return value
+
+    def set(self, key, value, size, ttl=None):
+        namespace = _namespace(key)
+        size = max(int(size), 1)
+        budget = min(self.namespace_budgets.get(namespace, self.max_bytes), self.max_bytes)
+        with self._lock:
+            self._remove(namespace, key)
+            if size > budget:
+                return False
+            expires_at = self._clock() + ttl if ttl else None
+            self._entries.setdefault(namespace, OrderedDict())[key] = (value, expires_at, size)
+            self._usage[namespace] = self._usage.get(namespace, 0) + size
+            self._total += size
+            while self._usage[namespace] > budget:
+                self._evict(namespace)
+            while self._total > self.max_bytes:
+                self._evict(max(self._usage, key=self._usage.get))
+            return True
+
+    def add(self, key, value, size, ttl):
+        """Store ``key`` only if it is absent or expired; returns whether it was stored."""
+        namespace = _namespace(key)
+        with self._lock:
+            entries = self._entries.get(namespace)
+            item = entries.get(key) if entries else None
+            if item is not None and (item[1] is None or item[1] > self._clock()):
+                return False
+        return self.set(key, value, size, ttl=ttl)
+
+    def touch(self, key, ttl, expected=None):
+        """Expire a live ``key`` ``ttl`` seconds from now (only while it holds ``expected``, when given)."""
+        namespace = _namespace(key)
+        with self._lock:
+            entries = self._entries.get(namespace)
+            item = entries.get(key) if entries else None
+            if item is None or (item[1] is not None and item[1] <= self._clock()):
+                return False
+            if expected is not None and item[0] != expected:
+                return False
+            entries[key] = (item[0], self._clock() + ttl, item[2])
+            return True
+
+    def pop(self, key, expected=None):
+        """Remove ``key`` (only while it holds ``expected``, when given)."""
+        namespace = _namespace(key)
+        with self._lock:
+            entries = self._entries.get(namespace)
+            item = entries.get(key) if entries else None
+            if item is None or (expected is not None and item[0] != expected):
+                return False
+            self._remove(namespace, key)
+            return True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._usage.clear()
+            self._total = 0
+
+    def stats(self):
+        with self._lock:
+            namespaces = {}
+            for namespace in set(self._counters) | set(self._entries):
+                counters = dict(self._counters.get(namespace, {}))
+                counters['entries'] = len(self._entries.get(namespace, ()))
+                counters['bytes'] = self._usage.get(namespace, 0)
+                counters['budget'] = self.namespace_budgets.get(namespace)
+                namespaces[namespace] = counters
+            return {'bytes': self._total, 'max_bytes': self.max_bytes, 'namespaces': namespaces}
+
+    def _remove(self, namespace, key):
+        entries = self._entries.get(namespace)
+        if not entries or key not in entries:
+            return
+        _, _, size = entries.pop(key)
+        self._usage[namespace] -= size
+        self._total -= size
+        if not entries:
+            del self._entries[namespace]
+            del self._usage[namespace]
+
+    def _evict(self, namespace):
+        entries = self._entries[namespace]
+        now = self._clock()
+        expired = [key for key, item in entries.items() if item[1] is not None and item[1] <= now]
+        if expired:
+            for key in expired:
+                self._remove(namespace, key)
+            self._count(namespace, 'expirations', len(expired))
+            return
+        self._remove(namespace, next(iter(entries)))
+        self._count(namespace, 'evictions')
+
+
+def _local_store_from_env():
+    try:
+        max_bytes = int(os.getenv('CACHE_LOCAL_MAX_BYTES', DEFAULT_LOCAL_MAX_BYTES))
+    except (TypeError, ValueError):
+        max_bytes = DEFAULT_LOCAL_MAX_BYTES
+    return LRUStore(max_bytes, _parse_namespace_budgets(os.getenv('CACHE_LOCAL_NAMESPACE_BYTES')))
+
+
 class CacheBackend:
     def get(self, key):
         raise NotImplementedError
@@ -20,31 +189,69 @@ class CacheBackend:
     def set(self, key, value, ttl=None):
         raise NotImplementedError
 
+    def delete(self, key):
+        raise NotImplementedError
+
+    def acquire_lock(self, key, token, ttl):
+        """Set ``key`` to ``token`` for ``ttl`` seconds unless it is already held."""
+        raise NotImplementedError
+
+    def extend_lock(self, key, token, ttl):
+        """Reset ``key``'s expiry to ``ttl`` seconds if it still holds ``token``; return whether it did."""
+        raise NotImplementedError
+
+    def release_lock(self, key, token):
+        """Drop ``key`` if it still holds ``token`` (an expired lock may belong to someone else by now)."""
+        raise NotImplementedError
+
+    def get_json(self, key):
+        return decode_payload(self.get(key))
+
+    def set_json(self, key, value, ttl=None):
+        self.set(key, encode_payload(value), ttl=ttl)
+
+    def stats(self):
+        return {}
+
 
 class MemoryCache(CacheBackend):
-    def __init__(self):
-        self._store = {}
-        self._lock = threading.Lock()
+    """Process-local fallback backend: JSON payloads in a bounded ``LRUStore``."""
+
+    def __init__(self, store=None):
+        self._store = store if store is not None else _local_store_from_env()
 
     def get(self, key):
-        now = time.time()
-        with self._lock:
-            item = self._store.get(key)
-            if not item:
-                return None
-            value, expires_at = item
-            if expires_at is not None and expires_at <= now:
-                del self._store[key]
-                return None
-            return value
+        return self._store.get(key)
 
     def set(self, key, value, ttl=None):
-        expires_at = time.time() + ttl if ttl else None
-        with self._lock:
-            self._store[key] = (value, expires_at)
+        self._store.set(key, value, payload_size(value) if isinstance(value, (str, bytes)) else 1, ttl=ttl)
+
+    def delete(self, key):
+        self._store.pop(key)
+
+    def acquire_lock(self, key, token, ttl):
+        return self._store.add(key, token, len(token), ttl)
+
+    def extend_lock(self, key, token, ttl):
+        return self._store.touch(key, ttl, expected=token)
+
+    def release_lock(self, key, token):
+        self._store.pop(key, expected=token)
+
+    def stats(self):
+        return {'local': self._store.stats()}
 
 
 class RedisCache(CacheBackend):
+    _RELEASE_SCRIPT = (
+        "if redis.call('get', KEYS[1]) == ARGV[1] then "
+        "return redis.call('del', KEYS[1]) else return 0 end"
+    )
+    _EXTEND_SCRIPT = (
+        "if redis.call('get', KEYS[1]) == ARGV[1] then "
+        "return redis.call('pexpire', KEYS[1], ARGV[2]) else return 0 end"
+    )
+
     def __init__(self, client):
         self.client = client
 
@@ -57,19 +264,105 @@ class RedisCache(CacheBackend):
         else:
             self.client.set(key, value)
 
+    def delete(self, key):
+        self.client.delete(key)
+
+    def acquire_lock(self, key, token, ttl):
+        return bool(self.client.set(key, token, nx=True, px=max(int(ttl * 1000), 1)))
+
+    def extend_lock(self, key, token, ttl):
+        return bool(self.client.eval(self._EXTEND_SCRIPT, 1, key, token, max(int(ttl * 1000), 1)))
+
+    def release_lock(self, key, token):
+        self.client.eval(self._RELEASE_SCRIPT, 1, key, token)
+
+
+class TieredCache(CacheBackend):
+    """Decoded JSON values held in a bounded in-process ``LRUStore`` in front of a shared backend.
+
+    A local hit skips both the network round-trip and decoding, so values returned by
+    ``get_json`` are shared between callers and must not be mutated. Local copies live at most
+    ``local_ttl`` seconds, which bounds how stale a value overwritten by another process can be.
+    Raw ``get``/``set`` and locks always go to the shared backend.
+    """
+
+    def __init__(self, remote, local=None, local_ttl=DEFAULT_LOCAL_TTL_SECONDS):
+        self.remote = remote
+        self.local = local if local is not None else _local_store_from_env()
+        self.local_ttl = local_ttl
+        self._remote_hits = 0
+        self._remote_misses = 0
+
+    def get(self, key):
+        return self.remote.get(key)
+
+    def set(self, key, value, ttl=None):
+        self.local.pop(key)
+        self.remote.set(key, value, ttl=ttl)
+
+    def delete(self, key):
+        self.local.pop(key)
+        self.remote.delete(key)
+
+    def acquire_lock(self, key, token, ttl):
+        return self.remote.acquire_lock(key, token, ttl)
+
+    def extend_lock(self, key, token, ttl):
+        return self.remote.extend_lock(key, token, ttl)
+
+    def release_lock(self, key, token):
+        self.remote.release_lock(key, token)
+
+    def get_json(self, key):
+        missing = object()
+        value = self.local.get(key, missing)
+        if value is not missing:
+            return value
+        raw = self.remote.get(key)
+        if raw is None:
+            self._remote_misses += 1
+            return None
+        self._remote_hits += 1
+        value = decode_payload(raw)
+        if value is not None:
+            self.local.set(key, value, payload_size(raw), ttl=self.local_ttl)
+        return value
+
+    def set_json(self, key, value, ttl=None):
+        payload = encode_payload(value)
+        self.remote.set(key, payload, ttl=ttl)
+        local_ttl = min(ttl, self.local_ttl) if ttl else self.local_ttl
+        self.local.set(key, value, payload_size(payload), ttl=local_ttl)
+
+    def stats(self):
+        return {
+            'local': self.local.stats(),
+            'remote': {'hits': self._remote_hits, 'misses': self._remote_misses},
+        }
+
 
 _cache_instance = None
 _cache_lock = threading.Lock()
 
 
+def _local_ttl_from_env():
+    try:
+        return max(float(os.getenv('CACHE_LOCAL_TTL_SECONDS', DEFAULT_LOCAL_TTL_SECONDS)), 0.0)
+    except (TypeError, ValueError):
+        return DEFAULT_LOCAL_TTL_SECONDS
+
+
 def _build_cache():
     url = os.getenv('REDIS_URL')
     if url and redis is not None:
         try:
-            client = redis.Redis.from_url(url, decode_responses=True)
+            # Raw bytes: large values are stored as binary frames (see cache_codec).
+            client = redis.Redis.from_url(url, decode_responses=False)
             client.ping()
             logger.info("Cache backend: redis")
-            return RedisCache(client)
+            remote = RedisCache(client)
+            local_ttl = _local_ttl_from_env()
+            return TieredCache(remote, local_ttl=local_ttl) if local_ttl else remote
         except Exception:  # pragma: no cover - depends on runtime env
             logger.warning("Redis unavailable, falling back to memory cache")
     return MemoryCache()
@@ -85,19 +378,121 @@ def get_cache():
 
 
 def cache_get_json(key):
-    value = get_cache().get(key)
-    if value is None:
-        return None
-    if isinstance(value, (bytes, bytearray)):
-        value = value.decode()
-    if isinstance(value, str):
-        try:
-            return json.loads(value)
-        except json.JSONDecodeError:
-            return None
-    return value
+    return get_cache().get_json(key)
 
 
 def cache_set_json(key, value, ttl=None):
-    payload = json.dumps(value, ensure_ascii=True, separators=(',', ':'), default=str)
-    get_cache().set(key, payload, ttl=ttl)
+    get_cache().set_json(key, value, ttl=ttl)
+
+
+def cache_stats():
+    """Hit/miss/eviction counters and byte usage per namespace for the active backend."""
+    return get_cache().stats()
+
+
+_SINGLE_FLIGHT_POLL_SECONDS = 0.05
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def _env_seconds(name, default):
+    try:
+        return max(float(os.getenv(name, default)), 0.0)
+    except (TypeError, ValueError):
+        return float(default)
+
+
+def single_flight(key, load, probe=None, lock_ttl=None):
+    """Run ``load()`` once for every concurrent caller of ``key`` and hand them all its result.
+
+    Callers in the same process share one in-flight future. Across processes the caller that wins
+    a lock on the shared cache runs ``load``; the others poll ``probe()`` until it returns
+    something other than None (normally the value ``load`` just cached). The holder renews the
+    lock every ``lock_ttl / 3`` seconds for as long as ``load`` runs, however long the fetch takes,
+    so the lock only expires when its holder has died; a waiter then takes it over and loads.
+    """
+    with _inflight_lock:
+        future = _inflight.get(key)
+        leader = future is None
+        if leader:
+            future = Future()
+            _inflight[key] = future
+    if not leader:
+        return future.result()
+
+    try:
+        result = _load_across_processes(key, load, probe, lock_ttl)
+    except BaseException as exc:
+        future.set_exception(exc)
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+
+
+def _load_across_processes(key, load, probe, lock_ttl):
+    if probe is None:
+        return load()
+    if lock_ttl is None:
+        lock_ttl = _env_seconds('CACHE_SINGLEFLIGHT_LOCK_TTL_SECONDS', 30)
+
+    backend = get_cache()
+    lock_key = f"singleflight:{key}"
+    token = uuid.uuid4().hex
+    while True:
+        if backend.acquire_lock(lock_key, token, lock_ttl):
+            with _renewing(backend, lock_key, token, lock_ttl):
+                # Another process may have finished between our miss and the lock.
+                found = probe()
+                return found if found is not None else load()
+
+        found = probe()
+        if found is not None:
+            return found
+        time.sleep(_SINGLE_FLIGHT_POLL_SECONDS)
+
+
+@contextmanager
+def _renewing(backend, lock_key, token, lock_ttl):
+    """Hold ``lock_key`` for the duration of the block, then release it."""
+    stop = threading.Event()
+
+    def _renew():
+        while not stop.wait(lock_ttl / 3):
+            try:
+                if not backend.extend_lock(lock_key, token, lock_ttl):
+                    logger.warning("Lost the single-flight lock %s while loading", lock_key)
+                    return
+            except Exception:
+                logger.exception("Failed to renew the single-flight lock %s", lock_key)
+                return
+
+    renewer = threading.Thread(target=_renew, name="singleflight-renew", daemon=True)
+    renewer.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        renewer.join()
+        backend.release_lock(lock_key, token)
+
+
+def cache_get_or_load_json(key, load, ttl=None):
+    """``cache_get_json``, falling back to a single-flight ``load()`` whose result is cached for ``ttl``.
+
+    A None result is not cached.
+    """
+    cached = cache_get_json(key)
+    if cached is not None:
+        return cached
+
+    def _load():
+        value = load()
+        if value is not None:
+            cache_set_json(key, value, ttl=ttl)
+        return value
+
+    return single_flight(key, _load, probe=lambda: cache_get_json(key))
@@ -0,0 +1,200 @@
+"""Wire format for cached JSON values.
+
+Small values are stored as plain JSON text, exactly as before. Values whose JSON exceeds
+``CACHE_BINARY_CODEC_MIN_BYTES`` are stored as a compressed binary frame::
+
+    b'QYC' | version (1 byte) | kind (1 byte) | compression (1 byte) | body length (uint32 LE) | body
+
+A list of numeric rows (``[[t, o, h, l, c, v], ...]``) or of dicts sharing the same numeric fields
+(kline bars) is packed column by column as int64/float64 arrays, which compresses far better than
+text and decodes without parsing. Anything else is compressed JSON. zstd is used when the
+``zstandard`` package is installed, zlib otherwise; both are always readable when available.
+"""
+
+import json
+import os
+import struct
+import zlib
+
+import numpy as np
+
+try:
+    import zstandard
+except Exception:  # pragma: no cover - optional dependency
+    zstandard = None
+
+
+MAGIC = b'QYC'
+VERSION = 1
+KIND_JSON = 0
+KIND_RECORDS = 1
+KIND_ROWS = 2
+COMPRESSION_ZLIB = 1
+COMPRESSION_ZSTD = 2
+DEFAULT_MIN_BYTES = 4096
+
+_HEADER = struct.Struct('<3sBBBI')
+_META_LENGTH = struct.Struct('<I')
+_INT64_MIN, _INT64_MAX = -(2 ** 63), 2 ** 63 - 1
+
+
+class CacheCodecError(ValueError):
+    pass
+
+
+def binary_codec_enabled():
+    return os.getenv('CACHE_BINARY_CODEC_ENABLED', 'true').strip().lower() not in {'0', 'false', 'no', 'off'}
+
+
+def binary_codec_min_bytes():
+    try:
+        return int(os.getenv('CACHE_BINARY_CODEC_MIN_BYTES', DEFAULT_MIN_BYTES))
+    except (TypeError, ValueError):
+        return DEFAULT_MIN_BYTES
+
+
+def encode_payload(value):
+    """JSON text for small values, a compressed binary frame (bytes) for large ones."""
+    text = json.dumps(value, ensure_ascii=True, separators=(',', ':'), default=str)
+    if not binary_codec_enabled() or len(text) < binary_codec_min_bytes():
+        return text
+
+    packed = _pack_columns(value)
+    if packed is None:
+        kind, body = KIND_JSON, text.encode('ascii')
+    else:
+        kind, body = packed
+    compression, compressed = _compress(body)
+    return _HEADER.pack(MAGIC, VERSION, kind, compression, len(body)) + compressed
+
+
+def decode_payload(raw):
+    """Inverse of ``encode_payload``; also accepts JSON stored as bytes. Returns None if unreadable."""
+    if raw is None:
+        return None
+    if isinstance(raw, (bytes, bytearray, memoryview)):
+        raw = bytes(raw)
+        if raw.startswith(MAGIC):
+            try:
+                return _decode_frame(raw)
+            except (CacheCodecError, zlib.error, ValueError, struct.error):
+                return None
+        try:
+            raw = raw.decode('utf-8')
+        except UnicodeDecodeError:
+            return None
+    if isinstance(raw, str):
+        try:
+            return json.loads(raw)
+        except json.JSONDecodeError:
+            return None
+    return raw
+
+
+def payload_size(raw):
+    """Approximate in-memory size of the decoded value, for cache budgets."""
+    if isinstance(raw, bytes) and raw.startswith(MAGIC) and len(raw) >= _HEADER.size:
+        return max(len(raw), _HEADER.unpack_from(raw)[4])
+    return len(raw)
+
+
+def _decode_frame(raw):
+    if len(raw) < _HEADER.size:
+        raise CacheCodecError('truncated cache frame')
+    _, version, kind, compression, body_length = _HEADER.unpack_from(raw)
+    if version != VERSION:
+        raise CacheCodecError(f'unsupported cache frame version {version}')
+    body = _decompress(compression, raw[_HEADER.size:])
+    if len(body) != body_length:
+        raise CacheCodecError('cache frame length mismatch')
+    if kind == KIND_JSON:
+        return json.loads(body.decode('ascii'))
+    if kind in (KIND_RECORDS, KIND_ROWS):
+        return _unpack_columns(kind, body)
+    raise CacheCodecError(f'unknown cache frame kind {kind}')
+
+
+def _compress(body):
+    if zstandard is not None:
+        return COMPRESSION_ZSTD, zstandard.ZstdCompressor(level=3).compress(body)
+    return COMPRESSION_ZLIB, zlib.compress(body, 6)
+
+
+def _decompress(compression, data):
+    if compression == COMPRESSION_ZLIB:
+        return zlib.decompress(data)
+    if compression == COMPRESSION_ZSTD:
+        if zstandard is None:
+            raise CacheCodecError('zstandard is not installed')
+        return zstandard.ZstdDecompressor().decompress(data)
+    raise CacheCodecError(f'unknown cache frame compression {compression}')
+
+
+def _column_dtype(values):
+    """'q' when every value is an int64-sized int, 'd' when all are numbers, else None."""
+    all_ints = True
+    for value in values:
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return None
+        if isinstance(value, int):
+            if not _INT64_MIN <= value <= _INT64_MAX:
+                return None
+        else:
+            all_ints = False
+    return 'q' if all_ints else 'd'
+
+
+def _pack_columns(value):
+    if not isinstance(value, list) or not value:
+        return None
+    first = value[0]
+    if isinstance(first, dict):
+        fields = list(first)
+        if not fields or not all(isinstance(name, str) for name in fields):
+            return None
+        if any(not isinstance(item, dict) or list(item) != fields for item in value):
+            return None
+        columns = [[item[name] for item in value] for name in fields]
+        kind = KIND_RECORDS
+    elif isinstance(first, list):
+        width = len(first)
+        if not width or any(not isinstance(item, list) or len(item) != width for item in value):
+            return None
+        fields = None
+        columns = [list(column) for column in zip(*value)]
+        kind = KIND_ROWS
+    else:
+        return None
+
+    dtypes = []
+    for column in columns:
+        dtype = _column_dtype(column)
+        if dtype is None:
+            return None
+        dtypes.append(dtype)
+
+    meta = json.dumps({'n': len(value), 'fields': fields, 'dtypes': ''.join(dtypes)}, separators=(',', ':'))
+    meta = meta.encode('ascii')
+    parts = [_META_LENGTH.pack(len(meta)), meta]
+    for column, dtype in zip(columns, dtypes):
+        parts.append(np.asarray(column, dtype='<i8' if dtype == 'q' else '<f8').tobytes())
+    return kind, b''.join(parts)
+
+
+def _unpack_columns(kind, body):
+    (meta_length,) = _META_LENGTH.unpack_from(body)
+    offset = _META_LENGTH.size
+    meta = json.loads(body[offset:offset + meta_length].decode('ascii'))
+    offset += meta_length
+    count = meta['n']
+    columns = []
+    for dtype in meta['dtypes']:
+        column = np.frombuffer(body, dtype='<i8' if dtype == 'q' else '<f8', count=count, offset=offset)
+        columns.append(column.tolist())
+        offset += count * 8
+    if offset != len(body):
+        raise CacheCodecError('cache frame column length mismatch')
+    if kind == KIND_RECORDS:
+        fields = meta['fields']
+        return [dict(zip(fields, row)) for row in zip(*columns)]
+    return [list(row) for row in zip(*columns)]
@@ -0,0 +1,47 @@
+"""trading calendar and market data coverage
+
+Revision ID: 20261018a1b2
+Revises: 20260426c1d2
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261018a1b2"
+down_revision = "20260426c1d2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "trading_calendar_days",
+        sa.Column("market", sa.String(length=20), nullable=False),
+        sa.Column("trade_date", sa.Date(), nullable=False),
+        sa.Column("source", sa.String(length=20), nullable=False),
+        sa.Column("cached_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("CURRENT_TIMESTAMP")),
+        sa.PrimaryKeyConstraint("market", "trade_date"),
+    )
+    op.create_table(
+        "market_data_coverage",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("symbol", sa.String(length=20), nullable=False),
+        sa.Column("source", sa.String(length=20), nullable=False),
+        sa.Column("start_date", sa.Date(), nullable=False),
+        sa.Column("end_date", sa.Date(), nullable=False),
+        sa.Column("fetched_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("CURRENT_TIMESTAMP")),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_market_data_coverage_symbol_source_start",
+        "market_data_coverage",
+        ["symbol", "source", "start_date"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_market_data_coverage_symbol_source_start", table_name="market_data_coverage")
+    op.drop_table("market_data_coverage")
+    op.drop_table("trading_calendar_days")
@@ -0,0 +1,90 @@
+import time
+
+from app.strategy_runtime.errors import StrategyRuntimeError
+
+
+STRATEGY_SOURCE = '''
+class Strategy:
+    def on_bar(self, ctx, bar):
+        if (bar.time - 1700000000000) % ctx.params["every"] == 0:
+            ctx.emit_order({"side": "buy", "price": bar.close, "quantity": 1})
+'''
+
+
+def _loaded_strategy():
+    return {
+        "source": STRATEGY_SOURCE,
+        "entrypoint_callable": "Strategy",
+        "strategy_id": "batch-strategy",
+        "version": "1.0.0",
+        "manifest": {
+            "parameters": [
+                {"key": "every", "type": "integer", "default": 60000, "min": 60000},
+            ],
+        },
+    }
+
+
+def test_run_backtest_batch_loads_once_and_isolates_failures(monkeypatch):
+    from app.backtest.engine import run_backtest_batch
+
+    monkeypatch.setenv("FLASK_ENV", "testing")
+    monkeypatch.setenv("BACKTEST_SANDBOX_POOL_SIZE", "0")
+    monkeypatch.setattr("app.backtest.engine.resolve_data_source", lambda provider_override=None, symbol=None: "mock")
+    loads = []
+
+    def _fake_load(strategy_id, version, user_id=None):
+        loads.append(strategy_id)
+        return _loaded_strategy()
+
+    monkeypatch.setattr("app.strategy_runtime.executor.load_strategy_package", _fake_load)
+
+    results = run_backtest_batch(
+        "BTCUSDT",
+        "batch-strategy",
+        [{"every": 60000}, {"every": 1}, {"every": 120000}],
+        limit=10,
+        data_source="mock",
+    )
+
+    assert loads == ["batch-strategy"]
+    assert len(results[0]["trades"]) == 10
+    assert results[0]["runtime"]["params"] == {"every": 60000}
+    assert isinstance(results[1], StrategyRuntimeError)
+    assert results[1].message == "invalid_strategy_params"
+    assert len(results[2]["trades"]) == 5
+    assert results[0]["kline"] is results[2]["kline"]
+    assert results[0]["summary"] == results[2]["summary"]
+
+
+def test_batch_times_out_the_slow_set_alone(monkeypatch):
+    from app.backtest.frame import BarFrame
+    from app.backtest.providers import MockProvider
+    from app.strategy_runtime.executor import execute_backtest_strategy_batch
+
+    monkeypatch.setenv("FLASK_ENV", "testing")
+    monkeypatch.setenv("BACKTEST_SANDBOX_POOL_SIZE", "0")
+    loaded = {
+        **_loaded_strategy(),
+        "source": '''
+class Strategy:
+    def on_bar(self, ctx, bar):
+        while ctx.params["hang"]:
+            pass
+        ctx.emit_order({"side": "buy", "price": bar.close, "quantity": 1})
+''',
+        "manifest": {},
+    }
+    bars = BarFrame.coerce(MockProvider().get_bars("BTCUSDT", limit=3))
+
+    started = time.monotonic()
+    results = execute_backtest_strategy_batch(
+        "BTCUSDT", bars, loaded, [{"hang": False}, {"hang": True}, {"hang": False}], timeout_seconds=1,
+    )
+
+    # One set's deadline, not the whole session's budget.
+    assert time.monotonic() - started < 2.5
+    assert len(results[0]["trades"]) == 3
+    assert isinstance(results[1], StrategyRuntimeError)
+    assert results[1].message == "strategy_timeout"
+    assert len(results[2]["trades"]) == 3
@@ -0,0 +1,72 @@
+import pickle
+
+from app.backtest.frame import BarFrame
+
+
+def _records():
+    return [
+        {"time": 1700000000000, "open": 10.0, "high": 10.5, "low": 9.5, "close": 10.2, "volume": 100.0},
+        {"time": 1700000060000, "open": 10.2, "high": 10.8, "low": 10.0, "close": 10.6, "volume": 120.0},
+        {"time": 1700000120000, "open": 10.6, "high": 10.9, "low": 10.3, "close": 10.4, "volume": 90.0},
+    ]
+
+
+def test_bar_frame_round_trips_records():
+    frame = BarFrame.from_records(_records())
+
+    assert len(frame) == 3
+    assert frame.time.dtype.name == "int64"
+    assert frame.close.dtype.name == "float64"
+    assert frame.to_records() == _records()
+    assert frame == _records()
+    assert frame[-1]["close"] == 10.4
+    assert frame[1:].to_records() == _records()[1:]
+
+
+def test_bar_frame_builds_from_positional_rows():
+    rows = [
+        [1700000000000, "10.0", "10.5", "9.5", "10.2", "100", 1700000059999],
+        [1700000060000, "10.2", "10.8", "10.0", "10.6", "120", 1700000119999],
+    ]
+
+    frame = BarFrame.from_rows(rows)
+
+    assert frame.time.tolist() == [1700000000000, 1700000060000]
+    assert frame.volume.tolist() == [100.0, 120.0]
+
+
+def test_bar_frame_slices_by_time_and_sorts():
+    frame = BarFrame.from_records(list(reversed(_records()))).sorted()
+
+    assert frame.time.tolist() == [1700000000000, 1700000060000, 1700000120000]
+    assert frame.between(1700000060000, 1700000120000).time.tolist() == [1700000060000, 1700000120000]
+    assert frame.tail(1).time.tolist() == [1700000120000]
+
+
+def test_bar_frame_coerce_and_pickle():
+    frame = BarFrame.coerce(_records())
+
+    assert BarFrame.coerce(frame) is frame
+    assert len(BarFrame.coerce(None)) == 0
+    assert not BarFrame.coerce([])
+    assert pickle.loads(pickle.dumps(frame)) == frame
+
+
+def test_run_backtest_returns_bar_frame_and_serializes_at_boundary(monkeypatch):
+    from app.backtest.engine import run_backtest, serialize_backtest_result
+
+    monkeypatch.setattr("app.backtest.engine.resolve_data_source", lambda provider_override=None, symbol=None: "mock")
+
+    result = run_backtest("BTCUSDT", limit=5, data_source="mock")
+
+    assert isinstance(result["kline"], BarFrame)
+    assert len(result["kline"]) == 5
+    serialized = serialize_backtest_result(result)
+    assert serialized["kline"][0] == {
+        "time": 1700000000000,
+        "open": 100.0,
+        "high": 100.0,
+        "low": 100.0,
+        "close": 100.0,
+        "volume": 1000.0,
+    }
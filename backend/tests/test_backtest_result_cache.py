@@ -0,0 +1,123 @@
+import pytest
+
+from app.backtest.providers import MockProvider
+
+
+def _create_jobs(app, params_list):
+    from app.extensions import db
+    from app.models import BacktestJob, Strategy, User, UserQuota
+
+    with app.app_context():
+        user = User(phone="13800138091", nickname="CacheUser")
+        db.session.add(user)
+        db.session.flush()
+        db.session.add(Strategy(id="cache-strategy", name="Cache", symbol="BTCUSDT", status="draft", owner_id=user.id))
+        db.session.add(UserQuota(user_id=user.id, plan_level="pro", used_count=0))
+        jobs = [BacktestJob(user_id=user.id, strategy_id="cache-strategy", params=params) for params in params_list]
+        db.session.add_all(jobs)
+        db.session.commit()
+        return user.id, [job.id for job in jobs]
+
+
+def _patch_backtest(monkeypatch, calls, bars_limit=5):
+    from app.backtest.engine import run_backtest
+
+    monkeypatch.setattr(
+        "app.tasks.backtests.resolve_strategy_identity",
+        lambda params, user_id=None: {"code_hash": "abc", "version_id": "v1", "file_id": "f1"},
+    )
+    monkeypatch.setattr(
+        "app.tasks.backtests.fetch_backtest_bars",
+        lambda symbol, **kwargs: (MockProvider().get_bars(symbol, limit=bars_limit), None),
+    )
+
+    def _run(symbol, **kwargs):
+        calls.append(kwargs)
+        return run_backtest(symbol, bars=kwargs["bars"], data_source="mock")
+
+    monkeypatch.setattr("app.tasks.backtests.run_backtest", _run)
+
+
+def test_identical_backtest_is_served_from_result_cache(monkeypatch, app, tmp_path):
+    from app.extensions import db
+    from app.models import BacktestJob, BacktestQuotaLedger, UserQuota
+    from app.tasks.backtests import _run_job
+    from app.utils.storage import read_json
+
+    monkeypatch.setenv("BACKTEST_STORAGE_DIR", (tmp_path / "storage").as_posix())
+    params = {"symbol": "BTCUSDT", "strategy_id": "cache-strategy", "strategy_params": {"b": 2, "a": 1}, "enable_ai": False}
+    user_id, (first_id, second_id) = _create_jobs(app, [params, {**params, "strategy_params": {"a": 1, "b": 2}}])
+    calls = []
+    _patch_backtest(monkeypatch, calls)
+
+    with app.app_context():
+        first = _run_job(first_id)
+        second = _run_job(second_id)
+
+    assert len(calls) == 1
+    assert second["cached"] is True
+    assert second["summary"] == first["summary"]
+    assert second["kline"] == first["kline"]
+
+    with app.app_context():
+        job = db.session.get(BacktestJob, second_id)
+        assert job.status == "completed"
+        assert job.result_storage_key == f"backtest-results/{second_id}"
+        assert job.result_summary == first["summary"]
+        assert db.session.get(BacktestQuotaLedger, second_id).status == "consumed"
+        assert db.session.get(UserQuota, user_id).used_count == 2
+        assert read_json(f"{job.result_storage_key}/kline.json") == first["kline"]
+
+
+def test_result_cache_misses_on_new_bars_and_honours_bypass(monkeypatch, app, tmp_path):
+    from app.tasks.backtests import _run_job
+
+    monkeypatch.setenv("BACKTEST_STORAGE_DIR", (tmp_path / "storage").as_posix())
+    params = {"symbol": "ETHUSDT", "strategy_id": "cache-strategy", "enable_ai": False}
+    _, job_ids = _create_jobs(app, [params, params, {**params, "bypass_cache": True}])
+    calls = []
+    _patch_backtest(monkeypatch, calls, bars_limit=6)
+
+    with app.app_context():
+        _run_job(job_ids[0])
+        _patch_backtest(monkeypatch, calls, bars_limit=7)
+        _run_job(job_ids[1])
+        bypassed = _run_job(job_ids[2])
+
+    assert [len(call["bars"]) for call in calls[:2]] == [6, 7]
+    assert len(calls) == 3
+    assert calls[2]["bars"] is None
+    assert "cached" not in bypassed
+
+
+def test_restore_cached_result_treats_missing_artifacts_as_miss(app, tmp_path, monkeypatch):
+    from app.services.backtest_cache import restore_cached_result
+    from app.utils.cache import cache_set_json
+
+    monkeypatch.setenv("BACKTEST_STORAGE_DIR", (tmp_path / "storage").as_posix())
+    with app.app_context():
+        cache_set_json("backtest:result:v1:gone", {"storage_key": "backtest-results/deleted", "result_summary": {}})
+        assert restore_cached_result("backtest:result:v1:gone", "backtest-results/new") is None
+        assert restore_cached_result("backtest:result:v1:absent", "backtest-results/new") is None
+
+
+def test_result_cache_key_uses_the_merged_strategy_params():
+    from app.services.backtest_cache import build_result_cache_key
+    from app.strategy_runtime import StrategyRuntimeError
+
+    bars = MockProvider().get_bars("BTCUSDT", limit=5)
+    identity = {
+        "code_hash": "abc",
+        "version_id": "v1",
+        "file_id": "f1",
+        "parameters": [{"key": "fast", "type": "integer", "default": 5}, {"key": "slow", "type": "integer", "default": 20}],
+    }
+
+    def _key(strategy_params):
+        return build_result_cache_key(identity, {"symbol": "BTCUSDT", "strategy_params": strategy_params}, bars)
+
+    assert _key({}) == _key(None) == _key({"fast": 5}) == _key({"slow": 20, "fast": 5})
+    assert _key({"fast": 6}) != _key({})
+    assert "parameters" in identity
+    with pytest.raises(StrategyRuntimeError):
+        _key({"unknown": 1})
@@ -243,6 +243,43 @@ def test_backtest_run_marks_timeout_jobs(monkeypatch, client, app):
         assert job.status == 'timeout'
 
 
+def test_backtest_run_bypass_cache_skips_the_result_cache(monkeypatch, client, app, tmp_path):
+    from app.backtest.engine import run_backtest
+    from app.backtest.providers import MockProvider
+    from app.extensions import db
+    from app.models import BacktestJob
+
+    token, _ = _login_user(client, phone="13800138094", nickname="CacheBypass")
+    monkeypatch.setenv("BACKTEST_STORAGE_DIR", (tmp_path / "storage").as_posix())
+    monkeypatch.setattr(
+        "app.tasks.backtests.resolve_strategy_identity",
+        lambda params, user_id=None: {"code_hash": "abc", "version_id": "v1", "file_id": "f1"},
+    )
+    monkeypatch.setattr(
+        "app.tasks.backtests.fetch_backtest_bars",
+        lambda symbol, **kwargs: (MockProvider().get_bars(symbol, limit=5), None),
+    )
+    runs = []
+
+    def _run(symbol, **kwargs):
+        runs.append(kwargs)
+        return run_backtest(symbol, bars=kwargs["bars"] or MockProvider().get_bars(symbol, limit=5), data_source="mock")
+
+    monkeypatch.setattr("app.tasks.backtests.run_backtest", _run)
+    body = {"symbol": "BTCUSDT", "enableAi": False}
+
+    job_ids = [
+        client.post("/api/backtests/run", headers=_auth_headers(token), json=payload).json["data"]["job_id"]
+        for payload in (body, body, {**body, "bypassCache": True})
+    ]
+
+    assert len(runs) == 2
+    with app.app_context():
+        jobs = [db.session.get(BacktestJob, job_id) for job_id in job_ids]
+        assert [job.status for job in jobs] == ["completed"] * 3
+        assert [job.params["bypass_cache"] for job in jobs] == [False, False, True]
+
+
 def test_submit_backtest_requires_auth(client):
     response = client.post(
         "/api/v1/backtest/",
@@ -0,0 +1,184 @@
+import time
+
+import numpy as np
+
+from app.backtest.bar_store import BarStore
+from app.backtest.frame import BarFrame
+
+
+DAY_MS = 86_400_000
+
+
+def _daily(start_day, count, offset=0.0):
+    steps = np.arange(count, dtype=np.float64)
+    return BarFrame(
+        (start_day + np.arange(count)) * DAY_MS,
+        10 + steps + offset,
+        11 + steps + offset,
+        9 + steps + offset,
+        10.5 + steps + offset,
+        1000 + steps,
+    )
+
+
+def test_bar_store_appends_and_reads_ranges_from_the_mapping(tmp_path):
+    store = BarStore(tmp_path)
+    store.append("joinquant", "600000.XSHG", "1d", _daily(10_000, 2_500))
+    store.append("joinquant", "600000.XSHG", "1d", _daily(12_500, 10))
+
+    frame = store.read("joinquant", "600000.XSHG", "1d", 10_100 * DAY_MS, 12_505 * DAY_MS)
+
+    assert len(frame) == 2_406
+    assert int(frame.time[0]) == 10_100 * DAY_MS
+    assert int(frame.time[-1]) == 12_505 * DAY_MS
+    assert isinstance(frame.close.base, np.memmap)
+    assert store.read("joinquant", "000001.XSHE", "1d") is None
+
+
+def test_bar_store_merges_backfill_until_compaction(tmp_path):
+    store = BarStore(tmp_path)
+    store.append("binance", "BTCUSDT", "1d", _daily(20_000, 10))
+    # An older window plus a corrected bar: both land in the pending journal.
+    backfill = _daily(19_995, 6, offset=100.0)
+    assert store.append("binance", "BTCUSDT", "1d", backfill) == 6
+
+    merged = store.read("binance", "BTCUSDT", "1d")
+    assert len(merged) == 15
+    assert np.all(np.diff(merged.time) > 0)
+    assert float(merged.close[5]) == 10.5 + 5 + 100.0
+
+    assert store.compact("binance", "BTCUSDT", "1d") == 15
+    compacted = store.read("binance", "BTCUSDT", "1d")
+    assert compacted == merged
+    assert sorted(path.name for path in (tmp_path / "binance" / "BTCUSDT" / "1d").iterdir() if path.is_dir()) == ["gen-1"]
+    assert store.series() == [("binance", "BTCUSDT", "1d")]
+
+
+def test_bar_store_skips_bars_it_already_holds(tmp_path):
+    store = BarStore(tmp_path)
+    store.append("binance", "ETHUSDT", "1d", _daily(20_000, 10))
+
+    assert store.append("binance", "ETHUSDT", "1d", _daily(20_000, 12)) == 2
+    assert not (tmp_path / "binance" / "ETHUSDT" / "1d" / "gen-0" / "pending-time.bin").exists()
+
+
+def test_read_covered_requires_recorded_coverage(tmp_path):
+    store = BarStore(tmp_path)
+    store.append("binance", "BTCUSDT", "1d", _daily(20_000, 10), covered=(20_000 * DAY_MS, 20_004 * DAY_MS))
+    store.append("binance", "BTCUSDT", "1d", [], covered=(20_004 * DAY_MS, 20_009 * DAY_MS))
+
+    assert len(store.read_covered("binance", "BTCUSDT", "1d", 20_002 * DAY_MS, 20_008 * DAY_MS)) == 7
+    assert store.read_covered("binance", "BTCUSDT", "1d", 19_999 * DAY_MS, 20_003 * DAY_MS) is None
+
+
+def test_engine_serves_covered_ranges_without_the_provider(app, monkeypatch):
+    from app.backtest import engine
+
+    calls = []
+
+    class _Provider:
+        default_interval = "1d"
+        last_data_range_notice = None
+
+        def get_bars(self, symbol, **kwargs):
+            calls.append(kwargs)
+            return _daily(19_000, 30)
+
+    monkeypatch.setattr(engine, "get_backtest_provider", lambda data_source=None: _Provider())
+    start, end = 19_000 * DAY_MS, 19_029 * DAY_MS
+
+    with app.app_context():
+        first = engine.load_backtest_bars("BTCUSDT", start_time=start, end_time=end, data_source="binance")
+        second = engine.load_backtest_bars("BTCUSDT", start_time=start + DAY_MS, end_time=end, data_source="binance")
+
+    assert len(calls) == 1
+    assert len(first) == 30
+    assert second == first.take(slice(1, None))
+
+
+def test_truncated_fetch_only_covers_the_bars_it_returned(app, monkeypatch, tmp_path):
+    from app.backtest import engine
+
+    history = _daily(19_000, 1_000)
+    calls = []
+
+    class _Provider:
+        default_interval = "1d"
+        last_data_range_notice = None
+
+        def get_bars(self, symbol, limit=None, start_time=None, end_time=None, **kwargs):
+            # Like the JoinQuant and AkShare providers: the range is fetched, then cut to ``limit``.
+            calls.append(limit)
+            return history.between(start_time, end_time).tail(limit)
+
+    monkeypatch.setenv("BACKTEST_BAR_STORE_DIR", tmp_path.as_posix())
+    monkeypatch.setattr(engine, "get_backtest_provider", lambda data_source=None: _Provider())
+    start, end = 19_000 * DAY_MS, 19_999 * DAY_MS
+
+    def _load(limit, start_time=start, end_time=end):
+        return engine.load_backtest_bars("BTCUSDT", limit=limit, start_time=start_time, end_time=end_time, data_source="binance")
+
+    with app.app_context():
+        assert len(_load(100)) == 100
+        early = _load(5_000, end_time=19_364 * DAY_MS)
+        full = _load(5_000)
+        assert calls == [100, 5_000, 5_000]
+
+        assert len(early) == 365
+        assert full == history
+        assert _load(10) == history.tail(10)
+        assert calls == [100, 5_000, 5_000]
+
+
+def test_run_backtest_stores_bars_under_the_requested_source(app, monkeypatch, tmp_path):
+    from app.backtest import engine
+    from app.backtest.bar_store import get_bar_store
+
+    class _Provider:
+        default_interval = "1d"
+        last_data_range_notice = None
+
+        def get_bars(self, symbol, **kwargs):
+            return _daily(19_000, 30)
+
+    monkeypatch.setenv("BACKTEST_BAR_STORE_DIR", tmp_path.as_posix())
+    monkeypatch.setattr(engine, "get_backtest_provider", lambda data_source=None: _Provider())
+
+    with app.app_context():
+        result = engine.run_backtest(
+            "600000.XSHG",
+            interval="1d",
+            start_time=19_000 * DAY_MS,
+            end_time=19_029 * DAY_MS,
+            data_source="akshare",
+        )
+
+    store = get_bar_store()
+    assert result["dataSource"] == "akshare"
+    assert store.intervals("akshare", "600000.XSHG") == ["1d"]
+    assert [series[0] for series in store.series()] == ["akshare"]
+
+
+def test_bar_store_reads_ten_years_of_daily_bars_quickly(tmp_path):
+    store = BarStore(tmp_path)
+    store.append("akshare", "600519", "1d", _daily(13_000, 3_650))
+
+    started = time.perf_counter()
+    frame = store.read("akshare", "600519", "1d", 13_000 * DAY_MS, 16_649 * DAY_MS)
+    elapsed = time.perf_counter() - started
+
+    assert len(frame) == 3_650
+    assert elapsed < 0.05
+
+
+def test_compact_bar_store_task_folds_every_series(app, tmp_path, monkeypatch):
+    from app.tasks.backtests import compact_bar_store_task
+
+    monkeypatch.setenv("BACKTEST_BAR_STORE_DIR", tmp_path.as_posix())
+    store = BarStore(tmp_path)
+    store.append("binance", "BTCUSDT", "1d", _daily(20_000, 5))
+    store.append("binance", "BTCUSDT", "1d", _daily(19_998, 2))
+    store.append("sinagold", "XAUUSD", "1d", _daily(20_000, 3))
+
+    assert compact_bar_store_task.run() == {"series": 2, "bars": 10}
+    assert len(store.read("binance", "BTCUSDT", "1d")) == 7
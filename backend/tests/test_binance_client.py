@@ -0,0 +1,96 @@
+import threading
+
+from app.backtest.providers import BinanceProvider
+from app.marketdata.binance import BinanceClient, BinanceRateLimitError, WeightLimiter
+
+
+class _FakeBinance(BinanceClient):
+    """Serves 1m klines for every minute in the requested window, honouring ``limit``."""
+
+    def __init__(self, **kwargs):
+        super().__init__(weight_limiter=WeightLimiter(100_000), **kwargs)
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def _request(self, path, params=None):
+        with self._lock:
+            self.requests.append(dict(params))
+        start = params["startTime"]
+        end = params.get("endTime", start + 10**12)
+        times = range(start - start % 60_000 + (60_000 if start % 60_000 else 0), end + 1, 60_000)
+        return [[t, "1", "2", "0.5", "1.5", "10"] for t in list(times)[:params["limit"]]]
+
+
+def test_get_klines_range_fetches_aligned_pages_and_stitches(app):
+    client = _FakeBinance(range_concurrency=3)
+    start = 1_699_999_980_000
+    end = start + 2_500 * 60_000
+
+    with app.app_context():
+        bars = client.get_klines_range("btcusdt", interval="1m", start_time=start, end_time=end, use_cache=False)
+
+    times = [bar["time"] for bar in bars]
+    assert len(times) == 2_501
+    assert times == sorted(set(times))
+    assert times[0] == start and times[-1] == end
+    span = 1000 * 60_000
+    assert all(req["limit"] == 1000 and req["startTime"] % span == 0 for req in client.requests)
+    assert len(client.requests) == end // span - start // span + 1
+
+
+def test_get_klines_range_walks_calendar_intervals(app):
+    client = _FakeBinance()
+    start = 1_699_999_980_000
+
+    with app.app_context():
+        bars = client.get_klines_range("BTCUSDT", interval="1M", start_time=start, end_time=start + 1_500 * 60_000, use_cache=False)
+
+    assert len(bars) == 1_501
+    assert [req["startTime"] for req in client.requests] == [start, start + 999 * 60_000 + 1]
+
+
+def test_request_klines_retries_after_rate_limit(monkeypatch):
+    client = _FakeBinance()
+    attempts = []
+    sleeps = []
+
+    def _limited(path, params=None):
+        attempts.append(params)
+        if len(attempts) == 1:
+            raise BinanceRateLimitError("Binance API error 429", retry_after=3)
+        return []
+
+    monkeypatch.setattr(client, "_request", _limited)
+    monkeypatch.setattr("app.marketdata.binance.time.sleep", sleeps.append)
+
+    assert client._request_klines({"symbol": "BTCUSDT", "interval": "1m", "limit": 1000}) == []
+    assert len(attempts) == 2
+    assert sleeps == [3]
+
+
+def test_weight_limiter_waits_for_window_to_free_up():
+    now = [0.0]
+    sleeps = []
+
+    def _sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    limiter = WeightLimiter(10, clock=lambda: now[0], sleep=_sleep)
+    limiter.acquire(5)
+    now[0] = 20.0
+    limiter.acquire(5)
+    limiter.acquire(5)
+
+    assert sleeps == [40.0]
+
+
+def test_binance_provider_uses_range_fetch_for_time_windows(app):
+    client = _FakeBinance()
+    provider = BinanceProvider(client=client, default_interval="1m")
+    start = 1_699_999_980_000
+
+    with app.app_context():
+        frame = provider.get_bars("BTCUSDT", limit=500, start_time=start, end_time=start + 1_200 * 60_000)
+
+    assert len(frame) == 1_201
@@ -0,0 +1,80 @@
+import json
+
+from app.utils.cache import MemoryCache, cache_get_json, cache_set_json
+from app.utils.cache_codec import KIND_JSON, KIND_RECORDS, KIND_ROWS, MAGIC, decode_payload, encode_payload, payload_size
+
+
+def _bars(count):
+    return [
+        {
+            "time": 1_700_000_000_000 + index * 60_000,
+            "open": 100.0 + index * 0.25,
+            "high": 101.5 + index * 0.25,
+            "low": 99.75 + index * 0.25,
+            "close": 100.5 + index * 0.25,
+            "volume": 12.345 * (index % 7),
+        }
+        for index in range(count)
+    ]
+
+
+def test_small_values_stay_json_text():
+    assert encode_payload({"price": 1.5}) == '{"price":1.5}'
+    assert decode_payload('{"price":1.5}') == {"price": 1.5}
+    assert decode_payload(b'{"price":1.5}') == {"price": 1.5}
+
+
+def test_bar_records_round_trip_as_compressed_columns():
+    bars = _bars(1000)
+
+    payload = encode_payload(bars)
+
+    assert isinstance(payload, bytes) and payload.startswith(MAGIC)
+    assert payload[4] == KIND_RECORDS
+    assert len(payload) * 3 < len(json.dumps(bars, separators=(",", ":")))
+    decoded = decode_payload(payload)
+    assert decoded == bars
+    assert isinstance(decoded[0]["time"], int)
+    assert payload_size(payload) > len(payload)
+
+
+def test_segment_rows_round_trip_as_compressed_columns():
+    rows = [[bar["time"], bar["open"], bar["high"], bar["low"], bar["close"], bar["volume"]] for bar in _bars(500)]
+
+    payload = encode_payload(rows)
+
+    assert payload[4] == KIND_ROWS
+    assert decode_payload(payload) == rows
+
+
+def test_non_numeric_values_fall_back_to_compressed_json():
+    raw = [{"d": f"2024-01-{day % 28 + 1:02d}", "c": str(day)} for day in range(500)]
+
+    payload = encode_payload(raw)
+
+    assert payload[4] == KIND_JSON
+    assert decode_payload(payload) == raw
+
+
+def test_binary_codec_can_be_disabled(monkeypatch):
+    monkeypatch.setenv("CACHE_BINARY_CODEC_ENABLED", "false")
+
+    assert isinstance(encode_payload(_bars(100)), str)
+
+
+def test_unreadable_frames_decode_as_misses():
+    payload = encode_payload(_bars(100))
+
+    assert decode_payload(payload[:-10]) is None
+    assert decode_payload(MAGIC + bytes([99]) + payload[4:]) is None
+
+
+def test_memory_cache_round_trips_large_values(monkeypatch):
+    backend = MemoryCache()
+    monkeypatch.setattr("app.utils.cache._cache_instance", backend)
+    bars = _bars(200)
+
+    cache_set_json("binance:klines:BTCUSDT", bars, ttl=60)
+
+    assert isinstance(backend.get("binance:klines:BTCUSDT"), bytes)
+    assert cache_get_json("binance:klines:BTCUSDT") == bars
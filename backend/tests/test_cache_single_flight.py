@@ -0,0 +1,142 @@
+import threading
+import time
+
+import pytest
+
+from app.utils import cache as cache_module
+from app.utils.cache import MemoryCache, cache_get_json, cache_get_or_load_json, cache_set_json, single_flight
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    backend = MemoryCache()
+    monkeypatch.setattr(cache_module, "_cache_instance", backend)
+    return backend
+
+
+def test_single_flight_shares_one_load_between_threads():
+    calls = []
+    release = threading.Event()
+
+    def _load():
+        calls.append(True)
+        release.wait(2)
+        return [{"time": 1, "close": 10.0}]
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache_get_or_load_json("klines:a", _load, ttl=60)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join(2)
+
+    assert calls == [True]
+    assert results == [[{"time": 1, "close": 10.0}]] * 8
+    assert cache_get_json("klines:a") == [{"time": 1, "close": 10.0}]
+
+
+def test_single_flight_propagates_errors_and_releases_the_key():
+    release = threading.Event()
+
+    def _fail():
+        release.wait(2)
+        raise RuntimeError("upstream down")
+
+    errors = []
+
+    def _call():
+        try:
+            single_flight("klines:b", _fail, probe=lambda: None)
+        except RuntimeError as exc:
+            errors.append(str(exc))
+
+    threads = [threading.Thread(target=_call) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join(2)
+
+    assert errors == ["upstream down"] * 3
+    assert single_flight("klines:b", lambda: "ok", probe=lambda: None) == "ok"
+
+
+def test_single_flight_waits_for_another_process_to_fill_the_cache(fresh_cache):
+    fresh_cache.acquire_lock("singleflight:klines:c", "other-worker", 5)
+
+    def _other_worker_finishes():
+        time.sleep(0.1)
+        cache_set_json("klines:c", {"price": 1.5})
+        fresh_cache.release_lock("singleflight:klines:c", "other-worker")
+
+    threading.Thread(target=_other_worker_finishes).start()
+
+    def _unexpected_load():
+        raise AssertionError("the lock holder is already loading")
+
+    assert cache_get_or_load_json("klines:c", _unexpected_load) == {"price": 1.5}
+
+
+def test_single_flight_takes_over_an_expired_lock(fresh_cache):
+    fresh_cache.acquire_lock("singleflight:klines:d", "dead-worker", 0.1)
+
+    started = time.monotonic()
+    assert single_flight("klines:d", lambda: "loaded", probe=lambda: None) == "loaded"
+    assert time.monotonic() - started < 2
+
+
+def test_single_flight_keeps_waiting_while_the_lock_is_held(fresh_cache):
+    fresh_cache.acquire_lock("singleflight:klines:e", "slow-worker", 0.2)
+
+    def _slow_worker_renews_then_finishes():
+        # Outlives its initial TTL several times over, renewing like a live holder would.
+        for _ in range(10):
+            time.sleep(0.05)
+            fresh_cache.extend_lock("singleflight:klines:e", "slow-worker", 0.2)
+        cache_set_json("klines:e", "from the slow worker")
+        fresh_cache.release_lock("singleflight:klines:e", "slow-worker")
+
+    threading.Thread(target=_slow_worker_renews_then_finishes).start()
+
+    def _unexpected_load():
+        raise AssertionError("the lock holder is still loading")
+
+    assert cache_get_or_load_json("klines:e", _unexpected_load) == "from the slow worker"
+
+
+def test_single_flight_renews_its_lock_for_a_long_load(fresh_cache):
+    release = threading.Event()
+    loads = []
+
+    def _slow_load():
+        loads.append("leader")
+        release.wait(2)
+        cache_set_json("klines:f", "loaded")
+        return "loaded"
+
+    leader = threading.Thread(
+        target=lambda: single_flight("klines:f", _slow_load, probe=lambda: cache_get_json("klines:f"), lock_ttl=0.15),
+    )
+    leader.start()
+    time.sleep(0.05)
+
+    # Another process: not deduplicated in memory, so only the shared lock stops it loading.
+    other = []
+    waiter = threading.Thread(target=lambda: other.append(cache_module._load_across_processes(
+        "klines:f", lambda: loads.append("other") or "other", lambda: cache_get_json("klines:f"), 0.15,
+    )))
+    waiter.start()
+    time.sleep(0.6)
+    release.set()
+    leader.join(2)
+    waiter.join(2)
+
+    assert loads == ["leader"]
+    assert other == ["loaded"]
+    assert fresh_cache.acquire_lock("singleflight:klines:f", "me", 1)
@@ -0,0 +1,101 @@
+from app.utils.cache import LRUStore, MemoryCache, TieredCache, _parse_namespace_budgets
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingBackend(MemoryCache):
+    def __init__(self):
+        super().__init__(LRUStore(1 << 20))
+        self.gets = 0
+
+    def get(self, key):
+        self.gets += 1
+        return super().get(key)
+
+
+def test_lru_store_evicts_least_recently_used_bytes():
+    store = LRUStore(max_bytes=30)
+    store.set("klines:a", "A", 10)
+    store.set("klines:b", "B", 10)
+    store.set("klines:c", "C", 10)
+    assert store.get("klines:a") == "A"
+
+    store.set("klines:d", "D", 10)
+
+    assert store.get("klines:b") is None
+    assert [store.get(key) for key in ("klines:a", "klines:c", "klines:d")] == ["A", "C", "D"]
+    stats = store.stats()
+    assert stats["bytes"] == 30
+    assert stats["namespaces"]["klines"]["evictions"] == 1
+    assert stats["namespaces"]["klines"]["hits"] == 4
+    assert stats["namespaces"]["klines"]["misses"] == 1
+
+
+def test_lru_store_keeps_namespaces_within_their_budgets():
+    store = LRUStore(max_bytes=100, namespace_budgets={"binance": 20})
+    store.set("sinagold:daily", "gold", 50)
+    for index in range(4):
+        store.set(f"binance:klines:{index}", index, 10)
+
+    assert store.get("sinagold:daily") == "gold"
+    assert [store.get(f"binance:klines:{index}") for index in range(4)] == [None, None, 2, 3]
+    assert store.stats()["namespaces"]["binance"]["bytes"] == 20
+    # Entries bigger than their budget are not stored at all.
+    assert store.set("binance:huge", "x", 21) is False
+
+
+def test_lru_store_drops_expired_entries_before_live_ones():
+    clock = FakeClock()
+    store = LRUStore(max_bytes=30, clock=clock)
+    store.set("klines:old", "old", 10)
+    store.set("klines:short", "short", 10, ttl=5)
+    store.set("klines:live", "live", 10)
+    clock.now += 10
+
+    store.set("klines:new", "new", 10)
+
+    assert store.get("klines:old") == "old"
+    assert store.get("klines:short") is None
+    assert store.stats()["namespaces"]["klines"]["expirations"] == 1
+
+
+def test_tiered_cache_serves_decoded_values_locally():
+    remote = CountingBackend()
+    cache = TieredCache(remote, local=LRUStore(1 << 20), local_ttl=10)
+    remote.set("binance:klines:x", '[{"time":1}]', ttl=60)
+
+    first = cache.get_json("binance:klines:x")
+    second = cache.get_json("binance:klines:x")
+
+    assert first == [{"time": 1}]
+    assert second is first
+    assert remote.gets == 1
+    assert cache.stats()["remote"] == {"hits": 1, "misses": 0}
+
+    cache.set_json("binance:klines:y", {"price": 2.0}, ttl=5)
+    assert cache.get_json("binance:klines:y") == {"price": 2.0}
+    assert remote.get("binance:klines:y") == '{"price":2.0}'
+    assert remote.gets == 2
+
+
+def test_tiered_cache_raw_writes_invalidate_the_local_copy():
+    remote = CountingBackend()
+    cache = TieredCache(remote, local=LRUStore(1 << 20))
+    cache.set_json("sinagold:daily:AU0", [1])
+
+    cache.set("sinagold:daily:AU0", "[2]")
+    assert cache.get_json("sinagold:daily:AU0") == [2]
+
+    cache.delete("sinagold:daily:AU0")
+    assert cache.get_json("sinagold:daily:AU0") is None
+
+
+def test_parse_namespace_budgets_skips_malformed_items():
+    assert _parse_namespace_budgets("binance=1024, sinagold=2048,bad,x=") == {"binance": 1024, "sinagold": 2048}
+    assert _parse_namespace_budgets(None) == {}
@@ -0,0 +1,73 @@
+import pytest
+
+from app.marketdata.daily_dataset import ParsedDailyDataset, parsed_datasets
+from app.utils.cache import MemoryCache
+
+
+DAY_MS = 86_400_000
+
+
+@pytest.fixture()
+def memory_cache(monkeypatch):
+    cache = MemoryCache()
+    monkeypatch.setattr("app.utils.cache._cache_instance", cache)
+    parsed_datasets.clear()
+    yield cache
+    parsed_datasets.clear()
+
+
+def _bar(day, close):
+    return {"time": day * DAY_MS, "open": 1.0, "high": 2.0, "low": 0.5, "close": close, "volume": 0.0}
+
+
+def test_parsed_dataset_slices_by_bisect():
+    dataset = ParsedDailyDataset([_bar(day, float(day)) for day in (5, 1, 3, 2, 4)])
+
+    assert [bar["time"] for bar in dataset.slice()] == [day * DAY_MS for day in (1, 2, 3, 4, 5)]
+    assert [bar["close"] for bar in dataset.slice(2 * DAY_MS, 4 * DAY_MS)] == [2.0, 3.0, 4.0]
+    assert [bar["close"] for bar in dataset.slice(2 * DAY_MS + 1, None, limit=2)] == [4.0, 5.0]
+    assert dataset.slice(6 * DAY_MS) == []
+    assert dataset.latest()["close"] == 5.0
+
+
+def test_sina_client_parses_dataset_once_until_upstream_refresh(memory_cache, monkeypatch):
+    from app.marketdata import sina_gold
+    from app.marketdata.sina_gold import SinaGoldClient
+
+    fetches = []
+    parses = []
+    parse = sina_gold._parse_bars
+
+    def _fetch(self, sina_symbol):
+        fetches.append(sina_symbol)
+        return [
+            {"d": f"2024-02-{day:02d}", "o": "1", "h": "2", "l": "0.5", "c": str(day + len(fetches)), "v": "3"}
+            for day in range(1, 11)
+        ]
+
+    monkeypatch.setattr(SinaGoldClient, "_fetch_daily_kline", _fetch)
+    monkeypatch.setattr(sina_gold, "_parse_bars", lambda data: parses.append(1) or parse(data))
+    client = SinaGoldClient()
+
+    assert [bar["close"] for bar in client.get_klines("XAUUSD", limit=3)] == [9.0, 10.0, 11.0]
+    assert client.get_latest_price("XAUUSD") == 11.0
+    assert len(client.get_klines("XAUUSD", limit=200)) == 10
+    assert len(parses) == 1
+
+    # Once the shared payload expires, the next load refetches it and writes a new version token.
+    memory_cache.delete("sinagold:daily:AU0")
+    memory_cache.delete("sinagold:daily:AU0:version")
+    assert client.get_latest_price("XAUUSD") == 12.0
+    assert len(parses) == 2
+    assert fetches == ["AU0", "AU0"]
+
+
+def test_freegold_latest_price_uses_parsed_dataset(memory_cache, monkeypatch):
+    from app.marketdata.freegold import FreeGoldClient
+
+    payload = [{"date": "2024-01-02", "price": 2000}, {"date": "2024-01-01", "price": 1990}, {"date": None, "price": 1}]
+    monkeypatch.setattr(FreeGoldClient, "_request", lambda self, path: payload)
+    client = FreeGoldClient()
+
+    assert client.get_latest_price() == 2000.0
+    assert [bar["close"] for bar in client.get_klines(limit=5)] == [1990.0, 2000.0]
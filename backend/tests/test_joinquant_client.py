@@ -0,0 +1,129 @@
+import threading
+import time
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from app.providers import joinquant
+from app.providers.joinquant import JoinQuantAPIError, JoinQuantClient, JoinQuantQuota
+
+
+class FakeSdk:
+    def __init__(self, spare=10_000):
+        self.price_calls = []
+        self.quota_calls = 0
+        self.spare = spare
+
+    def auth(self, username, password):
+        pass
+
+    def get_query_count(self):
+        self.quota_calls += 1
+        return {"total": 1_000_000, "spare": self.spare}
+
+    def get_price(self, security, start_date, end_date, frequency, fields, skip_paused, fq, panel=True):
+        self.price_calls.append((security, start_date, end_date, panel))
+        days = pd.to_datetime(["2025-01-02", "2025-01-03"])
+        if isinstance(security, str):
+            return pd.DataFrame(
+                {"open": [1.0, 2.0], "high": [1.5, 2.5], "low": [0.5, 1.5], "close": [1.2, 2.2], "volume": [100.0, 200.0]},
+                index=days,
+            )
+        records = []
+        for position, code in enumerate(security):
+            if code == "300999.XSHE":
+                continue  # not listed yet: JoinQuant returns no rows for it
+            for offset, day in enumerate(days):
+                price = 10.0 * (position + 1) + offset
+                records.append(
+                    {"time": day, "code": code, "open": price, "high": price + 1, "low": price - 1, "close": price + 0.5, "volume": 1000.0 + offset}
+                )
+        return pd.DataFrame(records)
+
+
+def _client(sdk, quota_counter=None):
+    return JoinQuantClient(username="user", password="secret", timeout=5, sdk=sdk, quota_counter=quota_counter or JoinQuantQuota())
+
+
+def test_fetch_daily_data_many_uses_one_get_price_call_and_splits_by_code():
+    sdk = FakeSdk()
+    client = _client(sdk)
+
+    rows = client.fetch_daily_data_many(["000001.XSHE", "600000.XSHG", "300999.XSHE"], "2025-01-02", date(2025, 1, 3))
+
+    assert sdk.price_calls == [(["000001.XSHE", "600000.XSHG", "300999.XSHE"], "2025-01-02", "2025-01-03", False)]
+    assert list(rows) == ["000001.XSHE", "600000.XSHG", "300999.XSHE"]
+    assert rows["300999.XSHE"] == []
+    assert rows["600000.XSHG"][1] == {
+        "symbol": "600000.XSHG",
+        "trade_date": date(2025, 1, 3),
+        "open": 21.0,
+        "high": 22.0,
+        "low": 20.0,
+        "close": 21.5,
+        "volume": 1001,
+        "source": "joinquant",
+    }
+
+
+def test_fetch_daily_data_builds_rows_without_iterrows():
+    client = _client(FakeSdk())
+
+    rows = client.fetch_daily_data("000001.XSHE", "2025-01-02", "2025-01-03")
+
+    assert [(row["trade_date"], row["close"], row["volume"]) for row in rows] == [
+        (date(2025, 1, 2), 1.2, 100),
+        (date(2025, 1, 3), 2.2, 200),
+    ]
+
+
+def test_quota_counter_is_shared_and_refreshed_lazily():
+    shared = JoinQuantQuota(refresh_seconds=300)
+    first_sdk, second_sdk = FakeSdk(spare=5), FakeSdk(spare=5)
+
+    _client(first_sdk, shared).fetch_daily_data_many(["000001.XSHE", "600000.XSHG"], "2025-01-02", "2025-01-03")
+
+    assert shared.snapshot() == {"total": 1_000_000, "spare": 1}
+    _client(second_sdk, shared).fetch_daily_data("000001.XSHE", "2025-01-02", "2025-01-03")
+    assert second_sdk.quota_calls == 0
+    assert shared.snapshot()["spare"] == 0
+    with pytest.raises(JoinQuantAPIError, match="quota exhausted"):
+        _client(second_sdk, shared).fetch_daily_data("000001.XSHE", "2025-01-02", "2025-01-03")
+
+
+def test_requests_reuse_the_process_executor():
+    client = _client(FakeSdk())
+
+    client.fetch_daily_data("000001.XSHE", "2025-01-02", "2025-01-03")
+    executor = joinquant._get_executor()
+    client.fetch_daily_data("000001.XSHE", "2025-01-02", "2025-01-03")
+
+    assert joinquant._get_executor() is executor
+    assert not executor._shutdown
+
+
+def test_a_hung_request_does_not_block_the_next_one(monkeypatch):
+    monkeypatch.setenv("JQDATA_MAX_WORKERS", "1")
+    monkeypatch.setattr(joinquant, "_executor", None)
+    release = threading.Event()
+
+    class HangingSdk(FakeSdk):
+        def get_price(self, *args, **kwargs):
+            if not self.price_calls:
+                self.price_calls.append(args)
+                release.wait(10)
+            return super().get_price(*args, **kwargs)
+
+    sdk = HangingSdk()
+    hung = JoinQuantClient(username="user", password="secret", timeout=0.2, sdk=sdk, quota_counter=JoinQuantQuota())
+    try:
+        with pytest.raises(JoinQuantAPIError, match="timed out"):
+            hung.fetch_daily_data("000001.XSHE", "2025-01-02", "2025-01-03")
+
+        started = time.monotonic()
+        rows = _client(sdk).fetch_daily_data("000001.XSHE", "2025-01-02", "2025-01-03")
+        assert len(rows) == 2
+        assert time.monotonic() - started < 2
+    finally:
+        release.set()
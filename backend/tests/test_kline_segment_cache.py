@@ -0,0 +1,80 @@
+import pytest
+
+from app.marketdata.segment_cache import DAY_MS, KlineSegmentCache
+from app.utils.cache import MemoryCache
+
+
+MINUTE_MS = 60_000
+DAY0 = 19_700 * DAY_MS
+
+
+@pytest.fixture()
+def memory_cache(monkeypatch):
+    cache = MemoryCache()
+    monkeypatch.setattr("app.utils.cache._cache_instance", cache)
+    return cache
+
+
+def _minute_bars(start_ms, end_ms):
+    first = start_ms + (-start_ms) % MINUTE_MS
+    return [
+        {"time": t, "open": 1.0, "high": 2.0, "low": 0.5, "close": 1.5, "volume": 10.0}
+        for t in range(first, end_ms + 1, MINUTE_MS)
+    ]
+
+
+def test_segment_cache_fetches_only_missing_day_chunks(memory_cache):
+    fetches = []
+
+    def _fetch(start_ms, end_ms):
+        fetches.append((start_ms, end_ms))
+        return _minute_bars(start_ms, end_ms)
+
+    cache = KlineSegmentCache("test", tail_ttl=60, clock=lambda: (DAY0 + 30 * DAY_MS) / 1000)
+
+    first = cache.get_range("BTCUSDT", "1m", MINUTE_MS, DAY0 + 3 * 3_600_000, DAY0 + DAY_MS + 600_000, _fetch)
+    second = cache.get_range("BTCUSDT", "1m", MINUTE_MS, DAY0 + DAY_MS, DAY0 + 3 * DAY_MS - 1, _fetch)
+
+    assert fetches == [(DAY0, DAY0 + 2 * DAY_MS - 1), (DAY0 + 2 * DAY_MS, DAY0 + 3 * DAY_MS - 1)]
+    assert first[0]["time"] == DAY0 + 3 * 3_600_000
+    assert first[-1]["time"] == DAY0 + DAY_MS + 600_000
+    assert [bar["time"] for bar in second] == list(range(DAY0 + DAY_MS, DAY0 + 3 * DAY_MS, MINUTE_MS))
+
+
+def test_segment_cache_expires_only_the_open_tail(memory_cache, monkeypatch):
+    stored = {}
+    monkeypatch.setattr(
+        "app.marketdata.segment_cache.cache_set_json",
+        lambda key, value, ttl=None: stored.__setitem__(key.rsplit(":", 1)[-1], ttl),
+    )
+    now_ms = DAY0 + DAY_MS + 3_600_000
+    cache = KlineSegmentCache("test", tail_ttl=45, clock=lambda: now_ms / 1000)
+
+    cache.get_range("ETHUSDT", "1m", MINUTE_MS, DAY0, now_ms, _minute_bars)
+
+    assert stored == {str(DAY0): None, str(DAY0 + DAY_MS): 45}
+
+
+def test_sina_gold_range_requests_reuse_cached_segments(memory_cache, monkeypatch):
+    from app.marketdata.sina_gold import SinaGoldClient
+
+    calls = []
+
+    def _fetch(self, sina_symbol):
+        calls.append(sina_symbol)
+        return [
+            {"d": f"2024-01-{day:02d}", "o": "1", "h": "2", "l": "0.5", "c": str(day), "v": "3"}
+            for day in range(1, 29)
+        ]
+
+    monkeypatch.setattr(SinaGoldClient, "_fetch_daily_kline", _fetch)
+    client = SinaGoldClient()
+
+    full = client.get_klines("XAUUSD", start_time="2024-01-01", end_time="2024-01-28")
+    memory_cache.delete("sinagold:daily:AU0")
+    memory_cache.delete("sinagold:daily:AU0:version")
+    window = client.get_klines("XAUUSD", start_time="2024-01-10", end_time="2024-01-12", limit=2)
+
+    assert len(full) == 28
+    assert [bar["close"] for bar in window] == [11.0, 12.0]
+    assert calls == ["AU0"]
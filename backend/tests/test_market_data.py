@@ -124,6 +124,148 @@ def test_market_data_service_returns_cached_rows_with_notice_on_provider_failure
         assert "2025-01-02" in result["data_range_notice"]
 
 
+def test_market_data_service_skips_calendar_holidays(app, monkeypatch):
+    from app.services.market_data import MarketDataService
+    from app.utils.cache import MemoryCache
+
+    monkeypatch.setattr("app.utils.cache._cache_instance", MemoryCache())
+    calendar_calls = []
+
+    def _fetch_trade_days():
+        calendar_calls.append(True)
+        return [date(2024, 12, 31), date(2025, 1, 2), date(2025, 1, 3), date(2025, 1, 6)]
+
+    def _unexpected_fetch(*args, **kwargs):
+        raise AssertionError("New Year's Day is not a trading day")
+
+    with app.app_context():
+        db.session.add_all(
+            [
+                _cache_row(trade_date=date(2024, 12, 31)),
+                _cache_row(trade_date=date(2025, 1, 2)),
+                _cache_row(trade_date=date(2025, 1, 3)),
+                _cache_row(trade_date=date(2025, 1, 6)),
+            ]
+        )
+        db.session.commit()
+
+        client = SimpleNamespace(fetch_daily_data=_unexpected_fetch, fetch_trade_days=_fetch_trade_days)
+        result = MarketDataService(client=client).get_market_data("000001.XSHE", date(2024, 12, 31), date(2025, 1, 6))
+        MarketDataService(client=client).get_market_data("000001.XSHE", date(2024, 12, 31), date(2025, 1, 6))
+
+        assert len(result["bars"]) == 4
+        assert calendar_calls == [True]
+
+
+def test_market_data_service_records_empty_fetches_as_covered(app, monkeypatch):
+    from app.models import MarketDataCoverage
+    from app.services.market_data import MarketDataService
+    from app.utils.cache import MemoryCache
+
+    monkeypatch.setattr("app.utils.cache._cache_instance", MemoryCache())
+
+    calls = []
+
+    def _fetch_daily_data(symbol, start_date, end_date):
+        calls.append((start_date, end_date))
+        return []
+
+    with app.app_context():
+        service = MarketDataService(client=SimpleNamespace(fetch_daily_data=_fetch_daily_data))
+        first = service.get_market_data("600000.XSHG", date(2025, 1, 6), date(2025, 1, 10))
+        second = service.get_market_data("600000.XSHG", date(2025, 1, 7), date(2025, 1, 9))
+        service.get_market_data("600000.XSHG", date(2025, 1, 11), date(2025, 1, 17))
+
+        assert first["bars"] == [] and second["bars"] == []
+        assert calls == [(date(2025, 1, 6), date(2025, 1, 10)), (date(2025, 1, 13), date(2025, 1, 17))]
+        coverage = db.session.query(MarketDataCoverage).all()
+        assert [(row.start_date, row.end_date) for row in coverage] == [(date(2025, 1, 6), date(2025, 1, 17))]
+
+
+def test_market_data_service_does_not_cover_failed_fetches(app, monkeypatch):
+    from app.models import MarketDataCoverage
+    from app.services.market_data import MarketDataService
+    from app.utils.cache import MemoryCache
+
+    monkeypatch.setattr("app.utils.cache._cache_instance", MemoryCache())
+
+    def _raise_failure(*args, **kwargs):
+        raise RuntimeError("joinquant unavailable")
+
+    with app.app_context():
+        service = MarketDataService(client=SimpleNamespace(fetch_daily_data=_raise_failure))
+        service.get_market_data("600000.XSHG", date(2025, 1, 6), date(2025, 1, 10))
+
+        assert db.session.query(MarketDataCoverage).count() == 0
+
+
+def test_market_data_service_fetches_many_symbols_in_one_batch(app, monkeypatch):
+    from app.services.market_data import MarketDataService
+    from app.utils.cache import MemoryCache
+
+    monkeypatch.setattr("app.utils.cache._cache_instance", MemoryCache())
+    calls = []
+
+    def _fetch_daily_data_many(symbols, start_date, end_date):
+        calls.append((symbols, start_date, end_date))
+        return {
+            symbol: [
+                {
+                    "symbol": symbol,
+                    "trade_date": trade_date,
+                    "open": 10.0,
+                    "high": 10.5,
+                    "low": 9.8,
+                    "close": 10.2,
+                    "volume": 100000,
+                    "source": "joinquant",
+                }
+                for trade_date in (date(2025, 1, 2), date(2025, 1, 3))
+            ]
+            for symbol in symbols
+        }
+
+    def _unexpected_single_fetch(*args, **kwargs):
+        raise AssertionError("batched fetch should be used")
+
+    with app.app_context():
+        db.session.add_all([_cache_row(trade_date=date(2025, 1, 2)), _cache_row(trade_date=date(2025, 1, 3))])
+        db.session.commit()
+
+        client = SimpleNamespace(fetch_daily_data=_unexpected_single_fetch, fetch_daily_data_many=_fetch_daily_data_many)
+        service = MarketDataService(client=client)
+        result = service.get_market_data_many(
+            ["600000.XSHG", "000001.XSHE", "600519.XSHG"], date(2025, 1, 2), date(2025, 1, 3)
+        )
+        again = service.get_market_data_many(["600000.XSHG", "600519.XSHG"], date(2025, 1, 2), date(2025, 1, 3))
+
+        assert calls == [(["600000.XSHG", "600519.XSHG"], date(2025, 1, 2), date(2025, 1, 3))]
+        assert list(result) == ["600000.XSHG", "000001.XSHE", "600519.XSHG"]
+        assert all(len(entry["bars"]) == 2 and entry["data_range_notice"] is None for entry in result.values())
+        assert [bar["trade_date"] for bar in again["600519.XSHG"]["bars"]] == [date(2025, 1, 2), date(2025, 1, 3)]
+
+
+def test_market_data_service_many_reports_notices_for_failed_symbols_only(app, monkeypatch):
+    from app.services.market_data import MarketDataService
+    from app.utils.cache import MemoryCache
+
+    monkeypatch.setattr("app.utils.cache._cache_instance", MemoryCache())
+
+    def _raise_failure(*args, **kwargs):
+        raise RuntimeError("joinquant unavailable")
+
+    with app.app_context():
+        db.session.add_all([_cache_row(trade_date=date(2025, 1, 2)), _cache_row(trade_date=date(2025, 1, 3))])
+        db.session.commit()
+
+        service = MarketDataService(client=SimpleNamespace(fetch_daily_data=_raise_failure))
+        result = service.get_market_data_many(["000001.XSHE", "600000.XSHG"], date(2025, 1, 2), date(2025, 1, 3))
+
+        assert result["000001.XSHE"]["data_range_notice"] is None
+        assert result["600000.XSHG"]["bars"] == []
+        assert result["600000.XSHG"]["data_range_notice"] is not None
+
+
 def test_market_data_service_bulk_insert_is_idempotent(app):
     from app.models import MarketDataCache
     from app.services.market_data import MarketDataService
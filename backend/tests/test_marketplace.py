@@ -1180,6 +1180,27 @@ def test_trial_backtest_creates_job_without_importing_strategy(client, app, tmp_
         assert Strategy.query.filter_by(owner_id=user_id, source_strategy_id=strategy_id).count() == 0
 
 
+def test_trial_backtest_forwards_bypass_cache(client, app, tmp_path):
+    token, user_id = _login_user(client, phone="13800138193", nickname="TrialBypassUser")
+    strategy_id = _seed_marketplace_strategy(app, tmp_path)
+
+    with app.app_context():
+        strategy = db.session.get(Strategy, strategy_id)
+        strategy.trial_backtest_enabled = True
+        db.session.commit()
+
+    response = client.post(
+        f"/api/v1/marketplace/strategies/{strategy_id}/trial-backtest",
+        headers=_auth_headers(token),
+        json={"params": {}, "bypassCache": True},
+    )
+
+    assert response.status_code == 200
+    with app.app_context():
+        job = BacktestJob.query.filter_by(user_id=user_id, strategy_id=strategy_id).one()
+        assert job.params["bypass_cache"] is True
+
+
 def test_trial_backtest_reuses_preflight_for_non_object_strategy_params(client, app, tmp_path):
     token, user_id = _login_user(client, phone="13800138117", nickname="TrialInvalidParamsUser")
     strategy_id = _seed_marketplace_strategy(app, tmp_path)
@@ -0,0 +1,291 @@
+"""Parity checks between the vectorized metrics kernels and the original per-element loops."""
+
+import math
+import random
+from datetime import datetime, timezone
+
+import pytest
+
+from app.backtest.engine import _calculate_summary
+from app.report_agent.quant_engine import (
+    MS_PER_DAY,
+    SECONDS_PER_YEAR,
+    annualize_ratio,
+    build_equity_curve,
+    build_monthly_returns,
+    build_summary_metrics,
+    compute_all_metrics,
+    empty_summary,
+    match_closed_trades,
+    max_consecutive_losses_count,
+    normalize_trades,
+)
+
+
+def _reference_equity_curve(bars, trades, initial_capital):
+    if not bars:
+        return []
+    bars = sorted(bars, key=lambda item: item["time"])
+    cash = float(initial_capital)
+    position = 0.0
+    benchmark_base = bars[0]["close"] or 1.0
+    trade_index = 0
+    equity_curve = []
+    for bar in bars:
+        while trade_index < len(trades) and trades[trade_index]["timestamp"] <= bar["time"]:
+            trade = trades[trade_index]
+            notional = trade["price"] * trade["quantity"]
+            if trade["side"] == "buy":
+                cash -= notional
+                position += trade["quantity"]
+            else:
+                cash += notional
+                position -= trade["quantity"]
+            trade_index += 1
+        benchmark_equity = float(initial_capital) * (bar["close"] / benchmark_base if benchmark_base else 1.0)
+        equity = cash + position * bar["close"]
+        equity_curve.append(
+            {
+                "timestamp": bar["time"],
+                "equity": round(equity, 4),
+                "benchmark_equity": round(benchmark_equity, 4),
+            }
+        )
+    peak = equity_curve[0]["equity"]
+    for point in equity_curve:
+        peak = max(peak, point["equity"])
+        drawdown = (point["equity"] / peak - 1.0) * 100.0 if peak > 0 else 0.0
+        point["drawdown"] = round(drawdown, 4)
+    return equity_curve
+
+
+def _reference_monthly_returns(equity_curve):
+    buckets = {}
+    for point in equity_curve:
+        month_key = datetime.fromtimestamp(point["timestamp"] / 1000.0, tz=timezone.utc).strftime("%Y-%m")
+        bucket = buckets.setdefault(month_key, {"start_equity": point["equity"], "end_equity": point["equity"]})
+        bucket["end_equity"] = point["equity"]
+    monthly_returns = []
+    for month_key in sorted(buckets.keys()):
+        start_equity = buckets[month_key]["start_equity"] or 1.0
+        end_equity = buckets[month_key]["end_equity"]
+        monthly_returns.append(
+            {
+                "month": month_key,
+                "return": round((end_equity / start_equity - 1.0) * 100.0 if start_equity else 0.0, 4),
+            }
+        )
+    return monthly_returns
+
+
+def _average(values):
+    return sum(values) / len(values) if values else 0.0
+
+
+def _stddev(values):
+    if not values:
+        return 0.0
+    mean = _average(values)
+    return math.sqrt(sum((value - mean) ** 2 for value in values) / len(values))
+
+
+def _returns(values):
+    return [values[i] / values[i - 1] - 1.0 if values[i - 1] else 0.0 for i in range(1, len(values))]
+
+
+def _beta(strategy_returns, benchmark_returns):
+    paired = list(zip(strategy_returns, benchmark_returns))
+    if len(paired) < 2:
+        return 0.0
+    strategy_mean = _average([pair[0] for pair in paired])
+    benchmark_mean = _average([pair[1] for pair in paired])
+    variance = sum((pair[1] - benchmark_mean) ** 2 for pair in paired) / len(paired)
+    if variance == 0:
+        return 0.0
+    covariance = sum((pair[0] - strategy_mean) * (pair[1] - benchmark_mean) for pair in paired) / len(paired)
+    return covariance / variance
+
+
+def _reference_summary(equity_curve, trades):
+    if len(equity_curve) < 2:
+        return empty_summary()
+    equities = [point["equity"] for point in equity_curve]
+    benchmarks = [point["benchmark_equity"] for point in equity_curve]
+    initial_equity = equities[0] or 1.0
+    total_return_ratio = equities[-1] / initial_equity
+    duration_days = max((equity_curve[-1]["timestamp"] - equity_curve[0]["timestamp"]) / MS_PER_DAY, 1 / 365)
+    annualized_return = annualize_ratio(total_return_ratio, duration_days)
+    strategy_returns = _returns(equities)
+    benchmark_returns = _returns(benchmarks)
+    delta_ms = max(equity_curve[1]["timestamp"] - equity_curve[0]["timestamp"], 1)
+    periods_per_year = max(SECONDS_PER_YEAR / max(delta_ms / 1000.0, 1.0), 1.0)
+    avg_return = _average(strategy_returns)
+    std_dev = _stddev(strategy_returns)
+    downside_std = _stddev([item for item in strategy_returns if item < 0.0])
+    max_drawdown = min(point["drawdown"] for point in equity_curve)
+    closed_trades = match_closed_trades(trades)
+    wins = [trade for trade in closed_trades if trade["pnl"] > 0]
+    losses = [trade for trade in closed_trades if trade["pnl"] < 0]
+    gross_loss = abs(sum(trade["pnl"] for trade in losses))
+    beta = _beta(strategy_returns, benchmark_returns)
+    alpha = (avg_return - beta * _average(benchmark_returns)) * periods_per_year * 100.0 if strategy_returns else 0.0
+    return {
+        "totalReturn": round((total_return_ratio - 1.0) * 100.0, 4),
+        "annualizedReturn": round(annualized_return, 4),
+        "maxDrawdown": round(max_drawdown, 4),
+        "sharpeRatio": round(avg_return / std_dev * math.sqrt(periods_per_year) if std_dev > 0 else 0.0, 4),
+        "volatility": round(std_dev * math.sqrt(periods_per_year) * 100.0 if std_dev > 0 else 0.0, 4),
+        "sortinoRatio": round(
+            avg_return / downside_std * math.sqrt(periods_per_year) if downside_std > 0 else 0.0, 4
+        ),
+        "calmarRatio": round(annualized_return / abs(max_drawdown) if max_drawdown < 0 else 0.0, 4),
+        "winRate": round(len(wins) / len(closed_trades) * 100.0 if closed_trades else 0.0, 4),
+        "profitLossRatio": round(sum(trade["pnl"] for trade in wins) / gross_loss if gross_loss > 0 else 0.0, 4),
+        "maxConsecutiveLosses": int(max_consecutive_losses_count(closed_trades)),
+        "avgHoldingDays": round(_average([trade["holding_days"] for trade in closed_trades]), 4),
+        "totalTrades": len(closed_trades),
+        "alpha": round(alpha, 4),
+        "beta": round(beta, 4),
+    }
+
+
+def _reference_calculate_summary(bars):
+    closes = [bar["close"] for bar in bars]
+    total_return = (closes[-1] / closes[0] - 1) * 100
+    duration_days = max((bars[-1]["time"] - bars[0]["time"]) / 86_400_000, 1)
+    returns = [(closes[i] / closes[i - 1] - 1) for i in range(1, len(closes))]
+    std_dev = _stddev(returns)
+    period_seconds = max((bars[1]["time"] - bars[0]["time"]) / 1000, 1)
+    periods_per_year = 31_536_000 / period_seconds
+    max_drawdown = 0
+    peak = closes[0]
+    for close in closes:
+        peak = max(peak, close)
+        max_drawdown = min(max_drawdown, (close / peak - 1) * 100)
+    profit = sum(r for r in returns if r > 0)
+    loss = sum(r for r in returns if r < 0)
+    return {
+        "totalReturn": round(total_return, 4),
+        "annualizedReturn": round((pow(1 + total_return / 100, 365 / duration_days) - 1) * 100, 4),
+        "sharpeRatio": round(_average(returns) / std_dev * math.sqrt(periods_per_year) if std_dev > 0 else 0, 4),
+        "maxDrawdown": round(max_drawdown, 4),
+        "winRate": round(sum(1 for r in returns if r > 0) / len(returns) * 100, 2),
+        "profitFactor": round(profit / abs(loss) if loss < 0 else 0, 4),
+        "totalTrades": len(returns),
+        "avgHoldingDays": round(period_seconds / 86_400, 4),
+    }
+
+
+def _random_walk(seed, count, step_ms, start=1_672_531_200_000):
+    rng = random.Random(seed)
+    close = 100.0
+    bars = []
+    for index in range(count):
+        close = max(close * (1 + rng.gauss(0, 0.02)), 1.0)
+        bars.append(
+            {
+                "time": start + index * step_ms,
+                "open": close,
+                "high": close * 1.01,
+                "low": close * 0.99,
+                "close": close,
+                "volume": float(rng.randint(100, 1000)),
+            }
+        )
+    return bars
+
+
+def _random_trades(seed, bars, count):
+    rng = random.Random(seed)
+    trades = []
+    for _ in range(count):
+        bar = rng.choice(bars)
+        offset = rng.choice([0, -1, 1, 30_000])
+        trades.append(
+            {
+                "symbol": "BTCUSDT",
+                "side": rng.choice(["buy", "sell"]),
+                "price": round(bar["close"] * rng.uniform(0.99, 1.01), 2),
+                "quantity": float(rng.randint(1, 20)),
+                "timestamp": bar["time"] + offset,
+                "pnl": None,
+            }
+        )
+    trades.append(dict(trades[0], timestamp=bars[-1]["time"] + 1))
+    return trades
+
+
+def _assert_numbers_match(actual, expected):
+    assert actual.keys() == expected.keys()
+    for key, value in expected.items():
+        assert actual[key] == pytest.approx(value, rel=1e-9, abs=1e-4), key
+
+
+CASES = [
+    (1, 400, 60_000, 60),
+    (2, 900, 3_600_000, 120),
+    (3, 1500, MS_PER_DAY, 200),
+    (4, 50, MS_PER_DAY * 7, 0),
+]
+
+
+@pytest.mark.parametrize("seed,count,step_ms,trade_count", CASES)
+def test_equity_curve_matches_reference_loop(seed, count, step_ms, trade_count):
+    bars = _random_walk(seed, count, step_ms)
+    trades = normalize_trades(_random_trades(seed, bars, trade_count) if trade_count else [])
+
+    assert build_equity_curve(bars, trades, 100_000.0) == _reference_equity_curve(bars, trades, 100_000.0)
+
+
+@pytest.mark.parametrize("seed,count,step_ms,trade_count", CASES)
+def test_monthly_returns_and_summary_match_reference(seed, count, step_ms, trade_count):
+    bars = _random_walk(seed, count, step_ms)
+    trades = normalize_trades(_random_trades(seed, bars, trade_count) if trade_count else [])
+    curve = _reference_equity_curve(bars, trades, 100_000.0)
+
+    assert build_monthly_returns(curve) == _reference_monthly_returns(curve)
+    _assert_numbers_match(build_summary_metrics(curve, trades), _reference_summary(curve, trades))
+
+
+def test_compute_all_metrics_matches_reference_for_unsorted_bars():
+    bars = _random_walk(11, 600, 3_600_000)
+    trades = _random_trades(11, bars, 80)
+    shuffled = list(bars)
+    random.Random(5).shuffle(shuffled)
+
+    computed = compute_all_metrics(shuffled, trades)
+    normalized = normalize_trades(trades)
+    curve = _reference_equity_curve(bars, normalized, 100_000.0)
+
+    assert computed["equity_curve"] == curve
+    assert computed["drawdown_series"] == [{"timestamp": p["timestamp"], "drawdown": p["drawdown"]} for p in curve]
+    assert computed["monthly_returns"] == _reference_monthly_returns(curve)
+    _assert_numbers_match(computed["metrics"], _reference_summary(curve, normalized))
+
+
+def test_monthly_returns_keep_first_and_last_occurrence_order():
+    curve = [
+        {"timestamp": 1_675_209_600_000, "equity": 110.0, "benchmark_equity": 1.0, "drawdown": 0.0},
+        {"timestamp": 1_672_531_200_000, "equity": 100.0, "benchmark_equity": 1.0, "drawdown": 0.0},
+        {"timestamp": 1_672_617_600_000, "equity": 0.0, "benchmark_equity": 1.0, "drawdown": 0.0},
+        {"timestamp": 1_672_704_000_000, "equity": 105.0, "benchmark_equity": 1.0, "drawdown": 0.0},
+    ]
+
+    assert build_monthly_returns(curve) == _reference_monthly_returns(curve)
+
+
+def test_equity_curve_handles_non_positive_peaks():
+    bars = _random_walk(7, 30, MS_PER_DAY)
+    trades = normalize_trades(
+        [{"side": "buy", "price": 1_000_000.0, "quantity": 1.0, "timestamp": bars[0]["time"]}]
+    )
+
+    assert build_equity_curve(bars, trades, 1_000.0) == _reference_equity_curve(bars, trades, 1_000.0)
+    assert compute_all_metrics([], trades)["equity_curve"] == []
+
+
+@pytest.mark.parametrize("seed,count,step_ms", [(21, 2, 60_000), (22, 500, 60_000), (23, 2000, MS_PER_DAY)])
+def test_engine_summary_matches_reference_loop(seed, count, step_ms):
+    bars = _random_walk(seed, count, step_ms)
+
+    _assert_numbers_match(_calculate_summary(bars), _reference_calculate_summary(bars))
@@ -0,0 +1,305 @@
+import threading
+
+from app.strategy_runtime.errors import StrategyRuntimeError
+
+
+def _fake_batch(calls, fail_key=None):
+    def _run(param_sets, **kwargs):
+        calls.append({"params": list(param_sets), "kwargs": kwargs, "thread": threading.current_thread().name})
+        if fail_key is not None and any(item.get("x") == fail_key for item in param_sets):
+            raise RuntimeError("data_unavailable")
+        return [
+            StrategyRuntimeError("invalid_strategy_params") if item["x"] < 0 else {
+                "summary": {"totalReturn": item["x"]},
+                "trades": [],
+                "kline": object(),
+            }
+            for item in param_sets
+        ]
+
+    return _run
+
+
+def test_local_evaluator_fans_out_and_keeps_order(app, monkeypatch):
+    from app.services.optimizer_evaluators import LocalEvaluator
+
+    calls = []
+    monkeypatch.setattr("app.services.optimizer_evaluators.run_backtest_batch", _fake_batch(calls, fail_key=5))
+    param_sets = [{"x": value} for value in [1, 2, -1, 4, 5, 6, 7, 8]]
+
+    with app.app_context():
+        results = LocalEvaluator(4).evaluate(param_sets, {"symbol": "BTCUSDT"})
+
+    assert len(calls) == 4
+    assert all(call["thread"].startswith("optimizer") for call in calls)
+    assert all(call["kwargs"] == {"symbol": "BTCUSDT"} for call in calls)
+    assert [item["summary"]["totalReturn"] for item in results[:2]] == [1, 2]
+    assert isinstance(results[2], StrategyRuntimeError)
+    assert results[3] == {"summary": {"totalReturn": 4}, "trades": []}
+    assert all(isinstance(item, RuntimeError) for item in results[4:6])
+    assert [item["summary"]["totalReturn"] for item in results[6:]] == [7, 8]
+
+
+def test_celery_evaluator_runs_batches_as_group(app, monkeypatch):
+    from app.services.optimizer_evaluators import CeleryEvaluator
+
+    calls = []
+    monkeypatch.setattr("app.services.optimizer_evaluators.run_backtest_batch", _fake_batch(calls))
+
+    with app.app_context():
+        results = CeleryEvaluator(2).evaluate([{"x": 1}, {"x": -1}, {"x": 3}], {"symbol": "BTCUSDT"})
+
+    assert len(calls) == 2
+    assert results[0] == {"summary": {"totalReturn": 1}, "trades": []}
+    assert isinstance(results[1], StrategyRuntimeError)
+    assert results[1].message == "invalid_strategy_params"
+    assert results[2] == {"summary": {"totalReturn": 3}, "trades": []}
+
+
+def test_optimizer_concurrency_is_capped_by_plan(app):
+    from app.extensions import db
+    from app.models import User
+    from app.services.optimizer import _resolve_concurrency
+
+    with app.app_context():
+        free = User(phone="13800000001", nickname="Free", plan_level="free")
+        pro = User(phone="13800000002", nickname="Pro", plan_level="pro")
+        db.session.add_all([free, pro])
+        db.session.commit()
+
+        assert _resolve_concurrency(8, free.id) == 2
+        assert _resolve_concurrency(8, pro.id) == 8
+        assert _resolve_concurrency(16, pro.id) == 16
+        assert _resolve_concurrency(4, None) == 2
+
+
+def test_optimize_parameters_evaluates_with_configured_concurrency(app, monkeypatch):
+    from app.services import optimizer
+
+    calls = []
+    monkeypatch.setattr("app.services.optimizer_evaluators.run_backtest_batch", _fake_batch(calls))
+
+    with app.app_context():
+        result = optimizer.optimize_parameters(
+            strategy_id="strategy-1",
+            strategy_version=None,
+            parameters=[{"key": "x", "type": "integer", "min": 1, "max": 9, "default": 1}],
+            symbol="BTCUSDT",
+            start_time=1700000000000,
+            end_time=1700086400000,
+            level="quick",
+        )
+
+    assert result.evaluations == 3
+    assert result.top_results[0]["params"] == {"x": 9}
+    # Free plan caps "quick" (4) at 2: the grid and the out-of-sample pass each split into two batches.
+    assert sorted(len(call["params"]) for call in calls) == [1, 1, 2, 2]
+    assert all(call["thread"].startswith("optimizer") for call in calls)
+
+
+def test_optimize_parameters_loads_bars_once_and_splits_in_memory(app, monkeypatch):
+    from app.backtest.providers import MockProvider
+    from app.services import optimizer
+
+    loads = []
+    calls = []
+
+    def _fake_load(symbol, **kwargs):
+        loads.append(kwargs)
+        return MockProvider().get_bars(symbol, limit=10)
+
+    monkeypatch.setattr("app.services.optimizer.load_backtest_bars", _fake_load)
+    monkeypatch.setattr("app.services.optimizer_evaluators.run_backtest_batch", _fake_batch(calls))
+
+    with app.app_context():
+        optimizer.optimize_parameters(
+            strategy_id="strategy-1",
+            strategy_version=None,
+            parameters=[{"key": "x", "type": "integer", "min": 1, "max": 9, "default": 1}],
+            symbol="BTCUSDT",
+            start_time=1700000000000,
+            end_time=1700000540000,
+            level="deep",
+            split_ratio=0.5,
+        )
+
+    assert loads == [{
+        "interval": None,
+        "limit": None,
+        "start_time": 1700000000000,
+        "end_time": 1700000540000,
+        "data_source": None,
+    }]
+    windows = {(int(call["kwargs"]["bars"].time[0]), int(call["kwargs"]["bars"].time[-1])) for call in calls}
+    # Every search phase, Bayesian included, scores on the in-sample bars only.
+    assert windows == {
+        (1700000000000, 1700000240000),
+        (1700000300000, 1700000540000),
+    }
+    assert all("start_time" not in call["kwargs"] for call in calls)
+
+
+def test_gaussian_process_incremental_update_matches_full_factorization():
+    import numpy as np
+
+    from app.services.gaussian_process import GaussianProcess, rbf_kernel
+
+    rng = np.random.default_rng(7)
+    x = rng.random((12, 2))
+    y = np.sin(6 * x[:, 0]) + x[:, 1]
+
+    surrogate = GaussianProcess(length_scale=0.3).fit(x[:8], y[:8])
+    for row, value in zip(x[8:], y[8:]):
+        surrogate.add_observation(row, value)
+
+    expected = np.linalg.cholesky(rbf_kernel(x, x, 0.3) + surrogate._jitter * np.eye(len(x)))
+    assert np.allclose(surrogate._chol, expected, atol=1e-9)
+    mean, std = surrogate.predict(x)
+    assert np.allclose(mean, y, atol=1e-3)
+    assert np.all(std < 1e-2)
+
+
+def test_suggest_points_proposes_distinct_snapped_batch():
+    import numpy as np
+
+    from app.services.optimizer import _build_search_space, _suggest_points
+
+    space = _build_search_space([
+        {"key": "fast", "type": "integer", "min": 2, "max": 20},
+        {"key": "ratio", "type": "number", "min": 0.0, "max": 1.0, "step": 0.25},
+    ])
+    evaluated = [{"fast": 2, "ratio": 0.0}, {"fast": 20, "ratio": 1.0}, {"fast": 10, "ratio": 0.5}]
+
+    points = _suggest_points(space, evaluated, [0.0, 1.0, 2.0], 4, np.random.default_rng(3))
+
+    assert len(points) == 4
+    assert all(isinstance(point["fast"], int) and 2 <= point["fast"] <= 20 for point in points)
+    assert all(point["ratio"] in {0.0, 0.25, 0.5, 0.75, 1.0} for point in points)
+    keys = {(point["fast"], point["ratio"]) for point in points}
+    assert len(keys) == 4
+    assert not keys & {(item["fast"], item["ratio"]) for item in evaluated}
+
+
+def test_bayesian_optimize_converges_on_smooth_objective(monkeypatch):
+    import numpy as np
+
+    from app.services import optimizer
+
+    def _objective(params):
+        return -((params["a"] - 0.3) ** 2 + (params["b"] - 0.7) ** 2)
+
+    class _Evaluator:
+        concurrency = 4
+
+        def evaluate(self, param_sets, backtest_kwargs):
+            return [{"summary": {"totalReturn": _objective(params)}, "trades": []} for params in param_sets]
+
+    monkeypatch.setattr(optimizer, "_compute_objective", lambda summary, weights: summary["totalReturn"])
+    space = optimizer._build_search_space([
+        {"key": "a", "type": "number", "min": 0.0, "max": 1.0},
+        {"key": "b", "type": "number", "min": 0.0, "max": 1.0},
+    ])
+    seed = [{"params": params, "score": _objective(params)} for params in optimizer._generate_grid(space, 3)]
+
+    results = optimizer._bayesian_optimize(
+        space, seed, 24, "strategy-1", None, "BTCUSDT", None, None, None,
+        weights={}, evaluator=_Evaluator(), data=optimizer._SampleData(None, None),
+        rng=np.random.default_rng(11),
+    )
+
+    assert len(results) == 24
+    assert max(item["score"] for item in results) > -0.002
+
+
+def test_hyperband_search_prunes_on_growing_prefixes(monkeypatch):
+    import numpy as np
+
+    from app.backtest.providers import MockProvider
+    from app.backtest.frame import BarFrame
+    from app.services import optimizer
+
+    lengths = []
+
+    class _Evaluator:
+        concurrency = 4
+
+        def evaluate(self, param_sets, backtest_kwargs):
+            lengths.append((len(backtest_kwargs["bars"]), len(param_sets)))
+            return [{"summary": {"totalReturn": params["x"]}, "trades": []} for params in param_sets]
+
+    monkeypatch.setattr(optimizer, "_compute_objective", lambda summary, weights: summary["totalReturn"])
+    in_sample = BarFrame.coerce(MockProvider().get_bars("BTCUSDT", limit=90))
+    grid = [{"x": x} for x in range(9)]
+
+    outcome = optimizer._hyperband_search(
+        grid, "strategy-1", None, "BTCUSDT", None, None, None,
+        weights={}, evaluator=_Evaluator(), data=optimizer._SampleData(in_sample, None),
+        eta=3, min_bars=10,
+    )
+
+    assert lengths == [(10, 9), (30, 3), (90, 1)]
+    assert [item["params"] for item in outcome.results] == [{"x": 8}]
+    assert outcome.candidates == 9
+    assert outcome.evaluations == 13
+    assert outcome.bar_evaluations == 270
+    assert outcome.candidates * len(in_sample) - outcome.bar_evaluations == 540
+
+    lengths.clear()
+    outcome = optimizer._hyperband_search(
+        grid, "strategy-1", None, "BTCUSDT", None, None, None,
+        weights={}, evaluator=_Evaluator(), data=optimizer._SampleData(in_sample, None),
+        eta=3, min_bars=10, brackets=3, rng=np.random.default_rng(5),
+    )
+
+    # Later brackets start on longer prefixes and reuse anything already run at that length.
+    assert [length for length, _ in lengths][:3] == [10, 30, 90]
+    assert all(length in (30, 90) for length, _ in lengths[3:])
+    assert outcome.results[0]["params"] == {"x": 8}
+    assert outcome.evaluations == sum(count for _, count in lengths)
+
+
+def test_optimize_parameters_halving_level_reports_saved_bar_evaluations(app, monkeypatch):
+    from app.backtest.providers import MockProvider
+    from app.services import optimizer
+
+    calls = []
+    monkeypatch.setattr(
+        "app.services.optimizer.load_backtest_bars",
+        lambda symbol, **kwargs: MockProvider().get_bars(symbol, limit=1440),
+    )
+    monkeypatch.setattr("app.services.optimizer_evaluators.run_backtest_batch", _fake_batch(calls))
+
+    with app.app_context():
+        result = optimizer.optimize_parameters(
+            strategy_id="strategy-1",
+            strategy_version=None,
+            parameters=[{"key": "x", "type": "integer", "min": 1, "max": 9, "default": 1}],
+            symbol="BTCUSDT",
+            start_time=1700000000000,
+            end_time=1700086400000,
+            level="halving",
+        )
+
+    # 1152 in-sample bars, eta 3: seven grid points on 128 bars, three on 384, one on all 1152.
+    assert result.top_results[0]["params"] == {"x": 9}
+    assert result.evaluations == 11
+    assert result.bar_evaluations == 7 * 128 + 3 * 384 + 1152
+    assert result.bar_evaluations_saved == 7 * 1152 - result.bar_evaluations
+    in_sample_calls = [call for call in calls if int(call["kwargs"]["bars"].time[0]) == 1700000000000]
+    assert result.bar_evaluations == sum(len(call["params"]) * len(call["kwargs"]["bars"]) for call in in_sample_calls)
+
+
+def test_sample_split_puts_the_split_bar_out_of_sample_only(monkeypatch):
+    from app.backtest.frame import BarFrame
+    from app.backtest.providers import MockProvider
+    from app.services import optimizer
+
+    bars = BarFrame.coerce(MockProvider().get_bars("BTCUSDT", limit=11))
+    monkeypatch.setattr("app.services.optimizer.load_backtest_bars", lambda symbol, **kwargs: bars)
+    start, end = int(bars.time[0]), int(bars.time[-1])
+
+    data = optimizer._load_sample_data("BTCUSDT", None, None, start, end, None, 0.5)
+
+    assert len(data.in_sample) + len(data.out_of_sample) == len(bars)
+    assert int(data.out_of_sample.time[0]) == start + (end - start) // 2
+    assert int(data.in_sample.time[-1]) < int(data.out_of_sample.time[0])
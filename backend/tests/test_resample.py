@@ -0,0 +1,117 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from app.backtest.bar_store import BarStore
+from app.backtest.frame import BarFrame
+from app.backtest.resample import A_SHARE_SESSIONS, A_SHARE_UTC_OFFSET_MS, resample
+
+
+MINUTE_MS = 60_000
+DAY_MS = 86_400_000
+BEIJING = timezone(timedelta(hours=8))
+
+
+def _minutes(start_ms, times=None, count=None):
+    if times is None:
+        times = start_ms + np.arange(count, dtype=np.int64) * MINUTE_MS
+    steps = np.arange(len(times), dtype=np.float64)
+    return BarFrame(times, 100 + steps, 101 + steps, 99 - steps, 100.5 + steps, 1 + steps)
+
+
+def _beijing_ms(hour, minute):
+    return int(datetime(2025, 1, 2, hour, minute, tzinfo=BEIJING).timestamp() * 1000)
+
+
+def test_resample_aggregates_ohlcv_per_bucket():
+    bars = _minutes(1_700_000_100_000 - 1_700_000_100_000 % (5 * MINUTE_MS), count=12)
+
+    five = resample(bars, 5 * MINUTE_MS)
+
+    assert five.time.tolist() == [bars.time[0], bars.time[5], bars.time[10]]
+    assert five.open.tolist() == [100.0, 105.0, 110.0]
+    assert five.high.tolist() == [105.0, 110.0, 112.0]
+    assert five.low.tolist() == [95.0, 90.0, 88.0]
+    assert five.close.tolist() == [104.5, 109.5, 111.5]
+    assert five.volume.tolist() == [15.0, 40.0, 23.0]
+
+
+def test_resample_restarts_buckets_at_each_a_share_session():
+    morning = [_beijing_ms(9, 30) + index * MINUTE_MS for index in range(120)]
+    afternoon = [_beijing_ms(13, 0) + index * MINUTE_MS for index in range(120)]
+    bars = _minutes(0, times=np.asarray(morning + afternoon, dtype=np.int64))
+
+    hourly = resample(bars, 60 * MINUTE_MS, A_SHARE_SESSIONS, A_SHARE_UTC_OFFSET_MS)
+    two_hourly = resample(bars, 120 * MINUTE_MS, A_SHARE_SESSIONS, A_SHARE_UTC_OFFSET_MS)
+
+    assert hourly.time.tolist() == [_beijing_ms(9, 30), _beijing_ms(10, 30), _beijing_ms(13, 0), _beijing_ms(14, 0)]
+    assert two_hourly.time.tolist() == [_beijing_ms(9, 30), _beijing_ms(13, 0)]
+    assert two_hourly.volume.sum() == bars.volume.sum()
+
+
+def test_resample_daily_bars_into_monday_weeks():
+    # 2025-01-01 is a Wednesday.
+    first_day = int(datetime(2025, 1, 1, tzinfo=timezone.utc).timestamp() * 1000)
+    days = np.asarray([first_day + index * DAY_MS for index in range(14)], dtype=np.int64)
+
+    weekly = resample(_minutes(0, times=days), 7 * DAY_MS)
+
+    assert [datetime.fromtimestamp(value / 1000, timezone.utc).strftime("%Y-%m-%d %a") for value in weekly.time] == [
+        "2024-12-30 Mon",
+        "2025-01-06 Mon",
+        "2025-01-13 Mon",
+    ]
+
+
+def test_engine_builds_coarser_intervals_from_stored_finer_bars(app, tmp_path, monkeypatch):
+    from app.backtest import engine
+
+    monkeypatch.setenv("BACKTEST_BAR_STORE_DIR", tmp_path.as_posix())
+    start = 1_700_000_000_000 - 1_700_000_000_000 % DAY_MS
+    stored = _minutes(start, count=24 * 60)
+    BarStore(tmp_path).append("binance", "BTCUSDT", "1m", stored, covered=(start, start + DAY_MS - MINUTE_MS))
+
+    class _Provider:
+        default_interval = "1m"
+
+        def get_bars(self, symbol, **kwargs):
+            raise AssertionError("covered 1m bars should serve 5m and 1h requests")
+
+    monkeypatch.setattr(engine, "get_backtest_provider", lambda data_source=None: _Provider())
+
+    with app.app_context():
+        five = engine.load_backtest_bars(
+            "BTCUSDT", interval="5m", start_time=start + 3 * MINUTE_MS, end_time=start + 60 * MINUTE_MS, data_source="binance"
+        )
+        hourly = engine.load_backtest_bars(
+            "BTCUSDT", interval="1h", start_time=start, end_time=start + 23 * 3_600_000, data_source="binance"
+        )
+
+    assert five.time[0] == start + 5 * MINUTE_MS and five.time[-1] == start + 60 * MINUTE_MS
+    assert len(hourly) == 24
+    assert hourly == resample(stored, 3_600_000)
+
+
+def test_engine_builds_weekly_gold_bars_from_daily_data(app, tmp_path, monkeypatch):
+    from app.backtest import engine
+
+    monkeypatch.setenv("BACKTEST_BAR_STORE_DIR", tmp_path.as_posix())
+    calls = []
+    first_day = int(datetime(2025, 1, 6, tzinfo=timezone.utc).timestamp() * 1000)
+
+    class _GoldProvider:
+        default_interval = "1d"
+        last_data_range_notice = None
+
+        def get_bars(self, symbol, limit=None, interval=None, **kwargs):
+            calls.append((interval, limit))
+            days = np.asarray([first_day + index * DAY_MS for index in range(21)], dtype=np.int64)
+            return _minutes(0, times=days)
+
+    monkeypatch.setattr(engine, "get_backtest_provider", lambda data_source=None: _GoldProvider())
+
+    with app.app_context():
+        weekly = engine.load_backtest_bars("XAUUSD", interval="1w", limit=2, data_source="sinagold")
+
+    assert calls == [("1d", 14)]
+    assert weekly.time.tolist() == [first_day + 7 * DAY_MS, first_day + 14 * DAY_MS]
@@ -353,3 +353,165 @@ def test_execute_strategy_allows_safe_imports_in_inline_local_mode(monkeypatch):
             "pnl": None,
         }
     ]
+
+
+def test_execute_strategy_batch_runs_each_param_set_locally(monkeypatch):
+    monkeypatch.setenv('FLASK_ENV', 'development')
+    monkeypatch.setenv('BACKTEST_SANDBOX_MODE', 'local')
+    monkeypatch.setenv('BACKTEST_SANDBOX_POOL_SIZE', '0')
+
+    from app.services.sandbox import SandboxService
+
+    service = SandboxService(sandbox_cls=object)
+
+    results = service.execute_strategy_batch(
+        code=(
+            'class Strategy:\n'
+            '    def on_bar(self, ctx, bar):\n'
+            '        ctx.log(ctx.params["size"])\n'
+            '        ctx.emit_order({"side": "buy", "price": bar.close, "quantity": ctx.params["size"]})\n'
+        ),
+        market_data={"symbol": "BTCUSDT", "bars": [{"time": 1, "close": 2.0}, {"time": 2, "close": 3.0}]},
+        param_sets=[{"size": 1}, {}, {"size": 2}],
+        metadata={"callable_name": "Strategy"},
+    )
+
+    assert [item["ok"] for item in results] == [True, False, True]
+    assert [trade["quantity"] for trade in results[0]["trades"]] == [1.0, 1.0]
+    assert results[0]["logs"] == ["1", "1"]
+    assert results[1]["error_code"] == "strategy_runtime_error"
+    assert [trade["quantity"] for trade in results[2]["trades"]] == [2.0, 2.0]
+    assert results[2]["logs"] == ["2", "2"]
+
+
+def test_execute_strategy_batch_sends_param_sets_to_remote_sandbox(monkeypatch):
+    monkeypatch.setenv('FLASK_ENV', 'development')
+    monkeypatch.delenv('BACKTEST_SANDBOX_MODE', raising=False)
+    monkeypatch.setenv('E2B_API_KEY', 'sandbox-key')
+    monkeypatch.setenv('E2B_WARM_POOL_SIZE', '0')
+
+    from app.services.sandbox import SandboxService
+
+    scripts = []
+
+    class FakeExecution:
+        text = (
+            '__QYQUANT_RESULT__={"ok": true, "result": {"results": ['
+            '{"ok": true, "trades": [], "logs": ["a"]}, {"ok": false, "error": "boom"}]}}'
+        )
+
+    class FakeSandbox:
+        def __init__(self, **kwargs):
+            pass
+
+        def run_code(self, script, **kwargs):
+            scripts.append(script)
+            return FakeExecution()
+
+        def kill(self):
+            pass
+
+    service = SandboxService(sandbox_cls=FakeSandbox)
+
+    results = service.execute_strategy_batch(
+        code='class Strategy:\n    pass\n',
+        market_data={"symbol": "BTCUSDT", "bars": []},
+        param_sets=[{"window": 5}, {"window": 10}],
+        metadata={"callable_name": "Strategy"},
+    )
+
+    assert results == [
+        {"ok": True, "trades": [], "logs": ["a"]},
+        {"ok": False, "error_code": "strategy_runtime_error", "error": "boom"},
+    ]
+    assert len(scripts) == 1
+    assert '"param_sets": [{"window": 5}, {"window": 10}]' in scripts[0]
+
+
+def _run_sandbox_script(script):
+    import json
+    import subprocess
+    import sys
+
+    from app.backtest.sandbox_template import RESULT_PREFIX
+
+    completed = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, timeout=60)
+    line = next(line for line in completed.stdout.splitlines() if line.startswith(RESULT_PREFIX))
+    return json.loads(line[len(RESULT_PREFIX):])
+
+
+def test_sandbox_script_times_out_each_param_set_alone():
+    from app.backtest.sandbox_template import build_sandbox_script
+
+    script = build_sandbox_script(
+        code=(
+            'class Strategy:\n'
+            '    def on_bar(self, ctx, bar):\n'
+            '        while ctx.params["hang"]:\n'
+            '            pass\n'
+            '        ctx.log("done")\n'
+        ),
+        market_data={"symbol": "BTCUSDT", "bars": [{"time": 1, "close": 2.0}]},
+        params=None,
+        metadata={"callable_name": "Strategy", "per_set_timeout_seconds": 0.5},
+        param_sets=[{"hang": False}, {"hang": True}, {"hang": False}],
+    )
+
+    results = _run_sandbox_script(script)["result"]["results"]
+
+    assert [item["ok"] for item in results] == [True, False, True]
+    assert results[1]["error_code"] == "strategy_timeout"
+    assert results[2]["logs"] == ["done"]
+
+
+PARITY_EVENT_SOURCE = '''
+def on_bar(ctx, bar):
+    closes = ctx.history("close", 20)
+    if len(closes) < 20:
+        return []
+    holding = ctx.symbol in ctx.account.positions
+    if closes[-5:].mean() > closes.mean() and not holding:
+        return [{"side": "buy", "quantity": 1}]
+    if closes[-5:].mean() <= closes.mean() and holding:
+        return [{"side": "sell", "quantity": 1}]
+    return []
+'''
+
+PARITY_VECTOR_SOURCE = '''
+import numpy as np
+
+
+def on_bars(ctx, frame):
+    fast = np.convolve(frame.close, np.ones(5) / 5)[:len(frame)]
+    slow = np.convolve(frame.close, np.ones(20) / 20)[:len(frame)]
+    slow[:19] = np.inf
+    return np.where(fast > slow, 1.0, 0.0)
+'''
+
+
+@pytest.mark.parametrize("source, callable_name, interface", [
+    (PARITY_EVENT_SOURCE, "on_bar", None),
+    (PARITY_VECTOR_SOURCE, "on_bars", "vector_v1"),
+])
+def test_sandbox_script_matches_local_runtime_trades(source, callable_name, interface):
+    import numpy as np
+
+    from app.backtest.frame import BarFrame
+    from app.backtest.sandbox_template import build_sandbox_script
+    from app.strategy_runtime.sandbox import run_strategy_inline
+
+    close = 1000.0 + np.cumsum(np.random.default_rng(3).integers(-5, 6, 400)).astype(float)
+    time = 1_700_000_000_000 + np.arange(400, dtype=np.int64) * 60_000
+    bars = BarFrame(time, close, close + 2, close - 2, close, np.full(400, 10.0))
+    rows = [
+        {"time": int(t), "open": c, "high": c + 2, "low": c - 2, "close": c, "volume": 10.0}
+        for t, c in zip(time.tolist(), close.tolist())
+    ]
+    metadata = {"callable_name": callable_name, "lookback": 20, "interface": interface}
+
+    remote = _run_sandbox_script(build_sandbox_script(source, {"symbol": "BTCUSDT", "bars": rows}, None, metadata))
+    local = run_strategy_inline("BTCUSDT", source, callable_name, bars, {}, lookback=20, interface=interface)
+
+    assert remote["ok"] is True
+    assert local["trades"]
+    assert remote["result"]["trades"] == local["trades"]
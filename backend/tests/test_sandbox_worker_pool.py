@@ -0,0 +1,178 @@
+import sys
+import threading
+import time
+
+import pytest
+
+from app.strategy_runtime.errors import StrategyRuntimeError
+from app.strategy_runtime.worker_pool import SandboxWorkerPool
+
+
+BUY_SOURCE = '''
+def run(ctx, bar):
+    return [{"side": "buy", "price": bar.close, "quantity": ctx.params["quantity"]}]
+'''
+
+LOOP_SOURCE = '''
+def run(ctx, bar):
+    while True:
+        pass
+'''
+
+
+def _run(pool, source=BUY_SOURCE, quantity=1, timeout_seconds=10):
+    return pool.run({
+        "symbol": "BTCUSDT",
+        "source": source,
+        "callable_name": "run",
+        "bars": [{"time": 1, "open": 10, "high": 11, "low": 9, "close": 10, "volume": 1}],
+        "params": {"quantity": quantity},
+    }, timeout_seconds)
+
+
+@pytest.fixture
+def pool():
+    instance = SandboxWorkerPool(size=1, max_runs=2, preload=())
+    instance.warm()
+    yield instance
+    instance.shutdown()
+
+
+def test_worker_pool_reuses_warm_worker(pool):
+    worker = pool._idle[0]
+
+    result = _run(pool, quantity=3)
+
+    assert result["ok"] is True
+    assert result["trades"][0]["quantity"] == 3
+    assert pool.stats() == {"size": 1, "idle": 1, "busy": 0, "runs": [1]}
+    assert pool._idle[0] is worker
+
+
+def test_worker_pool_recycles_worker_after_max_runs(pool):
+    worker = pool._idle[0]
+
+    _run(pool)
+    _run(pool)
+
+    assert pool.stats()["idle"] == 0
+    assert not worker.is_alive()
+    assert _run(pool)["ok"] is True
+    assert pool._idle[0] is not worker
+
+
+def test_worker_pool_timeout_kills_and_replaces_worker(pool):
+    worker = pool._idle[0]
+
+    with pytest.raises(StrategyRuntimeError) as excinfo:
+        _run(pool, source=LOOP_SOURCE, timeout_seconds=0.5)
+
+    assert excinfo.value.message == "strategy_timeout"
+    assert not worker.is_alive()
+    assert pool.stats()["busy"] == 0
+    assert _run(pool)["ok"] is True
+
+
+PATCH_SOURCE = '''
+import qysp.indicators as indicators
+
+
+def run(ctx, bar):
+    setattr(indicators, "sma", None)
+    setattr(indicators, "leaked_quantity", ctx.params["quantity"])
+    return []
+'''
+
+PROBE_SOURCE = '''
+import qysp.indicators as indicators
+
+
+def run(ctx, bar):
+    ctx.log(getattr(indicators, "leaked_quantity", None))
+    ctx.log(callable(indicators.sma))
+    return []
+'''
+
+
+def test_worker_pool_isolates_module_state_between_jobs():
+    pool = SandboxWorkerPool(size=1, max_runs=10, preload=('qysp.indicators',))
+    pool.warm()
+    try:
+        worker = pool._idle[0]
+        assert _run(pool, source=PATCH_SOURCE, quantity=7)["ok"] is True
+
+        probe = _run(pool, source=PROBE_SOURCE)
+
+        assert probe["logs"] == ["None", "True"]
+        assert pool._idle[0] is worker
+    finally:
+        pool.shutdown()
+
+
+def _children(pid):
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as handle:
+            return [int(item) for item in handle.read().split()]
+    except FileNotFoundError:
+        return []
+
+
+def _running(pid):
+    try:
+        with open(f"/proc/{pid}/stat") as handle:
+            return handle.read().rsplit(")", 1)[1].split()[0] not in {"Z", "X"}
+    except FileNotFoundError:
+        return False
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inspects /proc")
+def test_worker_pool_timeout_also_kills_the_job_process(pool):
+    worker_pid = pool._idle[0].process.pid
+    seen = []
+
+    def _watch():
+        deadline = time.monotonic() + 5
+        while not seen and time.monotonic() < deadline:
+            seen.extend(_children(worker_pid))
+            time.sleep(0.01)
+
+    watcher = threading.Thread(target=_watch)
+    watcher.start()
+    with pytest.raises(StrategyRuntimeError):
+        _run(pool, source=LOOP_SOURCE, timeout_seconds=0.5)
+    watcher.join()
+
+    assert seen
+    deadline = time.monotonic() + 2
+    while any(_running(pid) for pid in seen) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not any(_running(pid) for pid in seen)
+
+
+ALLOCATE_SOURCE = '''
+def run(ctx, bar):
+    ctx.log(len("x" * (ctx.params["quantity"] * 1024 * 1024)))
+    return []
+'''
+
+
+def test_worker_pool_recycles_after_a_job_peaks_past_the_rss_limit():
+    probe = SandboxWorkerPool(size=1, max_runs=50, preload=())
+    probe.warm()
+    _run(probe)
+    baseline = probe._idle[0].rss_mb
+    probe.shutdown()
+
+    pool = SandboxWorkerPool(size=1, max_runs=50, max_rss_mb=baseline + 150, preload=())
+    pool.warm()
+    try:
+        worker = pool._idle[0]
+        _run(pool)
+        assert pool._idle[0] is worker
+
+        assert _run(pool, source=ALLOCATE_SOURCE, quantity=300)["ok"] is True
+        assert worker.rss_mb > baseline + 150
+        assert pool.stats()["idle"] == 0
+        assert not worker.is_alive()
+    finally:
+        pool.shutdown()
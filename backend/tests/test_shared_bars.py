@@ -0,0 +1,66 @@
+from multiprocessing.shared_memory import SharedMemory
+
+import pytest
+
+from app.backtest.frame import BarFrame
+from app.strategy_runtime import worker_pool
+from app.strategy_runtime.sandbox import run_strategy_in_subprocess
+from app.strategy_runtime.shared_bars import AttachedBars, SharedBars, share_bars
+
+
+BUY_ON_UP_BAR = '''
+def run(ctx, bar):
+    if bar.close > bar.open:
+        return [{"side": "buy", "price": bar.close, "quantity": 1}]
+    return []
+'''
+
+
+def _frame(size):
+    opens = [100.0 + index for index in range(size)]
+    closes = [value + (1.0 if index % 2 else -1.0) for index, value in enumerate(opens)]
+    return BarFrame.from_columns({
+        "time": [1700000000000 + index * 60000 for index in range(size)],
+        "open": opens,
+        "high": [max(pair) for pair in zip(opens, closes)],
+        "low": [min(pair) for pair in zip(opens, closes)],
+        "close": closes,
+        "volume": [1000.0] * size,
+    })
+
+
+def test_attached_bars_are_views_of_the_shared_block():
+    frame = _frame(10)
+
+    with SharedBars(frame) as shared:
+        with AttachedBars(shared.descriptor) as attached:
+            assert attached.frame == frame
+            assert attached.frame.close.base is not None
+        name = shared.descriptor["name"]
+
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(name=name)
+
+
+def test_share_bars_skips_small_inputs(monkeypatch):
+    monkeypatch.setenv("BACKTEST_SANDBOX_SHM_MIN_BARS", "100")
+
+    assert share_bars(_frame(10)) is None
+    assert share_bars([]) is None
+
+
+@pytest.mark.parametrize("pool_size", ["0", "1"])
+def test_subprocess_runner_reads_bars_from_shared_memory(monkeypatch, pool_size):
+    monkeypatch.setenv("BACKTEST_SANDBOX_SHM_MIN_BARS", "1")
+    monkeypatch.setenv("BACKTEST_SANDBOX_POOL_SIZE", pool_size)
+    worker_pool.shutdown_worker_pool()
+    frame = _frame(500)
+
+    try:
+        result = run_strategy_in_subprocess("BTCUSDT", BUY_ON_UP_BAR, "run", frame, {})
+    finally:
+        worker_pool.shutdown_worker_pool()
+
+    assert len(result["trades"]) == 250
+    assert result["trades"][0]["timestamp"] == 1700000060000
+    assert result["trades"][-1]["price"] == frame.close[-1]
@@ -0,0 +1,150 @@
+import pytest
+
+from app.strategy_runtime import sandbox
+from app.strategy_runtime.errors import StrategyRuntimeError
+
+
+BARS = [
+    {"time": 1, "open": 10, "high": 11, "low": 9, "close": 10, "volume": 1},
+    {"time": 2, "open": 10, "high": 12, "low": 9, "close": 11, "volume": 1},
+]
+
+CLASS_SOURCE = '''
+class Strategy:
+    def __init__(self, ctx):
+        self.trades = 0
+
+    def on_bar(self, ctx, bar):
+        return [{"side": "buy", "price": bar.close, "quantity": ctx.params["quantity"]}]
+
+    def on_trade(self, ctx, trade):
+        self.trades += 1
+        ctx.log(f"trade {self.trades}")
+
+    def helper(self):
+        return None
+'''
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    sandbox.clear_strategy_code_cache()
+    yield
+    sandbox.clear_strategy_code_cache()
+
+
+def test_inline_runs_guard_and_compile_a_source_once(monkeypatch):
+    compiled = []
+    original = sandbox._compile_guarded
+
+    def _counting(digest, source):
+        compiled.append(digest)
+        return original(digest, source)
+
+    monkeypatch.setattr(sandbox, '_compile_guarded', _counting)
+
+    for quantity in (1, 2, 3):
+        result = sandbox.run_strategy_inline('BTCUSDT', CLASS_SOURCE, 'Strategy', BARS, {"quantity": quantity})
+        assert [trade["quantity"] for trade in result["trades"]] == [quantity, quantity]
+        assert result["logs"] == ["trade 1", "trade 2"]
+
+    assert len(compiled) == 1
+    assert sandbox.strategy_code_cache_stats()["misses"] == 1
+
+
+def test_rejected_source_verdict_is_cached(monkeypatch):
+    source = 'import os\n'
+    with pytest.raises(StrategyRuntimeError) as first:
+        sandbox.guard_strategy_source(source)
+
+    monkeypatch.setattr(sandbox, '_compile_guarded', lambda digest, source: pytest.fail('recompiled'))
+    with pytest.raises(StrategyRuntimeError) as second:
+        sandbox.run_strategy_inline('BTCUSDT', source, 'run', BARS, {})
+
+    assert first.value.message == second.value.message == 'sandbox_rejected'
+    assert second.value.details == {"reason": "forbidden_import:os"}
+
+
+def test_declared_hooks_are_recorded_per_entrypoint():
+    compiled = sandbox.compile_strategy_source(CLASS_SOURCE + '''
+class Derived(Strategy):
+    pass
+
+
+def run(ctx, bar):
+    return None
+''')
+
+    assert compiled.hooks_for('Strategy') == ('on_bar', 'on_trade')
+    assert compiled.hooks_for('Derived') is None
+    assert compiled.hooks_for('run') == ('on_bar',)
+    assert compiled.hooks_for('missing') is None
+
+
+def test_hooks_assigned_at_runtime_still_fire():
+    source = '''
+class Strategy:
+    def __init__(self, ctx):
+        self.on_timer = lambda ctx, event: ctx.log(event["index"])
+'''
+    compiled = sandbox.compile_strategy_source(source)
+
+    result = sandbox.run_strategy_inline('BTCUSDT', source, 'Strategy', BARS, {})
+
+    assert compiled.hooks_for('Strategy') is None
+    assert result["logs"] == ["0", "1"]
+
+
+def test_code_cache_is_bounded(monkeypatch):
+    monkeypatch.setenv('STRATEGY_CODE_CACHE_SIZE', '2')
+
+    for index in range(3):
+        sandbox.compile_strategy_source(f'VALUE = {index}\n')
+    sandbox.compile_strategy_source('VALUE = 0\n')
+
+    assert sandbox.strategy_code_cache_stats() == {"entries": 2, "hits": 0, "misses": 4}
+
+
+@pytest.mark.parametrize("source", [
+    '''
+class Strategy:
+    def __init__(self, ctx):
+        setattr(self, "on_" + "timer", lambda ctx, event: ctx.log(event["index"]))
+''',
+    '''
+class Strategy:
+    on_timer: "hook" = lambda self, ctx, event: ctx.log(event["index"])
+''',
+    '''
+class Strategy:
+    def __getattr__(self, name):
+        if name == "on_timer":
+            return lambda ctx, event: ctx.log(event["index"])
+        return None
+''',
+    '''
+class Strategy:
+    def __getattribute__(self, name):
+        if name == "on_timer":
+            return lambda ctx, event: ctx.log(event["index"])
+        return None
+''',
+    '''
+class Strategy:
+    pass
+
+
+def _tick(self, ctx, event):
+    ctx.log(event["index"])
+
+
+Strategy.on_timer = _tick
+''',
+], ids=["setattr", "annotated", "getattr", "getattribute", "module-level"])
+def test_dynamically_attached_hooks_are_not_declared(source):
+    compiled = sandbox.compile_strategy_source(source)
+
+    result = sandbox.run_strategy_inline('BTCUSDT', source, 'Strategy', BARS, {})
+
+    assert compiled.hooks_for('Strategy') is None
+    assert result["logs"] == ["0", "1"]
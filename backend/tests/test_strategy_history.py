@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+
+from app.strategy_runtime.errors import StrategyRuntimeError
+from app.strategy_runtime.events import StrategyContext, make_bar
+from app.strategy_runtime.history import BarHistory
+from app.strategy_runtime.manifest import manifest_lookback, validate_manifest
+from app.strategy_runtime.sandbox import run_strategy_inline
+
+
+def _bars(count):
+    return [
+        {"time": index * 60_000, "open": index, "high": index + 1, "low": index - 1, "close": index + 0.5, "volume": 10}
+        for index in range(1, count + 1)
+    ]
+
+
+def _manifest(**runtime):
+    return {
+        "schemaVersion": "1.0",
+        "kind": "QYStrategy",
+        "id": "strategy-1",
+        "name": "demo",
+        "version": "1.0.0",
+        "language": "python",
+        "runtime": {"name": "python", "version": "3.11", **runtime},
+        "entrypoint": {"path": "src/strategy.py", "callable": "on_bar"},
+    }
+
+
+def test_history_returns_read_only_views_of_the_latest_bars():
+    ctx = StrategyContext("BTCUSDT", {}, lookback=4)
+    for bar in _bars(2):
+        ctx.sync_bar(make_bar("BTCUSDT", bar))
+
+    assert ctx.history("close").tolist() == [1.5, 2.5]
+    assert ctx.history("close", 3).tolist() == [1.5, 2.5]
+
+    for bar in _bars(7)[2:]:
+        ctx.sync_bar(make_bar("BTCUSDT", bar))
+
+    closes = ctx.history("close", 4)
+    assert closes.tolist() == [4.5, 5.5, 6.5, 7.5]
+    assert ctx.history("time", 2).tolist() == [360_000, 420_000]
+    assert ctx.history("high", 0).tolist() == []
+    assert closes.base is ctx.history("close", 2).base
+    with pytest.raises(ValueError):
+        closes[0] = 0.0
+
+
+def test_history_is_bounded_by_the_lookback():
+    history = BarHistory(3)
+
+    with pytest.raises(ValueError, match="lookback of 3 bars"):
+        history.view("close", 4)
+    with pytest.raises(ValueError, match="unknown history field"):
+        history.view("vwap", 1)
+    with pytest.raises(ValueError):
+        BarHistory(0)
+
+
+def test_history_stays_contiguous_across_many_wraps():
+    ctx = StrategyContext("BTCUSDT", {}, lookback=5)
+    for bar in _bars(53):
+        ctx.sync_bar(make_bar("BTCUSDT", bar))
+
+    closes = ctx.history("close", 5)
+    assert closes.flags.c_contiguous
+    np.testing.assert_array_equal(closes, np.arange(49, 54) + 0.5)
+
+
+def test_inline_runner_sizes_history_from_lookback():
+    source = '''
+def on_bar(ctx, bar):
+    closes = ctx.history("close", 3)
+    if len(closes) == 3 and closes[-1] > closes.sum() / 3:
+        return [{"side": "buy", "quantity": 1}]
+    return []
+'''
+    result = run_strategy_inline("BTCUSDT", source, "on_bar", _bars(5), {}, lookback=3)
+    assert [trade["timestamp"] for trade in result["trades"]] == [180_000, 240_000, 300_000]
+
+    with pytest.raises(StrategyRuntimeError) as excinfo:
+        run_strategy_inline("BTCUSDT", source, "on_bar", _bars(5), {}, lookback=2)
+    assert "lookback of 2 bars" in excinfo.value.details["reason"]
+
+
+def test_manifest_lookback_is_validated():
+    assert manifest_lookback(validate_manifest(_manifest(lookback=500))) == 500
+    assert manifest_lookback(validate_manifest(_manifest())) is None
+
+    for invalid in (0, -1, "500", True, 100_001):
+        with pytest.raises(StrategyRuntimeError) as excinfo:
+            validate_manifest(_manifest(lookback=invalid))
+        assert excinfo.value.message == "invalid_lookback"
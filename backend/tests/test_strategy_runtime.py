@@ -254,3 +254,58 @@ def test_unowned_private_strategy_execution_requires_public_access(monkeypatch,
 
     assert response.status_code == 404
 
+
+
+def test_loaded_packages_are_cached_until_the_archive_or_version_changes(monkeypatch, app, tmp_path):
+    from app.strategy_runtime import loader
+
+    strategy_id = str(uuid.uuid4())
+    version = '1.0.4'
+    package_path = _build_qys(tmp_path, strategy_id, version=version)
+    _seed_strategy_version(app, strategy_id, version, package_path, is_public=True, review_status='approved')
+
+    opened = []
+    real_zipfile = zipfile.ZipFile
+
+    def _counting_zipfile(path, mode='r', *args, **kwargs):
+        if mode == 'r':
+            opened.append(path)
+        return real_zipfile(path, mode, *args, **kwargs)
+
+    monkeypatch.setattr('app.strategy_runtime.loader.zipfile.ZipFile', _counting_zipfile)
+
+    with app.app_context():
+        first = loader.load_strategy_package(strategy_id, version)
+        first['manifest']['name'] = 'changed by caller'
+        second = loader.load_strategy_package(strategy_id, version)
+        assert len(opened) == 1
+        assert second['manifest']['name'] == 'Runtime Test Strategy'
+        assert second['source'] == first['source']
+
+        _build_qys(tmp_path, strategy_id, version=version, strategy_source='class Strategy:\n    pass\n')
+        republished = loader.load_strategy_package(strategy_id, version)
+        assert len(opened) == 2
+        assert republished['source'] == 'class Strategy:\n    pass\n'
+
+        loader.invalidate_strategy_package_cache(strategy_id)
+        loader.load_strategy_package(strategy_id, version)
+        assert len(opened) == 3
+
+
+def test_package_cache_is_bounded(monkeypatch):
+    from app.strategy_runtime.loader import _PackageCache
+
+    monkeypatch.setenv('STRATEGY_PACKAGE_CACHE_SIZE', '2')
+    cache = _PackageCache()
+    for index in range(3):
+        cache.put(('archive', index), {'source': str(index)}, {'strategy-a'})
+    cache.get(('archive', 1))
+
+    assert len(cache) == 2
+    assert cache.get(('archive', 0)) is None
+    cache.put(('archive', 3), {'source': '3'}, {'strategy-b'})
+    assert cache.get(('archive', 2)) is None
+    assert cache.get(('archive', 1)) == {'source': '1'}
+
+    cache.invalidate('strategy-a')
+    assert len(cache) == 1
@@ -0,0 +1,166 @@
+import numpy as np
+import pytest
+
+from app.backtest.frame import BarFrame
+from app.strategy_runtime.errors import StrategyRuntimeError
+from app.strategy_runtime.manifest import validate_manifest
+from app.strategy_runtime.sandbox import run_strategy_batch_inline, run_strategy_inline
+from app.strategy_runtime.vector import orders_from_output, simulate_fills
+
+
+EVENT_SOURCE = '''
+def on_bar(ctx, bar):
+    fast_period = ctx.params["fast"]
+    slow_period = ctx.params["slow"]
+    closes = ctx.history("close", slow_period)
+    if len(closes) < slow_period:
+        return []
+    fast = closes[-fast_period:].sum() / fast_period
+    slow = closes.sum() / slow_period
+    holding = ctx.symbol in ctx.account.positions
+    if fast > slow and not holding:
+        return [{"side": "buy", "quantity": 1}]
+    if fast <= slow and holding:
+        return [{"side": "sell", "quantity": 1}]
+    return []
+'''
+
+VECTOR_SOURCE = '''
+import numpy as np
+
+
+def _rolling_mean(values, period):
+    sums = np.cumsum(values)
+    sums[period:] = sums[period:] - sums[:-period]
+    means = sums / period
+    means[:period - 1] = np.nan
+    return means
+
+
+def on_bars(ctx, frame):
+    fast = _rolling_mean(frame.close, ctx.params["fast"])
+    slow = _rolling_mean(frame.close, ctx.params["slow"])
+    return np.where(fast > slow, 1.0, 0.0)
+'''
+
+
+def _random_walk(count, seed=3):
+    # Whole-number prices keep both paths' averages exact, so crossovers cannot differ by rounding.
+    rng = np.random.default_rng(seed)
+    close = 1000.0 + np.cumsum(rng.integers(-5, 6, count)).astype(float)
+    time = 1_700_000_000_000 + np.arange(count, dtype=np.int64) * 60_000
+    return BarFrame(time, close, close + 2, close - 2, close, np.full(count, 10.0))
+
+
+def test_vectorized_entry_matches_event_driven_trades():
+    bars = _random_walk(2000)
+    params = {"fast": 5, "slow": 20}
+
+    event = run_strategy_inline("BTCUSDT", EVENT_SOURCE, "on_bar", bars, params, lookback=20)
+    vector = run_strategy_inline("BTCUSDT", VECTOR_SOURCE, "on_bars", bars, params, interface="vector_v1")
+
+    assert len(event["trades"]) > 20
+    assert vector["trades"] == event["trades"]
+
+
+def test_vectorized_batch_runs_each_parameter_set():
+    bars = _random_walk(500)
+    param_sets = [{"fast": 5, "slow": 20}, {"fast": 10, "slow": 40}]
+
+    results = run_strategy_batch_inline("BTCUSDT", VECTOR_SOURCE, "on_bars", bars, param_sets, interface="vector_v1")
+
+    for params, result in zip(param_sets, results):
+        expected = run_strategy_inline("BTCUSDT", EVENT_SOURCE, "on_bar", bars, params, lookback=params["slow"])
+        assert result["ok"] is True
+        assert result["trades"] == expected["trades"]
+
+
+def test_signal_output_trades_signed_quantities():
+    source = '''
+import numpy as np
+
+
+class Strategy:
+    def on_bars(self, ctx, frame):
+        ctx.log(len(frame))
+        signals = np.zeros(len(frame))
+        signals[1] = 3
+        signals[3] = -2
+        return signals
+'''
+    bars = _random_walk(5)
+
+    result = run_strategy_inline("BTCUSDT", source, "Strategy", bars, {}, interface="vector_v1", output="signal")
+
+    assert result["logs"] == ["5"]
+    assert [(trade["side"], trade["quantity"], trade["timestamp"]) for trade in result["trades"]] == [
+        ("buy", 3.0, int(bars.time[1])),
+        ("sell", 2.0, int(bars.time[3])),
+    ]
+    assert [trade["price"] for trade in result["trades"]] == [bars.close[1], bars.close[3]]
+
+
+@pytest.mark.parametrize("body, reason", [
+    ("return np.zeros(len(frame) - 1)", "must return 10 values"),
+    ("return np.full(len(frame), np.nan)", "NaN"),
+    ("frame.close[0] = 0.0\n    return np.zeros(len(frame))", "read-only"),
+])
+def test_invalid_vector_results_are_reported(body, reason):
+    source = f"import numpy as np\n\n\ndef on_bars(ctx, frame):\n    {body}\n"
+
+    with pytest.raises(StrategyRuntimeError) as excinfo:
+        run_strategy_inline("BTCUSDT", source, "on_bars", _random_walk(10), {}, interface="vector_v1")
+
+    assert reason in excinfo.value.details["reason"]
+
+
+def test_target_output_orders_are_position_changes():
+    orders = orders_from_output([0, 1, 1, -1, 0], 5)
+    np.testing.assert_array_equal(orders, [0, 1, 0, -2, 1])
+
+    trades = simulate_fills("BTCUSDT", _random_walk(5), orders)
+    assert [trade["side"] for trade in trades] == ["buy", "sell", "buy"]
+
+
+def test_manifest_entrypoint_interface_is_validated():
+    def _manifest(**entrypoint):
+        return {
+            "schemaVersion": "1.0",
+            "kind": "QYStrategy",
+            "id": "strategy-1",
+            "name": "demo",
+            "version": "1.0.0",
+            "language": "python",
+            "runtime": {"name": "python", "version": "3.11"},
+            "entrypoint": {"path": "src/strategy.py", "callable": "on_bars", **entrypoint},
+        }
+
+    assert validate_manifest(_manifest(interface="vector_v1", output="signal"))["entrypoint"]["output"] == "signal"
+    for entrypoint in (
+        {"interface": "batch_v9"},
+        {"interface": "event_v1", "output": "target"},
+        {"interface": "vector_v1", "output": "weights"},
+    ):
+        with pytest.raises(StrategyRuntimeError) as excinfo:
+            validate_manifest(_manifest(**entrypoint))
+        assert excinfo.value.message == "invalid_entrypoint"
+
+
+def test_backtest_uses_the_declared_vector_entrypoint(monkeypatch):
+    from app.strategy_runtime.executor import execute_backtest_strategy
+
+    monkeypatch.setenv("FLASK_ENV", "testing")
+    monkeypatch.setenv("BACKTEST_SANDBOX_POOL_SIZE", "0")
+    bars = _random_walk(300)
+    loaded = {
+        "source": VECTOR_SOURCE,
+        "entrypoint_callable": "on_bars",
+        "strategy_id": "vector-strategy",
+        "version": "1.0.0",
+        "manifest": {"entrypoint": {"path": "src/strategy.py", "callable": "on_bars", "interface": "vector_v1"}},
+    }
+
+    result = execute_backtest_strategy("BTCUSDT", bars, loaded, {"fast": 5, "slow": 20})
+
+    expected = run_strategy_inline("BTCUSDT", EVENT_SOURCE, "on_bar", bars, {"fast": 5, "slow": 20}, lookback=20)
+    assert result["trades"] == expected["trades"]
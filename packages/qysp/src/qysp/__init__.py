@@ -11,6 +11,11 @@ from qysp.context import (
     StrategyContext,
 )
 from qysp.indicators import (
+    ATRState,
+    BollingerState,
+    CrossDetector,
+    EMAState,
+    SMAState,
     atr,
     bollinger_bands,
     cross_over,
@@ -24,14 +29,19 @@ from qysp.validator import validate, validate_integrity, validate_schema
 __version__ = "0.1.0"
 
 __all__ = [
+    "ATRState",
     "Account",
     "BarData",
+    "BollingerState",
+    "CrossDetector",
+    "EMAState",
     "Order",
     "OrderSide",
     "OrderType",
     "ParameterAccessor",
     "ParameterProvider",
     "Position",
+    "SMAState",
     "StrategyContext",
     "ValidationError",
     "atr",
@@ -8,6 +8,7 @@
 - StrategyContext: 策略上下文（含 buy/sell 便捷方法）
 - ParameterAccessor: 参数访问器
 - OnBarCallable: event_v1 标准入口函数签名
+- OnBarsCallable: vector_v1 向量化入口函数签名
 """
 
 from __future__ import annotations
@@ -160,3 +161,10 @@ class StrategyContext:
 
 OnBarCallable = Callable[[StrategyContext, BarData], list[Order]]
 """event_v1 标准入口函数签名：on_bar(ctx, data) -> list[Order]。"""
+
+OnBarsCallable = Callable[[StrategyContext, Any], Any]
+"""vector_v1 入口函数签名：on_bars(ctx, frame) -> 每根 K 线一个值的数组。
+
+frame 以只读 NumPy 列（time/open/high/low/close/volume）提供全部 K 线。
+返回值按 entrypoint.output 解释：target 为该 K 线收盘后的目标仓位，signal 为该 K 线的带符号成交数量。
+"""
@@ -2,10 +2,18 @@
 
 All functions accept and return pandas Series, using pandas built-in
 rolling/ewm methods for computation. No external C dependencies (ta-lib).
+
+The ``*State`` classes and ``CrossDetector`` are streaming counterparts for
+use inside ``on_bar``: keep one instance per series and feed it one bar at a
+time. Each update is O(1) and matches the last value of the batch function
+over the same history.
 """
 
 from __future__ import annotations
 
+import math
+from collections import deque
+
 import pandas as pd
 
 
@@ -183,3 +191,211 @@ def cross_under(s1: pd.Series, s2: pd.Series) -> pd.Series:
     crossed = (prev_s1 >= prev_s2) & (s1 < s2)
     crossed.iloc[0] = False
     return crossed
+
+
+class _RollingWindow:
+    """Fixed-size window with O(1) running sum and Welford sum of squared deviations.
+
+    The sum is re-added exactly with ``math.fsum`` once per ``period`` updates,
+    so rounding error cannot build up over long backtests.
+    """
+
+    def __init__(self, period: int) -> None:
+        _validate_period(period)
+        self.period = period
+        self.values: deque[float] = deque(maxlen=period)
+        self.total = 0.0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self._updates = 0
+
+    @property
+    def full(self) -> bool:
+        return len(self.values) == self.period
+
+    def push(self, value: float) -> None:
+        value = float(value)
+        if self.full:
+            oldest = self.values[0]
+            self.values.append(value)
+            delta = value - oldest
+            self.total += delta
+            old_mean = self.mean
+            self.mean = old_mean + delta / self.period
+            self.m2 += delta * (value - self.mean + oldest - old_mean)
+        else:
+            self.values.append(value)
+            self.total += value
+            delta = value - self.mean
+            self.mean += delta / len(self.values)
+            self.m2 += delta * (value - self.mean)
+
+        self._updates += 1
+        if self._updates >= self.period:
+            self._updates = 0
+            self.total = math.fsum(self.values)
+            self.mean = self.total / len(self.values)
+            self.m2 = math.fsum((item - self.mean) ** 2 for item in self.values)
+
+    def variance(self) -> float:
+        """Sample variance (ddof=1), as pandas ``rolling().std()`` uses."""
+        count = len(self.values)
+        if count < 2:
+            return math.nan
+        return max(self.m2, 0.0) / (count - 1)
+
+
+class SMAState:
+    """Streaming Simple Moving Average; matches ``sma(series, period).iloc[-1]``.
+
+    Args:
+        period: Lookback window size. Must be > 0.
+    """
+
+    def __init__(self, period: int = 20) -> None:
+        self._window = _RollingWindow(period)
+        self.value: float | None = None
+
+    @property
+    def period(self) -> int:
+        return self._window.period
+
+    @property
+    def ready(self) -> bool:
+        return self.value is not None
+
+    def update(self, value: float) -> float | None:
+        """Add one value. Returns the SMA, or None until ``period`` values are seen."""
+        self._window.push(value)
+        self.value = self._window.total / self.period if self._window.full else None
+        return self.value
+
+
+class EMAState:
+    """Streaming Exponential Moving Average; matches ``ema(series, period).iloc[-1]``.
+
+    Args:
+        period: EMA span. Must be > 0.
+    """
+
+    def __init__(self, period: int = 20) -> None:
+        _validate_period(period)
+        self.period = period
+        self.alpha = 2.0 / (period + 1)
+        self.value: float | None = None
+
+    @property
+    def ready(self) -> bool:
+        return self.value is not None
+
+    def update(self, value: float) -> float:
+        """Add one value and return the EMA. The first value seeds the average."""
+        value = float(value)
+        if self.value is None:
+            self.value = value
+        else:
+            self.value += self.alpha * (value - self.value)
+        return self.value
+
+
+class ATRState:
+    """Streaming Average True Range; matches ``atr(high, low, close, period).iloc[-1]``.
+
+    Args:
+        period: Lookback window. Must be > 0.
+    """
+
+    def __init__(self, period: int = 14) -> None:
+        self._average = SMAState(period)
+        self._prev_close: float | None = None
+
+    @property
+    def period(self) -> int:
+        return self._average.period
+
+    @property
+    def value(self) -> float | None:
+        return self._average.value
+
+    @property
+    def ready(self) -> bool:
+        return self._average.ready
+
+    def update(self, high: float, low: float, close: float) -> float | None:
+        """Add one bar. Returns the ATR, or None until ``period`` bars are seen."""
+        high, low = float(high), float(low)
+        true_range = abs(high - low)
+        if self._prev_close is not None:
+            true_range = max(
+                true_range,
+                abs(high - self._prev_close),
+                abs(low - self._prev_close),
+            )
+        self._prev_close = float(close)
+        return self._average.update(true_range)
+
+
+class BollingerState:
+    """Streaming Bollinger Bands; matches the last row of ``bollinger_bands``.
+
+    Args:
+        period: SMA lookback window. Must be > 0.
+        num_std: Number of standard deviations. Must be > 0.
+    """
+
+    def __init__(self, period: int = 20, num_std: float = 2.0) -> None:
+        if num_std <= 0:
+            raise ValueError(f"num_std must be positive, got {num_std}")
+        self._window = _RollingWindow(period)
+        self.num_std = num_std
+        self.value: tuple[float, float, float] | None = None
+
+    @property
+    def period(self) -> int:
+        return self._window.period
+
+    @property
+    def ready(self) -> bool:
+        return self.value is not None
+
+    def update(self, value: float) -> tuple[float, float, float] | None:
+        """Add one value. Returns ``(upper, middle, lower)``, or None until ``period`` values are seen."""
+        self._window.push(value)
+        if not self._window.full:
+            self.value = None
+            return None
+        middle = self._window.total / self.period
+        width = self.num_std * math.sqrt(self._window.variance())
+        self.value = (middle + width, middle, middle - width)
+        return self.value
+
+
+class CrossDetector:
+    """Streaming ``cross_over``/``cross_under`` of two values fed bar by bar.
+
+    ``update`` returns 1 when the first value crosses above the second, -1 when it
+    crosses below, else 0. A bar where either value is None or NaN (e.g. an
+    indicator still warming up) never crosses, like NaN in the batch functions.
+    """
+
+    def __init__(self) -> None:
+        self._prev: tuple[float, float] | None = None
+        self.crossed_over = False
+        self.crossed_under = False
+
+    def update(self, first: float | None, second: float | None) -> int:
+        current = None
+        if first is not None and second is not None:
+            first, second = float(first), float(second)
+            if not (math.isnan(first) or math.isnan(second)):
+                current = (first, second)
+        prev, self._prev = self._prev, current
+
+        comparable = prev is not None and current is not None
+        self.crossed_over = comparable and prev[0] <= prev[1] and current[0] > current[1]
+        self.crossed_under = comparable and prev[0] >= prev[1] and current[0] < current[1]
+        if self.crossed_over:
+            return 1
+        if self.crossed_under:
+            return -1
+        return 0
@@ -2,10 +2,8 @@
 
 from __future__ import annotations
 
-import pandas as pd
-
 from qysp.context import StrategyContext, BarData
-from qysp.indicators import bollinger_bands
+from qysp.indicators import BollingerState
 
 
 def on_bar(ctx: StrategyContext, data: BarData) -> list:
@@ -13,19 +11,16 @@ def on_bar(ctx: StrategyContext, data: BarData) -> list:
     bb_period = int(ctx.parameters.get("bb_period", 20))
     bb_std = float(ctx.parameters.get("bb_std", 2.0))
 
-    close_history = getattr(ctx, "_close_history", [])
-    close_history.append(float(data.close))
-    setattr(ctx, "_close_history", close_history[-(bb_period + 20) :])
+    # Streaming indicators keep their state on the context and cost O(1) per bar.
+    bands = getattr(ctx, "_bands", None)
+    if bands is None:
+        bands = BollingerState(bb_period, bb_std)
+        setattr(ctx, "_bands", bands)
 
-    if len(close_history) < bb_period + 2:
+    last_close = float(data.close)
+    if bands.update(last_close) is None:
         return []
-
-    prices = pd.Series(close_history, dtype=float)
-    upper, _, lower = bollinger_bands(prices, period=bb_period, num_std=bb_std)
-
-    last_close = prices.iloc[-1]
-    last_upper = upper.iloc[-1]
-    last_lower = lower.iloc[-1]
+    last_upper, _, last_lower = bands.value
 
     if last_close < last_lower:
         return [ctx.buy(data.symbol, quantity=1)]
@@ -2,10 +2,8 @@
 
 from __future__ import annotations
 
-import pandas as pd
-
 from qysp.context import StrategyContext, BarData
-from qysp.indicators import cross_over, cross_under, ema
+from qysp.indicators import CrossDetector, EMAState
 
 
 def on_bar(ctx: StrategyContext, data: BarData) -> list:
@@ -15,23 +13,34 @@ def on_bar(ctx: StrategyContext, data: BarData) -> list:
     if ema_period >= signal_period:
         return []
 
-    close_history = getattr(ctx, "_close_history", [])
-    close_history.append(float(data.close))
-    setattr(ctx, "_close_history", close_history[-(signal_period + 30) :])
-
-    if len(close_history) < signal_period + 2:
+    # Streaming indicators keep their state on the context and cost O(1) per bar.
+    state = getattr(ctx, "_indicators", None)
+    if state is None:
+        state = {
+            "fast": EMAState(ema_period),
+            "slow": EMAState(signal_period),
+            "cross": CrossDetector(),
+            "bars": 0,
+        }
+        setattr(ctx, "_indicators", state)
+
+    close = float(data.close)
+    prev_slow = state["slow"].value
+    fast_ema = state["fast"].update(close)
+    slow_ema = state["slow"].update(close)
+    signal = state["cross"].update(fast_ema, slow_ema)
+    state["bars"] += 1
+
+    # Let the EMAs settle before trading on them.
+    if state["bars"] < signal_period + 2:
         return []
 
-    prices = pd.Series(close_history, dtype=float)
-    fast_ema = ema(prices, period=ema_period)
-    slow_ema = ema(prices, period=signal_period)
-
-    slow_up = slow_ema.iloc[-1] > slow_ema.iloc[-2]
-    if bool(cross_over(fast_ema, slow_ema).iloc[-1]) and slow_up:
+    slow_up = slow_ema > prev_slow
+    if signal > 0 and slow_up:
         return [ctx.buy(data.symbol, quantity=1)]
 
-    slow_down = slow_ema.iloc[-1] < slow_ema.iloc[-2]
-    if bool(cross_under(fast_ema, slow_ema).iloc[-1]) or slow_down:
+    slow_down = slow_ema < prev_slow
+    if signal < 0 or slow_down:
         return [ctx.sell(data.symbol, quantity=1)]
 
     return []
@@ -2,10 +2,8 @@
 
 from __future__ import annotations
 
-import pandas as pd
-
 from qysp.context import StrategyContext, BarData
-from qysp.indicators import atr, bollinger_bands, sma
+from qysp.indicators import ATRState, BollingerState, SMAState
 
 
 def on_bar(ctx: StrategyContext, data: BarData) -> list:
@@ -15,39 +13,36 @@ def on_bar(ctx: StrategyContext, data: BarData) -> list:
     bb_period = int(ctx.parameters.get("bb_period", 20))
     bb_std = float(ctx.parameters.get("bb_std", 2.0))
 
-    high_history = getattr(ctx, "_high_history", [])
-    low_history = getattr(ctx, "_low_history", [])
-    close_history = getattr(ctx, "_close_history", [])
-    high_history.append(float(data.high))
-    low_history.append(float(data.low))
-    close_history.append(float(data.close))
-
-    lookback = max(sma_period, atr_period, bb_period) + 20
-    setattr(ctx, "_high_history", high_history[-lookback:])
-    setattr(ctx, "_low_history", low_history[-lookback:])
-    setattr(ctx, "_close_history", close_history[-lookback:])
-
-    if len(close_history) < max(sma_period, atr_period, bb_period) + 2:
+    # Streaming indicators keep their state on the context and cost O(1) per bar.
+    state = getattr(ctx, "_indicators", None)
+    if state is None:
+        state = {
+            "trend": SMAState(sma_period),
+            "atr": ATRState(atr_period),
+            "bands": BollingerState(bb_period, bb_std),
+        }
+        setattr(ctx, "_indicators", state)
+
+    close = float(data.close)
+    prev_atr = state["atr"].value
+    trend_line = state["trend"].update(close)
+    atr_line = state["atr"].update(float(data.high), float(data.low), close)
+    bands = state["bands"].update(close)
+
+    if trend_line is None or bands is None or prev_atr is None:
         return []
+    upper, _, lower = bands
 
-    close_series = pd.Series(close_history, dtype=float)
-    high_series = pd.Series(high_history, dtype=float)
-    low_series = pd.Series(low_history, dtype=float)
-
-    trend_line = sma(close_series, period=sma_period)
-    atr_line = atr(high_series, low_series, close_series, period=atr_period)
-    upper, _, lower = bollinger_bands(close_series, period=bb_period, num_std=bb_std)
-
-    trend_signal = 1 if close_series.iloc[-1] > trend_line.iloc[-1] else -1
+    trend_signal = 1 if close > trend_line else -1
 
-    if close_series.iloc[-1] > upper.iloc[-1]:
+    if close > upper:
         band_signal = 1
-    elif close_series.iloc[-1] < lower.iloc[-1]:
+    elif close < lower:
         band_signal = -1
     else:
         band_signal = 0
 
-    atr_rising = atr_line.iloc[-1] > atr_line.iloc[-2]
+    atr_rising = atr_line > prev_atr
     momentum_signal = trend_signal if atr_rising else 0
 
     score = trend_signal + band_signal + momentum_signal
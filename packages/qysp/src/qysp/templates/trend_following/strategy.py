@@ -2,10 +2,8 @@
 
 from __future__ import annotations
 
-import pandas as pd
-
 from qysp.context import StrategyContext, BarData
-from qysp.indicators import cross_over, cross_under, sma
+from qysp.indicators import CrossDetector, SMAState
 
 
 def on_bar(ctx: StrategyContext, data: BarData) -> list:
@@ -15,24 +13,25 @@ def on_bar(ctx: StrategyContext, data: BarData) -> list:
     if fast_period >= slow_period:
         return []
 
-    # Keep recent close prices for indicator calculations.
-    close_history = getattr(ctx, "_close_history", [])
-    close_history.append(float(data.close))
-    setattr(ctx, "_close_history", close_history[-(slow_period + 20) :])
-
-    if len(close_history) < slow_period + 2:
-        return []
+    # Streaming indicators keep their state on the context and cost O(1) per bar.
+    state = getattr(ctx, "_indicators", None)
+    if state is None:
+        state = {
+            "fast": SMAState(fast_period),
+            "slow": SMAState(slow_period),
+            "cross": CrossDetector(),
+        }
+        setattr(ctx, "_indicators", state)
 
-    prices = pd.Series(close_history, dtype=float)
-    fast_line = sma(prices, period=fast_period)
-    slow_line = sma(prices, period=slow_period)
+    close = float(data.close)
+    signal = state["cross"].update(state["fast"].update(close), state["slow"].update(close))
 
     # Entry condition: fast SMA crosses above slow SMA.
-    if bool(cross_over(fast_line, slow_line).iloc[-1]):
+    if signal > 0:
         return [ctx.buy(data.symbol, quantity=1)]
 
     # Exit condition: fast SMA crosses below slow SMA.
-    if bool(cross_under(fast_line, slow_line).iloc[-1]):
+    if signal < 0:
         return [ctx.sell(data.symbol, quantity=1)]
 
     return []
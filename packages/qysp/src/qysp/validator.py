@@ -48,6 +48,10 @@ def validate_schema(strategy_json: dict) -> list[str]:
         else:
             errors.append(error.message)
 
+    entrypoint = strategy_json.get("entrypoint")
+    if isinstance(entrypoint, dict) and "output" in entrypoint and entrypoint.get("interface") != "vector_v1":
+        errors.append("Invalid field 'entrypoint.output': only allowed when interface is 'vector_v1'")
+
     return errors
 
 
@@ -324,6 +324,126 @@ class TestCrossUnder:
         assert not result.any()
 
 
+def _random_walk(length: int, seed: int = 7) -> pd.DataFrame:
+    """Deterministic OHLC random walk around a large price level."""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    close = 10_000.0 + np.cumsum(rng.normal(0.0, 25.0, length))
+    spread = np.abs(rng.normal(0.0, 15.0, length))
+    return pd.DataFrame(
+        {
+            "high": close + spread,
+            "low": close - spread,
+            "close": close,
+        }
+    )
+
+
+def _assert_stream_matches(streamed: list, batch: pd.Series) -> None:
+    assert len(streamed) == len(batch)
+    for value, expected in zip(streamed, batch):
+        if pd.isna(expected):
+            assert value is None or pd.isna(value)
+        else:
+            assert value == pytest.approx(expected, rel=1e-9, abs=1e-9)
+
+
+class TestStreamingParity:
+    """Streaming states reproduce the batch functions bar by bar."""
+
+    @pytest.mark.parametrize("period", [1, 3, 20])
+    def test_sma_state_matches_sma(self, period):
+        from qysp.indicators import SMAState, sma
+
+        bars = _random_walk(3000)
+        state = SMAState(period)
+        streamed = [state.update(value) for value in bars["close"]]
+        _assert_stream_matches(streamed, sma(bars["close"], period))
+
+    @pytest.mark.parametrize("period", [1, 12, 26])
+    def test_ema_state_matches_ema(self, period):
+        from qysp.indicators import EMAState, ema
+
+        bars = _random_walk(3000)
+        state = EMAState(period)
+        streamed = [state.update(value) for value in bars["close"]]
+        _assert_stream_matches(streamed, ema(bars["close"], period))
+
+    @pytest.mark.parametrize("period", [1, 14])
+    def test_atr_state_matches_atr(self, period):
+        from qysp.indicators import ATRState, atr
+
+        bars = _random_walk(3000)
+        state = ATRState(period)
+        streamed = [
+            state.update(high, low, close)
+            for high, low, close in zip(bars["high"], bars["low"], bars["close"])
+        ]
+        _assert_stream_matches(streamed, atr(bars["high"], bars["low"], bars["close"], period))
+
+    @pytest.mark.parametrize("period,num_std", [(2, 1.0), (20, 2.0), (50, 2.5)])
+    def test_bollinger_state_matches_bollinger_bands(self, period, num_std):
+        from qysp.indicators import BollingerState, bollinger_bands
+
+        bars = _random_walk(3000)
+        state = BollingerState(period, num_std)
+        streamed = [state.update(value) for value in bars["close"]]
+        expected = bollinger_bands(bars["close"], period, num_std)
+        for index, band in enumerate(expected):
+            _assert_stream_matches(
+                [None if value is None else value[index] for value in streamed],
+                band,
+            )
+
+    def test_bollinger_state_on_constant_series_has_zero_width(self):
+        from qysp.indicators import BollingerState
+
+        state = BollingerState(period=5)
+        for _ in range(20):
+            state.update(100.0)
+        upper, middle, lower = state.value
+        assert upper == pytest.approx(100.0)
+        assert middle == pytest.approx(100.0)
+        assert lower == pytest.approx(100.0)
+
+    def test_cross_detector_matches_cross_over_and_under(self):
+        from qysp.indicators import CrossDetector, SMAState, cross_over, cross_under, sma
+
+        close = _random_walk(3000)["close"]
+        fast_state, slow_state, detector = SMAState(5), SMAState(20), CrossDetector()
+        signals = [
+            detector.update(fast_state.update(value), slow_state.update(value))
+            for value in close
+        ]
+        fast, slow = sma(close, 5), sma(close, 20)
+        assert [signal == 1 for signal in signals] == cross_over(fast, slow).tolist()
+        assert [signal == -1 for signal in signals] == cross_under(fast, slow).tolist()
+        assert any(signals)
+
+    def test_cross_detector_flags(self):
+        from qysp.indicators import CrossDetector
+
+        detector = CrossDetector()
+        assert detector.update(1.0, 2.0) == 0
+        assert detector.update(3.0, 2.0) == 1
+        assert detector.crossed_over and not detector.crossed_under
+        assert detector.update(None, 2.0) == 0
+        assert detector.update(1.0, 2.0) == 0
+        assert detector.update(3.0, 3.0) == 0
+        assert detector.update(2.0, 3.0) == -1
+        assert detector.crossed_under
+
+    def test_states_validate_parameters(self):
+        from qysp.indicators import ATRState, BollingerState, EMAState, SMAState
+
+        for factory in (SMAState, EMAState, ATRState, BollingerState):
+            with pytest.raises(ValueError):
+                factory(0)
+        with pytest.raises(ValueError):
+            BollingerState(20, num_std=0)
+
+
 class TestPublicImports:
     """Tests for public API imports."""
 
@@ -337,3 +457,10 @@ class TestPublicImports:
         assert callable(bollinger_bands)
         assert callable(cross_over)
         assert callable(cross_under)
+
+    def test_streaming_states_importable(self):
+        """Streaming indicator states importable from qysp."""
+        from qysp import ATRState, BollingerState, CrossDetector, EMAState, SMAState
+
+        for state in (ATRState, BollingerState, CrossDetector, EMAState, SMAState):
+            assert isinstance(state, type)
@@ -155,6 +155,32 @@ class TestValidateSchema:
         assert len(errors) > 0
         assert any("difficulty" in e for e in errors)
 
+    def test_runtime_lookback(self):
+        """runtime.lookback 必须是 1–100000 的整数。"""
+        data = _minimal_strategy()
+        data["runtime"]["lookback"] = 500
+        assert validate_schema(data) == []
+
+        for invalid in (0, 100001, "500", 1.5):
+            data["runtime"]["lookback"] = invalid
+            errors = validate_schema(data)
+            assert any("lookback" in e for e in errors)
+
+    def test_vector_entrypoint(self):
+        """vector_v1 入口可声明 output；其他 interface 不允许 output。"""
+        data = _minimal_strategy()
+        data["entrypoint"].update({"callable": "on_bars", "interface": "vector_v1", "output": "signal"})
+        assert validate_schema(data) == []
+
+        data["entrypoint"]["output"] = "weights"
+        assert any("entrypoint.output" in e for e in validate_schema(data))
+
+        data["entrypoint"].update({"interface": "event_v1", "output": "target"})
+        assert any("entrypoint.output" in e for e in validate_schema(data))
+
+        data["entrypoint"] = {"path": "src/strategy.py", "callable": "main", "interface": "batch_v9"}
+        assert any("entrypoint.interface" in e for e in validate_schema(data))
+
     def test_backward_compat_gold_trend(self):
         """现有 GoldTrend 示例 strategy.json 通过验证。"""
         gold_trend_path = Path(__file__).parents[3] / "docs" / "strategy-format" / "examples" / "GoldTrend" / "strategy.json"